@@ -24,6 +24,7 @@ from src.api.service import observer_service, ObserverInstance
 from src.data.db.sqlite_data_service import SQLiteDataService
 import json
 import atexit
+import threading
 
 # Triple protection - atexit hook au niveau global
 def cleanup_on_exit():
@@ -102,7 +103,9 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     logger.info("Starting Hyperliquid Observer API")
-    
+    # Market metadata is loaded in the background: startup does not wait for the exchange
+    threading.Thread(target=observer_service.warm_market_metadata, daemon=True, name="MarketMetadata").start()
+
     try:
         yield
     finally:
@@ -139,6 +142,36 @@ async def health_check() -> HealthResponse:
     )
 
 
+@app.get("/metrics/rate-limit")
+async def get_rate_limit_metrics(
+    user: str = Depends(authenticate_user)
+) -> Dict[str, Any]:
+    """Get the queueing metrics of the process-wide exchange rate limiter.
+
+    Args:
+        user: Authenticated user (from dependency injection).
+
+    Returns:
+        Dict[str, Any]: Metrics per priority lane (high, normal, low).
+    """
+    return observer_service.rate_limit_metrics()
+
+
+@app.get("/metrics/parser-defaults")
+async def get_parser_default_metrics(
+    user: str = Depends(authenticate_user)
+) -> Dict[str, int]:
+    """Get how often each field was missing from exchange responses and filled with a default.
+
+    Args:
+        user: Authenticated user (from dependency injection).
+
+    Returns:
+        Dict[str, int]: Count per field path, a sign of exchange schema drift when it grows.
+    """
+    return observer_service.parser_default_metrics()
+
+
 @app.get("/logs/level", response_model=LogLevelResponse)
 async def get_log_level(
     user: str = Depends(authenticate_user)
@@ -310,7 +343,8 @@ async def start_observer(
             gap=request.gap,
             max_leverage=request.max_leverage,
             algo_type=request.algo_type,
-            api_key=request.api_key
+            api_key=request.api_key,
+            dex_backend=request.dex_backend
         )
         
         logger.info(f"User {user} started observer {observer_id} for {request.address}")
@@ -457,6 +491,32 @@ async def get_observer_status(
         )
 
 
+@app.get("/observers/{observer_id}/metrics/exchange")
+async def get_observer_exchange_metrics(
+    observer_id: str,
+    user: str = Depends(authenticate_user)
+) -> Dict[str, Any]:
+    """Get the per-endpoint latency histograms, error and retry counts of an observer's exchange calls.
+
+    Args:
+        observer_id: The ID of the observer.
+        user: Authenticated user (from dependency injection).
+
+    Returns:
+        Dict[str, Any]: Calls, errors, retries and latency percentiles (seconds) per ccxt endpoint.
+
+    Raises:
+        HTTPException: If the observer doesn't exist.
+    """
+    observer_info = observer_service.get_observer_status(observer_id)
+    if not observer_info:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Observer {observer_id} not found"
+        )
+    return observer_info.exchange_metrics() or {}
+
+
 @app.get("/observers")
 async def list_observers(
     user: str = Depends(authenticate_user)
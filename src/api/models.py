@@ -14,6 +14,7 @@ class ObserverStartRequest(BaseModel):
     max_leverage: int = Field(default=40, description="The maximum leverage to use")
     api_key: str = Field(..., description="The API key to use")
     gap: int = Field(default=500, description="The gap to use")
+    dex_backend: Optional[str] = Field(default=None, description="Exchange backend: sync, async or native (defaults to config)")
 
 
 class ObserverResponse(BaseModel):
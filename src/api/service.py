@@ -1,14 +1,27 @@
 """Observer service for managing Hyperliquid observers."""
 
 import asyncio
+import dataclasses
 import logging
+import os
 import threading
+import time
 import uuid
 from typing import Dict, Optional, Any
 from dataclasses import dataclass
 
+from src.generic.async_dex import AsyncDex, AsyncDexBridge, AsyncDexRuntime
+from src.generic.cached_dex import ACCOUNT, ACCOUNT_SUMMARY, AVAILABLE_BALANCE, OPEN_ORDERS, PRICE, CachedDex
 from src.generic.cctx_api import Dex, DexConfig
+from src.generic.client_pool import ExchangeClientPool
+from src.generic.cctx_mapper import defaulted_field_counts
+from src.generic.dex_cassette import record_client
+from src.generic.event_queue import OverflowPolicy
+from src.generic.exchange_metrics import ExchangeMetrics
+from src.generic.market_metadata import MarketMetadataCache, network_name
 from src.generic.observer import HyperliquidObserver
+from src.generic.rate_limiter import RateLimitedDex, RateLimitScheduler
+from src.generic.volatility import VolatilityEngine
 from src.generic.algo import Algo
 from src.data.db.sqlite_data_service import SQLiteDataService
 from src.generic.config import config
@@ -34,6 +47,9 @@ class ObserverInstance:
     observer: HyperliquidObserver
     thread: threading.Thread
     status: str = "running"
+    dex_backend: str = "sync"
+    # exact configuration the exchange client was acquired with, needed to release it to the pool
+    dex_config: Optional[DexConfig] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the instance to a dictionary for serialization.
@@ -49,11 +65,64 @@ class ObserverInstance:
             "coin": self.coin,
             "symbol": self.symbol,
             "algo_type": self.algo_type,
+            "dex_backend": self.dex_backend,
             "status": self.status,
             "thread_name": self.thread.name if self.thread else None,
-            "thread_alive": self.thread.is_alive() if self.thread else False
+            "thread_alive": self.thread.is_alive() if self.thread else False,
+            "event_queue": self._queue_metrics(),
+            "execution_stats": self._execution_stats(),
+            "dex_cache": self._dex_cache_stats(),
+            "exchange_metrics": self.exchange_metrics()
         }
 
+    def _queue_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get the order update queue metrics of the observer.
+
+        Returns:
+            Optional[Dict[str, Any]]: Queue depth and wait-time metrics, None if unavailable.
+        """
+        get_queue_metrics = getattr(self.observer, "get_queue_metrics", None)
+        if get_queue_metrics is None:
+            return None
+        metrics = get_queue_metrics()
+        return dataclasses.asdict(metrics) if dataclasses.is_dataclass(metrics) else None
+
+    def _execution_stats(self) -> Optional[Dict[str, Any]]:
+        """Get the rolling stats of the orders executed by the observer's algo.
+
+        Returns:
+            Optional[Dict[str, Any]]: Fill rate, buy/sell imbalance and grid spread, None if unavailable.
+        """
+        get_execution_stats = getattr(self.observer, "get_execution_stats", None)
+        if get_execution_stats is None:
+            return None
+        stats = get_execution_stats()
+        return dataclasses.asdict(stats) if dataclasses.is_dataclass(stats) else None
+
+    def exchange_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get the latency, error and retry stats of the observer's exchange calls.
+
+        Returns:
+            Optional[Dict[str, Any]]: Stats per ccxt endpoint (latencies in seconds), None if unavailable.
+        """
+        dex = getattr(getattr(self.observer, "algo", None), "dex", None)
+        metrics = getattr(dex, "exchange_metrics", None)
+        if not isinstance(metrics, ExchangeMetrics):
+            return None
+        return {endpoint: dataclasses.asdict(stats) for endpoint, stats in metrics.snapshot().items()}
+
+    def _dex_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get the hit/miss counters of the observer's exchange read cache.
+
+        Returns:
+            Optional[Dict[str, Any]]: Counters per cached read, None if the cache is disabled.
+        """
+        dex = getattr(getattr(self.observer, "algo", None), "dex", None)
+        cache_stats = getattr(type(dex), "cache_stats", None)
+        if cache_stats is None:
+            return None
+        return {key: dataclasses.asdict(stats) for key, stats in dex.cache_stats().items()}
+
 
 class ObserverService:
     """Service for managing multiple Hyperliquid observers."""
@@ -63,18 +132,22 @@ class ObserverService:
         self._observers: Dict[str, ObserverInstance] = {}
         self._lock = threading.Lock()
         self._shutdown_event = threading.Event()
+        self._exchange_client_pool: Optional[ExchangeClientPool] = None
+        self._lock_pool = threading.Lock()
         
         # Register cleanup on exit
         import atexit
         atexit.register(self._cleanup_on_exit)
     
-    def start_observer(self, address: str, is_test: bool, gap: int, api_key: str, max_leverage: int = None, algo_type: str = "default") -> str:
+    def start_observer(self, address: str, is_test: bool, gap: int, api_key: str, max_leverage: int = None, algo_type: str = "default",
+                       dex_backend: Optional[str] = None) -> str:
         """Start a new observer for the given address.
         
         Args:
             address: The Hyperliquid address to observe.
             is_test: Whether this is a test environment (defaults to config value).
             algo_type: The type of algorithm to use (defaults to config value).
+            dex_backend: Exchange backend of this observer: sync, async or native (defaults to config value).
             
         Returns:
             str: The observer instance ID.
@@ -85,13 +158,19 @@ class ObserverService:
         with self._lock:
             self.check_no_observer_for_address_or_fail(address)
             
+            dex_config = None
             try:
                 observer_id = 'obs_' + address
-                algo = self._create_algo(algo_type, gap, observer_id, DexConfig(symbol=SYMBOL, marginCoin=COIN, isTest=is_test, walletAddress=address, apiKey=api_key), max_leverage)
+                dex_backend = dex_backend or config.dex_backend
+                dex_config = DexConfig(symbol=SYMBOL, marginCoin=COIN, isTest=is_test, walletAddress=address, apiKey=api_key)
+                algo = self._create_algo(algo_type, gap, observer_id, dex_config, max_leverage, dex_backend)
                 algo.recover_previous_state()
                 
                 websocket_url = config.get_websocket_url(is_test)
-                observer = HyperliquidObserver(address=address, observer_id=observer_id, algo=algo, websocket_url=websocket_url)
+                observer = HyperliquidObserver(address=address, observer_id=observer_id, algo=algo, websocket_url=websocket_url,
+                                               queue_size=config.observer_queue_size,
+                                               overflow_policy=OverflowPolicy(config.observer_queue_overflow),
+                                               candle_interval=config.volatility_candle_interval if config.adaptive_gap else None)
                 
                 thread = threading.Thread(
                     target=self._run_observer,
@@ -109,6 +188,8 @@ class ObserverService:
                     coin=COIN,
                     symbol=SYMBOL,
                     algo_type=algo_type,
+                    dex_backend=dex_backend,
+                    dex_config=dex_config,
                     observer=observer,
                     thread=thread,
                     status="running"
@@ -126,6 +207,8 @@ class ObserverService:
                 # Clean up if something went wrong
                 if observer_id in self._observers:
                     del self._observers[observer_id]
+                if dex_config is not None:
+                    self._release_dex(dex_config, dex_backend)
                 raise
     
     def stop_observer(self, observer_id: str) -> bool:
@@ -174,6 +257,8 @@ class ObserverService:
                 
                 # Remove from observers dict
                 del self._observers[observer_id]
+                if instance.dex_config is not None:
+                    self._release_dex(instance.dex_config, instance.dex_backend)
                 
                 logger.info(f"Deleted observer {observer_id}")
                 return True
@@ -257,15 +342,123 @@ class ObserverService:
                 
         logger.info("All observers stopped and cleaned")
     
-    def _create_algo(self, algo_type: str, gap: int, session_id: str, dex_config: DexConfig, max_leverage: int) -> Algo:
+    def _create_algo(self, algo_type: str, gap: int, session_id: str, dex_config: DexConfig, max_leverage: int,
+                     dex_backend: str = None) -> Algo:
         if algo_type == "default":
             # Use config values for algorithm creation
-            dex = Dex(dex_config)
+            dex = self._create_dex(dex_config, dex_backend or config.dex_backend)
             data_service = SQLiteDataService(config.db_path)
-            return Algo(dex=dex, data_service=data_service, gap=gap, session_id=session_id, max_leverage=max_leverage)
+            return Algo(dex=dex, data_service=data_service, gap=gap, session_id=session_id, max_leverage=max_leverage,
+                        account_reconcile_interval=config.account_reconcile_interval,
+                        executed_orders_capacity=config.executed_orders_capacity,
+                        volatility_engine=VolatilityEngine(percentile_window=config.volatility_percentile_window)
+                        if config.adaptive_gap else None)
         else:
             raise ValueError(f"Unsupported algorithm type: {algo_type}")
     
+    def _rate_limit_scheduler(self) -> RateLimitScheduler:
+        return RateLimitScheduler.shared(config.rate_limit_weight_per_minute, config.rate_limit_burst)
+
+    def rate_limit_metrics(self) -> Dict[str, Any]:
+        """Get the queueing metrics of the process-wide rate limiter.
+
+        Returns:
+            Dict[str, Any]: Waiting requests, granted requests and weight, average and max wait per priority lane.
+        """
+        return {lane: dataclasses.asdict(metrics) for lane, metrics in self._rate_limit_scheduler().metrics().items()}
+
+    def parser_default_metrics(self) -> Dict[str, int]:
+        """Get how often each field was missing from exchange responses and filled with a default.
+
+        Returns:
+            Dict[str, int]: Count per field path (e.g. "Order.info.coin"), since process start.
+        """
+        return defaulted_field_counts()
+
+    def _client_pool(self) -> ExchangeClientPool:
+        with self._lock_pool:
+            if self._exchange_client_pool is None:
+                self._exchange_client_pool = ExchangeClientPool(
+                    market_metadata=self._market_metadata(),
+                    ticker_ttl=config.client_pool_ticker_ttl,
+                    trust_creation_response=config.trust_creation_response,
+                    rate_limit_scheduler=self._rate_limit_scheduler() if config.rate_limit else None)
+            return self._exchange_client_pool
+
+    def _release_dex(self, dex_config: DexConfig, dex_backend: str) -> None:
+        """Give an observer's exchange client back to the pool.
+
+        Args:
+            dex_config: Configuration the client was acquired with (the pool key includes the API key).
+            dex_backend: Exchange backend of the observer.
+        """
+        if dex_backend == "sync" and self._exchange_client_pool is not None:
+            self._exchange_client_pool.release(dex_config)
+
+    def _market_metadata(self) -> MarketMetadataCache:
+        return MarketMetadataCache.shared(config.market_metadata_dir, config.market_metadata_ttl)
+
+    def warm_market_metadata(self) -> None:
+        """Load the market metadata of both networks, from disk or from the exchange.
+
+        Called at startup so that the first observer does not wait for the market list download.
+        """
+        for is_test in (True, False):
+            self._market_metadata().warm(is_test)
+
+    def _create_dex(self, dex_config: DexConfig, dex_backend: str):
+        """Create the exchange client of an observer.
+
+        Args:
+            dex_config: Exchange configuration of the observer.
+            dex_backend: "sync" (ccxt), "async" (ccxt.async_support) or "native" (Hyperliquid SDK actions).
+
+        Returns:
+            Dex, AsyncDexBridge, HyperliquidDex, RateLimitedDex or CachedDex: Client used by the algorithm.
+        """
+        if dex_backend == "async":
+            runtime = AsyncDexRuntime.shared()
+            dex = AsyncDexBridge(AsyncDex(dex_config, session=runtime.session,
+                                          trust_creation_response=config.trust_creation_response,
+                                          market_metadata=self._market_metadata()), runtime)
+        elif dex_backend == "sync" and config.client_pool:
+            dex = self._client_pool().acquire(dex_config)
+        elif dex_backend == "sync":
+            dex = Dex(dex_config, trust_creation_response=config.trust_creation_response,
+                      market_metadata=self._market_metadata())
+        elif dex_backend == "native":
+            # Local import: the Hyperliquid SDK is only needed by this backend
+            from src.hyperliquidapi.hyperliquid_dex import HyperliquidDex
+            dex = HyperliquidDex(dex_config, trust_creation_response=config.trust_creation_response)
+        else:
+            raise ValueError(f"Unsupported dex backend: {dex_backend}")
+        if config.dex_record_dir and dex_backend in ("sync", "async"):
+            self._record_dex(dex, dex_config, dex_backend)
+        if config.rate_limit:
+            dex = RateLimitedDex(dex, self._rate_limit_scheduler())
+        if not config.dex_cache:
+            return dex
+        return CachedDex(dex, ttls={
+            PRICE: config.dex_cache_price_ttl,
+            ACCOUNT: config.dex_cache_account_ttl,
+            AVAILABLE_BALANCE: config.dex_cache_account_ttl,
+            ACCOUNT_SUMMARY: config.dex_cache_account_ttl,
+            OPEN_ORDERS: config.dex_cache_open_orders_ttl,
+        })
+
+    def _record_dex(self, dex, dex_config: DexConfig, dex_backend: str) -> None:
+        """Record the ccxt calls of an exchange client to a cassette (one file per client and process run).
+
+        Args:
+            dex: Dex or AsyncDexBridge of the observer.
+            dex_config: Exchange configuration of the observer.
+            dex_backend: "sync" or "async".
+        """
+        client = dex.async_dex.dex if dex_backend == "async" else dex.dex
+        os.makedirs(config.dex_record_dir, exist_ok=True)
+        name = f"{network_name(dex_config.isTest)}_{dex_config.walletAddress.lower()}_{dex_config.symbol}_{int(time.time())}"
+        record_client(client, os.path.join(config.dex_record_dir, f"{name}.jsonl.gz"))
+
     def _run_observer(self, observer_id: str, observer: HyperliquidObserver) -> None:
         """Run an observer in a separate thread.
         
@@ -309,6 +502,7 @@ class ObserverService:
         logger.info("Program terminating - stopping all observers")
         self._shutdown_event.set()
         self.stop_all_observers()
+        AsyncDexRuntime.close_shared()
         
         # Wait briefly for threads to terminate
         import time
@@ -0,0 +1 @@
+# Backtests de la stratégie de grille (simulation vectorisée hors ligne)
@@ -0,0 +1,450 @@
+"""
+Backtest vectorisé de la grille de l'Algo sur des bougies OHLC.
+
+Les règles sont celles de `Algo` :
+ - à l'exécution d'un ordre au prix P : open long à P - gap et close long à P + gap
+   (sauf si un ordre existe déjà à ce prix), puis annulation des open longs inférieurs
+ - qty = equity / qtyDivider / P
+ - compteur de coins : +1 sur un achat, -1 sur un close long, achat au marché de 2 unités
+   quand le compteur descend à `minNbCoins`
+ - au départ : achat au marché de `initial_coins_buy` unités, un open long et un close long
+
+Entre deux exécutions l'état de la grille est constant : la prochaine bougie qui touche un
+ordre (ou le prix de liquidation) est cherchée avec NumPy sur les tableaux high/low, la
+boucle Python ne tourne qu'une fois par exécution. Dans une bougie, le prix suit
+open -> low -> high -> close (ou open -> high -> low -> close pour une bougie baissière).
+
+L'accounting (frais maker/taker, marge croisée, marge réservée par les ordres, liquidation)
+reproduit celui de `SimulatedDex`, ce qui permet de comparer le résultat à une exécution
+événementielle de l'Algo réel (`run_algo_on_simulated_dex`).
+"""
+
+import dataclasses
+import heapq
+import math
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.generic.algo import Algo
+
+FILL_DTYPE = np.dtype([
+    ('index', np.int64),    # indice de la bougie
+    ('side', np.int8),      # 1 = achat, -1 = vente
+    ('price', np.float64),
+    ('qty', np.float64),
+    ('market', np.bool_),   # ordre au marché (achat initial, recharge de coins, liquidation)
+])
+
+# taille initiale de la fenêtre de recherche de la prochaine exécution (doublée à chaque échec)
+_SEARCH_WINDOW = 256
+_MAX_SEARCH_WINDOW = 1 << 20
+
+
+@dataclasses.dataclass
+class OhlcData:
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    timestamp: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.open = np.asarray(self.open, dtype=np.float64)
+        self.high = np.asarray(self.high, dtype=np.float64)
+        self.low = np.asarray(self.low, dtype=np.float64)
+        self.close = np.asarray(self.close, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def from_prices(cls, prices: Iterable[float]) -> 'OhlcData':
+        """Une bougie par prix : permet de rejouer un flux de ticks"""
+        prices = np.asarray(list(prices), dtype=np.float64)
+        return cls(open=prices, high=prices, low=prices, close=prices)
+
+    def slice(self, start: int, stop: int) -> 'OhlcData':
+        return OhlcData(open=self.open[start:stop], high=self.high[start:stop], low=self.low[start:stop],
+                        close=self.close[start:stop],
+                        timestamp=self.timestamp[start:stop] if self.timestamp is not None else None)
+
+
+def load_ohlc_csv(path: str) -> OhlcData:
+    """Charge un CSV de bougies (colonnes Timestamp, Open, High, Low, Close, ...) comme celui du notebook"""
+    with open(path) as f:
+        header = [name.strip() for name in f.readline().split(',')]
+    columns = [header.index(name) for name in ('Timestamp', 'Open', 'High', 'Low', 'Close')]
+    data = np.loadtxt(path, delimiter=',', skiprows=1, usecols=columns, dtype=np.float64, ndmin=2)
+    return OhlcData(timestamp=data[:, 0], open=data[:, 1], high=data[:, 2], low=data[:, 3], close=data[:, 4])
+
+
+@dataclasses.dataclass
+class GridParams:
+    gap: float
+    qty_divider: float = Algo.qtyDivider
+    initial_coins_buy: float = Algo.initial_coins_buy
+    min_nb_coins: int = Algo.minNbCoins
+    nb_coins: int = Algo.nbCoins
+    max_leverage: int = Algo.max_leverage
+    initial_balance: float = 10000.0
+    maker_fee: float = 0.00015
+    taker_fee: float = 0.00045
+    maintenance_margin_rate: Optional[float] = None  # 1 / (2 * levier) par défaut, comme SimulatedDex
+
+
+@dataclasses.dataclass
+class GridBacktestResult:
+    params: GridParams
+    final_equity: float
+    max_drawdown: float          # fraction du plus haut d'equity
+    buy_fills: int
+    sell_fills: int
+    market_buys: int
+    rejected_orders: int
+    fees_paid: float
+    position_size: float
+    liquidated: bool
+    liquidation_index: int       # -1 sans liquidation
+    equity: np.ndarray           # equity à la clôture de chaque bougie
+    fills: np.ndarray            # exécutions, dtype FILL_DTYPE
+
+    @property
+    def total_return(self) -> float:
+        return self.final_equity / self.params.initial_balance - 1
+
+
+@dataclasses.dataclass
+class _Resting:
+    level: int               # prix = origine + level * gap
+    qty: float
+    reserved_margin: float
+
+
+class GridBacktester:
+    """
+    Simulation de la grille sur un historique OHLC.
+
+    Les prix des ordres sont tous sur la grille origine + k * gap (origine = premier prix) :
+    les ordres sont repérés par leur niveau k, ce qui évite les comparaisons de flottants.
+    """
+
+    def __init__(self, data: OhlcData, params: GridParams):
+        if len(data) == 0:
+            raise ValueError("No price data to backtest")
+        self.data = data
+        self.params = params
+        self.leverage = params.max_leverage
+        self.mm_rate = params.maintenance_margin_rate if params.maintenance_margin_rate is not None \
+            else 1 / (2 * params.max_leverage)
+        self.origin = float(data.open[0])
+
+        self.cash = params.initial_balance
+        self.position = 0.0
+        self.reserved_margin = 0.0
+        self.fees_paid = 0.0
+        self.coins = params.nb_coins
+        self.open_long: Optional[_Resting] = None
+        self._pending_open_long: Optional[_Resting] = None  # open long inférieur, annulé après le batch
+        self.close_longs: dict = {}          # level -> _Resting
+        self._close_long_levels: List[int] = []  # tas des niveaux de close long
+
+        self.liquidated = False
+        self.liquidation_index = -1
+        self.rejected_orders = 0
+        self.market_buys = 0
+        self._fills: List[Tuple] = []
+        self._index = 0
+
+    # ------------------------------------------------------------------ simulation
+
+    def run(self) -> GridBacktestResult:
+        data = self.data
+        n = len(data)
+        equity = np.empty(n, dtype=np.float64)
+
+        self._setup(self.origin)
+        previous_close = self.origin
+        i = 0
+        while i < n:
+            if self.liquidated:
+                equity[i:] = self.cash
+                break
+            j = self._next_event_index(i)
+            if j > i:
+                # aucune exécution entre i et j : l'état de la grille est constant
+                equity[i:j] = self.cash + self.position * data.close[i:j]
+                if j >= n:
+                    break
+                previous_close = data.close[j - 1]
+            self._index = j
+            for start, end in zip(*self._bar_path(j, previous_close)):
+                if end < start:
+                    self._move_down(start, end)
+                elif end > start:
+                    self._move_up(start, end)
+                if self.liquidated:
+                    break
+            equity[j] = self.cash + self.position * data.close[j]
+            previous_close = data.close[j]
+            i = j + 1
+
+        return self._result(equity)
+
+    def _bar_path(self, i: int, previous_close: float):
+        data = self.data
+        o, h, l, c = data.open[i], data.high[i], data.low[i], data.close[i]
+        path = (previous_close, o, l, h, c) if c >= o else (previous_close, o, h, l, c)
+        return path[:-1], path[1:]
+
+    def _next_event_index(self, start: int) -> int:
+        """Première bougie à partir de `start` qui touche un ordre ou le prix de liquidation"""
+        lo, hi = self._thresholds()
+        low, high = self.data.low, self.data.high
+        n = len(low)
+        window = _SEARCH_WINDOW
+        i = start
+        while i < n:
+            end = min(n, i + window)
+            mask = low[i:end] <= lo
+            if hi < math.inf:
+                mask |= high[i:end] >= hi
+            k = int(mask.argmax())
+            if mask[k]:
+                return i + k
+            i = end
+            window = min(window * 2, _MAX_SEARCH_WINDOW)
+        return n
+
+    def _thresholds(self) -> Tuple[float, float]:
+        lo = self._price(self.open_long.level) if self.open_long else -math.inf
+        hi = self._price(self._close_long_levels[0]) if self._close_long_levels else math.inf
+        long_liq, short_liq = self._liquidation_prices()
+        return max(lo, long_liq), min(hi, short_liq)
+
+    def _liquidation_prices(self) -> Tuple[float, float]:
+        """Prix où l'equity tombe à la marge de maintenance, pour une position longue / courte"""
+        if self.position > 0:
+            return -self.cash / (self.position * (1 - self.mm_rate)), math.inf
+        if self.position < 0:
+            return -math.inf, self.cash / (-self.position * (1 + self.mm_rate))
+        return -math.inf, math.inf
+
+    def _move_down(self, start: float, end: float):
+        while not self.liquidated:
+            ol_price = self._price(self.open_long.level) if self.open_long else -math.inf
+            long_liq, _ = self._liquidation_prices()
+            if long_liq >= end and long_liq >= ol_price:
+                self._liquidate(min(long_liq, start))
+            elif self.open_long and ol_price >= end:
+                resting = self.open_long
+                self.open_long = None
+                self._fill_limit(resting, 1)
+                self._on_buy_filled(resting.level)
+            else:
+                break
+
+    def _move_up(self, start: float, end: float):
+        while not self.liquidated:
+            cl_price = self._price(self._close_long_levels[0]) if self._close_long_levels else math.inf
+            _, short_liq = self._liquidation_prices()
+            if short_liq <= end and short_liq <= cl_price:
+                self._liquidate(max(short_liq, start))
+            elif cl_price <= end:
+                level = heapq.heappop(self._close_long_levels)
+                resting = self.close_longs.pop(level)
+                self._fill_limit(resting, -1)
+                self._on_sell_filled(level)
+            else:
+                break
+
+    # ------------------------------------------------------------------ règles de l'Algo
+
+    def _setup(self, price: float):
+        qty = self._free(price) / self.params.qty_divider / price
+        self._market_buy(qty * self.params.initial_coins_buy, price)
+        self._submit(price, [(1, -1, qty), (-1, 1, qty)])
+        # l'exécution de l'achat initial est traitée comme celle d'un open long
+        self._on_buy_filled(0)
+
+    def _on_buy_filled(self, level: int):
+        price = self._price(level)
+        qty = self._equity(price) / self.params.qty_divider / price
+        self._submit(price, [(1, level - 1, qty), (-1, level + 1, qty)])
+        self._remove_min_open_longs()
+        self.coins += 1
+
+    def _on_sell_filled(self, level: int):
+        price = self._price(level)
+        qty = self._equity(price) / self.params.qty_divider / price
+        refill = self.coins - 1 <= self.params.min_nb_coins
+        self._submit(price, [(1, level - 1, qty), (-1, level + 1, qty)])
+        bought = refill and self._market_buy(2 * qty, price)
+        self._remove_min_open_longs()
+        if self.coins > 0:
+            self.coins -= 1
+        if bought:
+            self._on_buy_filled(level)
+
+    def _submit(self, price: float, requests: List[Tuple[int, int, float]]):
+        """Ordres limites (side, level, qty) ; ignorés si un ordre du même côté existe à ce niveau"""
+        for side, level, qty in requests:
+            if side > 0:
+                if self.open_long and self.open_long.level == level:
+                    continue
+                limit_price = self._price(level)
+                required = self._required_margin(side, qty, limit_price)
+                if not self._accepts(qty, limit_price, required, price):
+                    continue
+                self.reserved_margin += required
+                if self.open_long is None or level > self.open_long.level:
+                    # l'ancien open long est annulé juste après par `_remove_min_open_longs`
+                    self._pending_open_long = self.open_long
+                    self.open_long = _Resting(level=level, qty=qty, reserved_margin=required)
+                else:
+                    self._pending_open_long = _Resting(level=level, qty=qty, reserved_margin=required)
+            else:
+                if level in self.close_longs:
+                    continue
+                limit_price = self._price(level)
+                required = self._required_margin(side, qty, limit_price)
+                if not self._accepts(qty, limit_price, required, price):
+                    continue
+                self.reserved_margin += required
+                self.close_longs[level] = _Resting(level=level, qty=qty, reserved_margin=required)
+                heapq.heappush(self._close_long_levels, level)
+
+    def _remove_min_open_longs(self):
+        if self._pending_open_long is not None:
+            self.reserved_margin -= self._pending_open_long.reserved_margin
+            self._pending_open_long = None
+
+    def _market_buy(self, qty: float, price: float) -> bool:
+        required = self._required_margin(1, qty, price)
+        if not self._accepts(qty, price, required, price):
+            return False
+        self._apply_fill(1, qty, price, self.params.taker_fee, market=True)
+        self.market_buys += 1
+        return True
+
+    def _fill_limit(self, resting: _Resting, side: int):
+        self.reserved_margin -= resting.reserved_margin
+        self._apply_fill(side, resting.qty, self._price(resting.level), self.params.maker_fee, market=False)
+
+    def _liquidate(self, price: float):
+        self.liquidated = True
+        self.liquidation_index = self._index
+        self.open_long = None
+        self.close_longs.clear()
+        self._close_long_levels.clear()
+        self.reserved_margin = 0.0
+        side = -1 if self.position > 0 else 1
+        self._apply_fill(side, abs(self.position), price, self.params.taker_fee, market=True)
+        self.position = 0.0
+
+    # ------------------------------------------------------------------ compte
+
+    def _price(self, level: int) -> float:
+        return self.origin + level * self.params.gap
+
+    def _equity(self, price: float) -> float:
+        return self.cash + self.position * price
+
+    def _margin_used(self, price: float) -> float:
+        return abs(self.position) * price / self.leverage
+
+    def _free(self, price: float) -> float:
+        return max(0.0, self._equity(price) - self._margin_used(price) - self.reserved_margin)
+
+    def _required_margin(self, side: int, qty: float, price: float) -> float:
+        # un ordre de vente couvert par la position longue ne consomme pas de marge
+        if side < 0 and self.position > 0:
+            qty = max(0.0, qty - self.position)
+        elif side > 0 and self.position < 0:
+            qty = max(0.0, qty + self.position)
+        return qty * price / self.leverage
+
+    def _accepts(self, qty: float, order_price: float, required: float, price: float) -> bool:
+        if qty <= 0 or order_price <= 0 \
+                or required > self._equity(price) - self._margin_used(price) - self.reserved_margin:
+            self.rejected_orders += 1
+            return False
+        return True
+
+    def _apply_fill(self, side: int, qty: float, price: float, fee_rate: float, market: bool):
+        fee = qty * price * fee_rate
+        self.fees_paid += fee
+        self.cash -= side * qty * price + fee
+        self.position += side * qty
+        if abs(self.position) < 1e-12:
+            self.position = 0.0
+        self._fills.append((self._index, side, price, qty, market))
+
+    def _result(self, equity: np.ndarray) -> GridBacktestResult:
+        fills = np.array(self._fills, dtype=FILL_DTYPE)
+        peaks = np.maximum.accumulate(equity)
+        drawdown = float(np.max(1 - equity / peaks)) if len(equity) else 0.0
+        limit_fills = fills[~fills['market']]
+        return GridBacktestResult(
+            params=self.params,
+            final_equity=float(equity[-1]),
+            max_drawdown=drawdown,
+            buy_fills=int(np.count_nonzero(limit_fills['side'] > 0)),
+            sell_fills=int(np.count_nonzero(limit_fills['side'] < 0)),
+            market_buys=self.market_buys,
+            rejected_orders=self.rejected_orders,
+            fees_paid=self.fees_paid,
+            position_size=self.position,
+            liquidated=self.liquidated,
+            liquidation_index=self.liquidation_index,
+            equity=equity,
+            fills=fills,
+        )
+
+
+def backtest_grid(data: OhlcData, params: GridParams) -> GridBacktestResult:
+    return GridBacktester(data, params).run()
+
+
+def run_algo_on_simulated_dex(prices: Iterable[float], params: GridParams) -> Tuple[Algo, 'SimulatedDex', np.ndarray]:
+    """
+    Exécution événementielle de l'Algo réel sur `SimulatedDex`, tick par tick.
+
+    Sert de référence au backtest vectorisé sur de courtes fenêtres : retourne l'algo,
+    l'échange simulé et les exécutions (dtype FILL_DTYPE, indice = numéro du tick).
+    """
+    from src.data.null_data import NullData
+    from src.generic.observer import HyperliquidObserver
+    from src.generic.simulated_dex import SimulatedDex
+
+    prices = list(prices)
+    dex = SimulatedDex(initial_balance=params.initial_balance, initial_price=prices[0],
+                       leverage=params.max_leverage, maker_fee=params.maker_fee, taker_fee=params.taker_fee,
+                       maintenance_margin_rate=params.maintenance_margin_rate)
+    algo = Algo(dex=dex, gap=params.gap, session_id="backtest", data_service=NullData(),
+                max_leverage=params.max_leverage)
+    algo.qtyDivider = params.qty_divider
+    algo.initial_coins_buy = params.initial_coins_buy
+    algo.minNbCoins = params.min_nb_coins
+    algo.nbCoins = params.nb_coins
+    algo.coin_manager.setInitialCoinCount(params.nb_coins)
+    observer = HyperliquidObserver(address="0x0", observer_id="backtest", websocket_url=None, algo=algo,
+                                   process_inline=True)
+
+    fills = []
+    tick = [0]
+
+    def record(updates):
+        for update in updates:
+            side = 1 if update.order.side == 'B' else -1
+            fills.append((tick[0], side, update.order.limitPx, float(update.order.origSz), False))
+
+    dex.subscribe(record)
+    dex.subscribe(observer.handle_order_updates)
+    algo.setup_initial_positions()
+    for i, price in enumerate(prices):
+        tick[0] = i
+        dex.on_price(price)
+        if dex.liquidated:
+            break
+    return algo, dex, np.array(fills, dtype=FILL_DTYPE)
@@ -0,0 +1,185 @@
+"""
+Balayage de paramètres de la grille sur un pool de processus.
+
+Les prix sont écrits une fois dans un fichier .npy (4 x n : open, high, low, close) que
+chaque worker ouvre en mémoire partagée (`np.load(mmap_mode='r')`) : rien n'est copié
+vers les workers. Chaque résultat est ajouté au fichier JSONL de sortie dès qu'il est
+prêt ; relancer le même balayage saute les configurations déjà présentes dans ce fichier.
+
+    python -m src.backtesting.sweep --csv btc_1min.csv --out sweep.jsonl --workers 8
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+from src.backtesting.grid_backtester import GridParams, OhlcData, backtest_grid, load_ohlc_csv
+from src.generic.algo import Algo
+
+logger = logging.getLogger(__name__)
+
+SWEPT_FIELDS = ('gap', 'qty_divider', 'initial_coins_buy', 'min_nb_coins', 'max_leverage')
+
+
+@dataclasses.dataclass
+class SweepSpace:
+    gaps: Sequence[float] = tuple(Algo.GAPS)
+    qty_dividers: Sequence[float] = (Algo.qtyDivider,)
+    initial_coins_buys: Sequence[float] = (Algo.initial_coins_buy,)
+    min_nb_coins: Sequence[int] = (Algo.minNbCoins,)
+    max_leverages: Sequence[int] = (Algo.max_leverage,)
+
+    def __len__(self) -> int:
+        return len(self.gaps) * len(self.qty_dividers) * len(self.initial_coins_buys) \
+            * len(self.min_nb_coins) * len(self.max_leverages)
+
+    def params(self, **common) -> Iterator[GridParams]:
+        """Produit cartésien des valeurs, `common` complète les autres champs de GridParams"""
+        for gap, qty_divider, initial_coins_buy, min_nb_coins, max_leverage in itertools.product(
+                self.gaps, self.qty_dividers, self.initial_coins_buys, self.min_nb_coins, self.max_leverages):
+            yield GridParams(gap=gap, qty_divider=qty_divider, initial_coins_buy=initial_coins_buy,
+                             min_nb_coins=min_nb_coins, max_leverage=max_leverage, **common)
+
+
+def config_key(params: GridParams) -> str:
+    """Identifiant stable d'une configuration, utilisé pour la reprise"""
+    return json.dumps(dataclasses.asdict(params), sort_keys=True)
+
+
+def save_price_cache(data: OhlcData, path: str) -> str:
+    """Ecrit les bougies dans un .npy (4 x n) ouvrable en mémoire partagée par les workers"""
+    np.save(path, np.stack([data.open, data.high, data.low, data.close]))
+    return path if path.endswith('.npy') else path + '.npy'
+
+
+def load_price_cache(path: str) -> OhlcData:
+    prices = np.load(path, mmap_mode='r')
+    return OhlcData(open=prices[0], high=prices[1], low=prices[2], close=prices[3])
+
+
+def load_completed_keys(out_path: str) -> Set[str]:
+    """Configurations déjà présentes dans le fichier de résultats (lignes tronquées ignorées)"""
+    if not os.path.exists(out_path):
+        return set()
+    keys = set()
+    with open(out_path) as f:
+        for line in f:
+            try:
+                keys.add(json.loads(line)['key'])
+            except (ValueError, KeyError):
+                continue
+    return keys
+
+
+# données du worker, ouvertes une fois par processus
+_worker_data: Optional[OhlcData] = None
+
+
+def _init_worker(price_path: str):
+    global _worker_data
+    logging.disable(logging.WARNING)
+    _worker_data = load_price_cache(price_path)
+
+
+def _run_config(params: GridParams) -> Dict:
+    started = time.perf_counter()
+    result = backtest_grid(_worker_data, params)
+    return {
+        'key': config_key(params),
+        'params': dataclasses.asdict(params),
+        'final_equity': result.final_equity,
+        'total_return': result.total_return,
+        'max_drawdown': result.max_drawdown,
+        'buy_fills': result.buy_fills,
+        'sell_fills': result.sell_fills,
+        'market_buys': result.market_buys,
+        'rejected_orders': result.rejected_orders,
+        'fees_paid': result.fees_paid,
+        'liquidated': result.liquidated,
+        'liquidation_index': result.liquidation_index,
+        'duration': time.perf_counter() - started,
+    }
+
+
+def run_sweep(price_path: str, out_path: str, params: Iterable[GridParams], workers: Optional[int] = None) -> int:
+    """
+    Evalue toutes les configurations pas encore présentes dans `out_path`.
+
+    Retourne le nombre de configurations évaluées par cet appel.
+    """
+    completed = load_completed_keys(out_path)
+    pending: List[GridParams] = [p for p in params if config_key(p) not in completed]
+    logger.info(f"Sweep: {len(pending)} configurations to run, {len(completed)} already done")
+    if not pending:
+        return 0
+
+    # une ligne interrompue en fin de fichier ne doit pas coller à la suivante
+    if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+        with open(out_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+    else:
+        needs_newline = False
+
+    done = 0
+    with open(out_path, 'a') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(price_path,)) as pool:
+        if needs_newline:
+            out.write('\n')
+        futures = [pool.submit(_run_config, p) for p in pending]
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                logger.error(f"Sweep: configuration failed: {e}")
+                continue
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+            done += 1
+            if done % 100 == 0:
+                logger.info(f"Sweep: {done}/{len(pending)} configurations done")
+    return done
+
+
+def _parse_list(value: str, cast=float) -> List:
+    return [cast(v) for v in value.split(',') if v]
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Balayage des paramètres de la grille")
+    parser.add_argument('--csv', help="CSV de bougies (Timestamp, Open, High, Low, Close)")
+    parser.add_argument('--prices', help="cache .npy des bougies (créé depuis --csv si absent)")
+    parser.add_argument('--out', required=True, help="fichier JSONL des résultats (reprise automatique)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--gaps', default=','.join(str(g) for g in Algo.GAPS))
+    parser.add_argument('--qty-dividers', default=str(Algo.qtyDivider))
+    parser.add_argument('--initial-coins-buys', default=str(Algo.initial_coins_buy))
+    parser.add_argument('--min-nb-coins', default=str(Algo.minNbCoins))
+    parser.add_argument('--max-leverages', default=str(Algo.max_leverage))
+    parser.add_argument('--initial-balance', type=float, default=10000.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    price_path = args.prices or os.path.splitext(args.out)[0] + '_prices.npy'
+    if not os.path.exists(price_path):
+        if not args.csv:
+            parser.error("--csv is required to build the price cache")
+        price_path = save_price_cache(load_ohlc_csv(args.csv), price_path)
+
+    space = SweepSpace(gaps=_parse_list(args.gaps), qty_dividers=_parse_list(args.qty_dividers),
+                       initial_coins_buys=_parse_list(args.initial_coins_buys),
+                       min_nb_coins=_parse_list(args.min_nb_coins, int),
+                       max_leverages=_parse_list(args.max_leverages, int))
+    run_sweep(price_path, args.out, space.params(initial_balance=args.initial_balance), workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
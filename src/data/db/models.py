@@ -25,7 +25,7 @@ class PositionStatus(Enum):
     PARTIAL_UPDATE = "partial_update"
 
 
-@dataclass
+@dataclass(slots=True)
 class SimpleObservation:
     """Modèle simplifié pour les observations Hyperliquid"""
     
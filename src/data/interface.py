@@ -1,6 +1,5 @@
 from abc import ABC, abstractmethod
 from src.generic.hyperliquid_ws_model import WsOrder
-from src.data.position import Position
 
 
 class IData(ABC):
@@ -12,21 +11,21 @@ class IData(ABC):
         pass
     
     @abstractmethod
-    def on_new_buy_position(self, position: Position, session_id: str) -> None:
+    def on_new_buy_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Traite une nouvelle position d'achat"""
         pass
     
     @abstractmethod
-    def on_new_sell_position(self, position: Position, session_id: str) -> None:
+    def on_new_sell_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Traite une nouvelle position de vente"""
         pass
     
     @abstractmethod
-    def on_filled_buy_position(self, position: Position, session_id: str) -> None:
+    def on_filled_buy_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Traite une position d'achat remplie"""
         pass
     
     @abstractmethod
-    def on_filled_sell_position(self, position: Position, session_id: str) -> None:
+    def on_filled_sell_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Traite une position de vente remplie"""
         pass 
\ No newline at end of file
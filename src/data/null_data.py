@@ -1,6 +1,5 @@
 from src.data.interface import IData
 from src.generic.hyperliquid_ws_model import WsOrder
-from src.data.position import Position
 
 
 class NullData(IData):
@@ -10,18 +9,18 @@ class NullData(IData):
         """Ne fait rien"""
         pass
     
-    def on_new_buy_position(self, position: Position, session_id: str) -> None:
+    def on_new_buy_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Ne fait rien"""
         pass
     
-    def on_new_sell_position(self, position: Position, session_id: str) -> None:
+    def on_new_sell_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Ne fait rien"""
         pass
     
-    def on_filled_buy_position(self, position: Position, session_id: str) -> None:
+    def on_filled_buy_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Ne fait rien"""
         pass
     
-    def on_filled_sell_position(self, position: Position, session_id: str) -> None:
+    def on_filled_sell_position(self, symbol: str, user_address: str, side: str, qty: float, price: float, session_id: str) -> None:
         """Ne fait rien"""
         pass 
\ No newline at end of file
@@ -3,7 +3,7 @@ from typing import Optional, Literal
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Modèle représentant une position de trading"""
     
@@ -0,0 +1,107 @@
+"""Modèle local du compte perp, mis à jour à partir des exécutions d'ordres."""
+
+import logging
+import time
+from typing import Callable, Optional
+
+from src.generic.cctx_balance_model import AccountData
+from src.generic.hyperliquid_ws_model import WsOrder
+
+
+class LocalAccountModel:
+    """
+    Etat du compte (equity, marge utilisée, taille de position) tenu à jour localement.
+
+    L'equity est modélisée comme `cash + position_size * mark_price` : une exécution
+    déplace du cash vers la position au prix d'exécution, et le dernier prix d'exécution
+    sert de prix de marque. Les frais et le funding ne sont pas modélisés : ils sont
+    rattrapés à chaque réconciliation avec l'échange, faite toutes les
+    `reconcile_interval` secondes ou dès qu'une incohérence (drift) est détectée.
+    """
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, coin: str, leverage: float, reconcile_interval: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.coin = coin
+        self.leverage = leverage
+        self.reconcile_interval = reconcile_interval
+        self.clock = clock
+
+        self.cash = 0.0
+        self.position_size = 0.0
+        self.mark_price = 0.0
+        self.last_reconcile_time: Optional[float] = None
+        self.fills_since_reconcile = 0
+        self.drift_detected = False
+
+    @property
+    def equity(self) -> float:
+        return self.cash + self.position_size * self.mark_price
+
+    @property
+    def margin_used(self) -> float:
+        if self.leverage <= 0:
+            return 0.0
+        return abs(self.position_size) * self.mark_price / self.leverage
+
+    def needs_reconcile(self) -> bool:
+        """Vrai si le modèle n'a jamais été synchronisé, est trop ancien ou a dérivé."""
+        if self.last_reconcile_time is None or self.drift_detected:
+            return True
+        return self.clock() - self.last_reconcile_time >= self.reconcile_interval
+
+    def mark_drift(self, reason: str):
+        self.logger.warning(f"Account model drift detected: {reason}")
+        self.drift_detected = True
+
+    def on_fill(self, ws_order: WsOrder):
+        """Applique une exécution d'ordre au modèle."""
+        order = ws_order.order
+        try:
+            price = float(order.limitPx)
+            filled_qty = float(getattr(order, 'origSz', None)) - float(order.sz or 0)
+        except (TypeError, ValueError):
+            self.mark_drift(f"cannot read fill quantity for order {order.oid}")
+            return
+        if filled_qty <= 0 or price <= 0:
+            self.mark_drift(f"invalid fill for order {order.oid}: qty={filled_qty} price={price}")
+            return
+
+        signed_qty = filled_qty if order.side in ('B', 'buy') else -filled_qty
+        self.cash -= signed_qty * price
+        self.position_size += signed_qty
+        self.mark_price = price
+        self.fills_since_reconcile += 1
+
+        if self.position_size < 0:
+            self.mark_drift(f"negative position size {self.position_size}")
+
+    def reconcile(self, account_data: AccountData):
+        """Resynchronise le modèle avec l'état du compte retourné par l'échange."""
+        position_size = 0.0
+        position_value = 0.0
+        for asset_position in account_data.info.assetPositions:
+            position = asset_position.position
+            if position.coin == self.coin:
+                position_size = _to_float(position.szi)
+                position_value = _to_float(position.positionValue)
+
+        equity = float(account_data.USDC.total)
+        if self.last_reconcile_time is not None:
+            self.logger.info(f"Account model reconcile after {self.fills_since_reconcile} fills - "
+                             f"local equity: {self.equity} - exchange equity: {equity}")
+
+        if position_size and position_value:
+            self.mark_price = abs(position_value / position_size)
+        self.position_size = position_size
+        self.cash = equity - position_size * self.mark_price
+        self.last_reconcile_time = self.clock()
+        self.fills_since_reconcile = 0
+        self.drift_detected = False
+
+
+def _to_float(value) -> float:
+    try:
+        return 0.0 if value is None or value == "" else float(value)
+    except (TypeError, ValueError):
+        return 0.0
@@ -1,21 +1,18 @@
 from dataclasses import dataclass
 import time
 from pprint import pprint
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
+from src.generic.account_model import LocalAccountModel
 from src.generic.cctx_balance_model import AccountData
+from src.generic.executed_orders import ExecutedOrder, ExecutedOrdersTracker, ExecutionStats
 from src.generic.hyperliquid_ws_model import WsOrder
+from src.generic.volatility import VolatilityEngine
 from src.data.interface import IData
 from src.data.position import Position
 from src.data.null_data import NullData
 
 
-@dataclass
-class ExecutedOrder:
-    type: Literal['buy', 'sell']
-    price: float
-    timestamp: time
-
 @dataclass
 class InitialSetupData:
     available_amount_to_trade: float
@@ -23,26 +20,6 @@ class InitialSetupData:
     initial_qty_single_element: float
 
 
-class ExecutedOrdersTracker:
-    last_executed_orders: [ExecutedOrder] = []
-
-    def add_order(self, wsOrder: WsOrder):
-        if not wsOrder or not wsOrder.order:
-            return
-        order = ExecutedOrder(
-            type='buy' if wsOrder.order.side == 'B' else 'sell',
-            price=wsOrder.order.limitPx,
-            timestamp=time.time())
-        self.last_executed_orders.append(order)
-
-    def add_buy(self, price: float):
-        self.last_executed_orders.append(ExecutedOrder(type='buy', price=price, timestamp=time.time()))
-
-    def add_sell(self, price: float):
-        self.last_executed_orders.append(ExecutedOrder(type='sell', price=price, timestamp=time.time()))
-
-
-
 #
 #       principe pour les positions
 #
@@ -64,8 +41,9 @@ class ExecutedOrdersTracker:
 
 from typing import Optional, Literal
 
-from src.generic.cctx_api import Dex
+from src.generic.cctx_api import Dex, OrderRequest
 from src.generic.cctx_model import Order
+from src.generic.order_ladder import OrderLadder, is_same_price
 import uuid
 import logging
 
@@ -75,7 +53,10 @@ BUY: OrderSide = 'buy'
 SELL: OrderSide = 'sell'
 
 class CoinManager:
-    count: int =0
+    __slots__ = ('count',)
+
+    def __init__(self, count: int = 0):
+        self.count = count
 
     def setInitialCoinCount(self, count: int):
         self.count = count
@@ -94,6 +75,24 @@ class CoinManager:
         self.count -= 1
 
 
+class AlgoState:
+    """
+    Etat propre à un compte : ordres ouverts, modèle de compte, exécutions, compteur de coins.
+
+    Une instance par Algo, pour que plusieurs comptes puissent tourner dans le même process.
+    """
+    __slots__ = ('order_ladder', 'account', 'executed_orders_tracker', 'coin_manager', 'event_id', 'volatility_engine')
+
+    def __init__(self, account: LocalAccountModel, nb_coins: int, executed_orders_capacity: int = 1024,
+                 volatility_engine: Optional[VolatilityEngine] = None):
+        self.order_ladder = OrderLadder()
+        self.account = account
+        self.executed_orders_tracker = ExecutedOrdersTracker(capacity=executed_orders_capacity)
+        self.coin_manager = CoinManager(nb_coins)
+        self.event_id = 0
+        self.volatility_engine = volatility_engine
+
+
 class Algo:
     logger = logging.getLogger(__name__)
 
@@ -104,35 +103,104 @@ class Algo:
     max_long_orders = 3
     # perpFundsPercentageForInitialLong = 10 # initial percentage to open Long position with PERP funds
 
-    previous_orders: [Order] = []
-    executed_orders_tracker = ExecutedOrdersTracker()
-    coin_manager = CoinManager()
-
     nbCoins = 4
     minNbCoins = 1
     initial_coins_buy = 5
     qtyDivider = 6 #TODO: set to 6
 
-    event_id = 0
-    
     # Interface de données et session ID
     data_service: IData
     session_id: str
 
-    def __init__(self, dex: Dex, gap: int, session_id: str, data_service: IData, max_leverage: int = 40):
+    def __init__(self, dex: Dex, gap: int, session_id: str, data_service: IData, max_leverage: int = 40,
+                 account_reconcile_interval: float = 60, executed_orders_capacity: int = 1024,
+                 volatility_engine: Optional[VolatilityEngine] = None, adaptive_gaps: Optional[List[int]] = None):
         self.dex = dex
         self.max_leverage = max_leverage
-        self.coin_manager.setInitialCoinCount(self.nbCoins)
+        self.state = AlgoState(
+            account=LocalAccountModel(coin=dex.symbol, leverage=max_leverage,
+                                      reconcile_interval=account_reconcile_interval),
+            nb_coins=self.nbCoins,
+            executed_orders_capacity=executed_orders_capacity,
+            volatility_engine=volatility_engine)
         self.data_service = data_service
         self.session_id = session_id
         self.set_gap_index(gap)
+        # gaps parmi lesquels choisir quand la volatilité pilote le gap (tous par défaut)
+        self.adaptive_gap_indexes = [self.GAPS.index(g) for g in adaptive_gaps] if adaptive_gaps \
+            else list(range(len(self.GAPS)))
         
+    @property
+    def order_ladder(self) -> OrderLadder:
+        return self.state.order_ladder
+
+    @property
+    def account(self) -> LocalAccountModel:
+        return self.state.account
+
+    @property
+    def executed_orders_tracker(self) -> ExecutedOrdersTracker:
+        return self.state.executed_orders_tracker
+
+    @property
+    def coin_manager(self) -> CoinManager:
+        return self.state.coin_manager
+
+    @property
+    def event_id(self) -> int:
+        return self.state.event_id
+
+    @event_id.setter
+    def event_id(self, value: int):
+        self.state.event_id = value
+
+    @property
+    def previous_orders(self) -> [Order]:
+        """Ordres ouverts connus de l'algo, dans leur ordre d'insertion."""
+        return list(self.order_ladder)
+
+    @previous_orders.setter
+    def previous_orders(self, orders: [Order]):
+        self.state.order_ladder = OrderLadder(orders)
+
+    is_same_price = staticmethod(is_same_price)
+
     def set_gap_index(self, gap_value: int):
         self.current_gap_idx = self.GAPS.index(gap_value)
         if self.current_gap_idx == -1:
             raise ValueError(f"Gap value {gap_value} not found in GAPS")
         
 
+    @property
+    def volatility_engine(self) -> Optional[VolatilityEngine]:
+        return self.state.volatility_engine
+
+    def on_price(self, price: float, timestamp: float):
+        """Tick de prix : alimente les indicateurs de volatilité"""
+        if self.volatility_engine:
+            self.volatility_engine.on_price(price, timestamp)
+
+    def on_candle(self, open_time: int, high: float, low: float, close: float):
+        """Mise à jour de la bougie en cours (flux candle du websocket)"""
+        if self.volatility_engine:
+            self.volatility_engine.on_candle(open_time, high, low, close)
+
+    def select_gap_index(self, volatility_percentile: float) -> int:
+        """Index dans GAPS : plus la volatilité est élevée dans la fenêtre, plus le gap est grand"""
+        candidates = self.adaptive_gap_indexes
+        position = min(len(candidates) - 1, int(volatility_percentile * len(candidates)))
+        return candidates[position]
+
+    def update_gap_from_volatility(self):
+        engine = self.volatility_engine
+        if not engine or not engine.is_ready:
+            return
+        gap_idx = self.select_gap_index(engine.volatility_percentile)
+        if gap_idx != self.current_gap_idx:
+            self.logger.info(f"{self.event_id} - Volatility percentile {engine.volatility_percentile:.2f}: "
+                             f"gap {self.get_gap()} -> {self.GAPS[gap_idx]}")
+            self.current_gap_idx = gap_idx
+
     def get_gap(self):
         return self.GAPS[self.current_gap_idx]
 
@@ -151,17 +219,22 @@ class Algo:
         # buy at market price
         initial_buy_qty = single_position_qty * self.initial_coins_buy
         print(f"Initial buy quantity: {initial_buy_qty} - unit : {initial_buy_qty}")
-        self.dex.buy_at_market_price(qty=initial_buy_qty, price=current_price)
 
-        # create initial OL and CL positions
+        # create initial OL and CL positions, in the same batch as the market buy
+        self.update_gap_from_volatility()
         gap = self.get_gap()
-        self.create_open_long_order(qty=single_position_qty, price=current_price - gap)
-        self.create_close_long_order(qty=single_position_qty, price=current_price + gap)
+        self.submit_orders([
+            OrderRequest(order_type='market', side=BUY, qty=initial_buy_qty, price=current_price),
+            self.open_long_request(qty=single_position_qty, price=current_price - gap),
+            self.close_long_request(qty=single_position_qty, price=current_price + gap),
+        ])
 
 
     def compute_initial_data(self) -> InitialSetupData:
-        available_amount_to_trade = self.dex.get_full_account_data().USDC.free
-        current_price = self.dex.get_current_price()
+        # lecture du compte et du prix en parallèle quand le backend le permet
+        full_account_data, current_price = self.dex.get_account_data_and_price()
+        self.account.reconcile(full_account_data)
+        available_amount_to_trade = full_account_data.USDC.free
         initial_position_qty = self.compute_coin_qty(perp_account_equity=available_amount_to_trade,
                                                      current_price=current_price)
         self.logger.info(f"Available amount to trade: {available_amount_to_trade} - Current price: {current_price} - Single position quantity : {initial_position_qty}")
@@ -182,6 +255,11 @@ class Algo:
         # Note: Il faudrait ajouter une méthode on_canceled_order à l'interface IData
 
 
+    def on_order_update(self, wsOrder: WsOrder):
+        """Tout message orderUpdates : complète les ordres créés sans fetch_order (mode confiance du Dex)"""
+        if hasattr(self.dex, 'on_order_update'):
+            self.dex.on_order_update(wsOrder)
+
     def on_executed_order(self, wsOrder: WsOrder):
         self.event_id += 1
         self.logger.info(f"{self.event_id} on_executed_order: {wsOrder}")
@@ -195,9 +273,10 @@ class Algo:
         # manage internal state
         self.executed_orders_tracker.add_order(wsOrder)
         self.remove_from_previous_orders(str(wsOrder.order.oid))
+        self.account.on_fill(wsOrder)
 
-        full_account_data  = self.dex.get_full_account_data()
-        perp_account_equity = full_account_data.USDC.total
+        perp_account_equity = self.get_perp_account_equity()
+        self.update_gap_from_volatility()
         if self.isBuyOrder(wsOrder.order): # 'B' = Bid = buy
             self.handle_executed_open_long(perp_account_equity, wsOrder)
         elif self.isSellOrder(wsOrder.order): # 'A' = Ask = sell
@@ -205,28 +284,37 @@ class Algo:
         else:
             self.logger.error(f"{self.event_id} --> Unknown order side: {wsOrder.order.side}")
 
+    def get_execution_stats(self) -> ExecutionStats:
+        """Statistiques glissantes sur les dernières exécutions"""
+        return self.executed_orders_tracker.stats()
+
+    def get_perp_account_equity(self) -> float:
+        """Equity du compte perp, lue sur le modèle local (réconcilié avec l'échange si besoin)"""
+        if self.account.needs_reconcile():
+            self.account.reconcile(self.dex.get_full_account_data())
+        return self.account.equity
+
     def remove_from_previous_orders(self, order_id: str):
         # log size before and after
-        self.logger.info(f"{self.event_id} - Removing order: {order_id} from previous orders. Size before: {len(self.previous_orders)}")
-        self.logger.info(f"{self.event_id} - Size before: {len(self.previous_orders)}")
-        self.logger.debug(f"{self.event_id} - Orders before removal: {[f'{o.id} (price: {o.price}, side: {o.side})' for o in self.previous_orders]}")
-        self.previous_orders = [o for o in self.previous_orders if o.id != order_id]
-        self.logger.info(f"{self.event_id} - Size after: {len(self.previous_orders)}")
-        self.logger.debug(f"{self.event_id} - Orders after removal: {[f'{o.id} (price: {o.price}, side: {o.side})' for o in self.previous_orders]}")
+        self.logger.info(f"{self.event_id} - Removing order: {order_id} from previous orders. Size before: {len(self.order_ladder)}")
+        self.order_ladder.remove(order_id)
+        self.logger.info(f"{self.event_id} - Size after: {len(self.order_ladder)}")
 
     # close long executed -> means the price has gone up and we have sold a coin
     # we do the same as for open long executed, except we remove the previous open long order
     def handle_executed_close_long(self, perp_account_equity: float, wsOrder: WsOrder):
         self.logger.info(f"{self.event_id} --> Close long executed: {wsOrder.order.oid} at price {wsOrder.order.limitPx}")
-        
-        self.handle_common_close_open_long_executed(perp_account_equity, wsOrder)
-        self.coin_manager.decrementCoinCount()
 
-        if self.coin_manager.getCoinCount() <= self.minNbCoins:
+        # the market buy (if any) is sent in the same batch as the new grid orders
+        refill_requests = []
+        if self.coin_manager.count - 1 <= self.minNbCoins:
             self.logger.info(f"Coin count is below minimum ({self.minNbCoins}). Buying {2} coins at market price")
             current_price = wsOrder.order.limitPx
             qty = 2 * self.compute_coin_qty(perp_account_equity, current_price)
-            self.dex.buy_at_market_price(qty, current_price)
+            refill_requests.append(OrderRequest(order_type='market', side=BUY, qty=qty, price=current_price))
+
+        self.handle_common_close_open_long_executed(perp_account_equity, wsOrder, refill_requests)
+        self.coin_manager.decrementCoinCount()
 
         # Enregistrer la position de vente remplie
         user_address = self.dex.get_user_address() if hasattr(self.dex, 'get_user_address') else "unknown"
@@ -260,106 +348,168 @@ class Algo:
         )
 
 
-    def handle_common_close_open_long_executed(self, perp_account_equity: float, wsOrder: WsOrder):
+    def handle_common_close_open_long_executed(self, perp_account_equity: float, wsOrder: WsOrder,
+                                               extra_requests: [OrderRequest] = ()):
         # compute qty to buy
         qty = self.compute_coin_qty(perp_account_equity, wsOrder.order.limitPx)
         gap = self.get_gap()
         current_price = wsOrder.order.limitPx
         self.logger.info(f"{self.event_id} - new order qty: {qty} - current price: {current_price} - gap: {gap}")
 
-        self.create_open_long_order(qty, current_price - gap)
-        self.create_close_long_order(qty, current_price + gap)
+        # the new open long re-prices the highest stale open long in place (one modify instead of
+        # one create plus one cancel), then one create batch for the remaining orders and one
+        # cancel batch for the lower open longs left
+        open_long_request = self.open_long_request(qty, current_price - gap)
+        replaced_open_long = self.get_replaceable_open_long(open_long_request)
+        if replaced_open_long is not None:
+            open_long_request = self.reprice_orders([replaced_open_long], [open_long_request])[0]
+
+        self.submit_orders([
+            open_long_request,
+            self.close_long_request(qty, current_price + gap),
+            *extra_requests,
+        ])
 
         self.remove_min_open_long_orders()
         self.check_current_orders()
 
 
     def check_current_orders(self):
-        bad_one_open_long = len([o for o in self.previous_orders if self.isBuyOrder(o)]) != 1
-        bad_close_long = len([o for o in self.previous_orders if self.isSellOrder(o)]) == 0
+        bad_one_open_long = self.order_ladder.count(BUY) != 1
+        bad_close_long = self.order_ladder.count(SELL) == 0
         if bad_one_open_long or bad_close_long:
             self.logger.error(f"{self.event_id} - Bad orders state: one open long: {not bad_one_open_long}, close long: {not bad_close_long}")
 
 
-    def create_open_long_order(self, qty: float, price: float) -> Order:
-        if not self.contains_open_long_at_price(price):
-            self.logger.info(f"{self.event_id} - Creating open long order: {qty} at {price}")
-            new_open_long = self.dex.create_open_long(qty=qty, price=price)
-            self.logger.debug(f"{self.event_id} --> Open long order created: {new_open_long}")
-            self.previous_orders.append(new_open_long)
-            
-            # Enregistrer la nouvelle position d'achat
-            symbol = getattr(new_open_long, 'symbol', "BTC-USD")
-            user_address = self.dex.get_user_address() if hasattr(self.dex, 'get_user_address') else "unknown"
+    def open_long_request(self, qty: float, price: float) -> Optional[OrderRequest]:
+        """Requête d'open long, ou None si un open long existe déjà à ce prix"""
+        if self.contains_open_long_at_price(price):
+            self.logger.info(f"{self.event_id} --> Open long order already exists at {price}")
+            return None
+        self.logger.info(f"{self.event_id} - Creating open long order: {qty} at {price}")
+        return OrderRequest(order_type='limit', side=BUY, qty=qty, price=price)
+
+    def close_long_request(self, qty: float, price: float) -> Optional[OrderRequest]:
+        """Requête de close long, ou None si un close long existe déjà à ce prix"""
+        if self.contains_close_long_at_price(price):
+            self.logger.info(f"{self.event_id} --> Close long order already exists at {price}")
+            return None
+        self.logger.info(f"{self.event_id} --> Creating close long order: {qty} at {price}")
+        return OrderRequest(order_type='limit', side=SELL, qty=qty, price=price)
+
+    def submit_orders(self, order_requests: [Optional[OrderRequest]]) -> [Order]:
+        """Envoie toutes les requêtes en un seul batch et enregistre les ordres limites créés"""
+        order_requests = [request for request in order_requests if request is not None]
+        if not order_requests:
+            return []
+
+        created_orders = self.dex.create_orders(order_requests)
+        for request, order in zip(order_requests, created_orders):
+            if not order.id:
+                self.logger.error(f"{self.event_id} --> Order rejected: {request} - status: {order.status}")
+                continue
+            if request.order_type == 'limit':
+                self.register_new_order(request, order)
+        return created_orders
+
+    def reprice_orders(self, orders: [Order], order_requests: [OrderRequest]) -> [Optional[OrderRequest]]:
+        """
+        Modifie des ordres au repos en un seul batch au lieu de les annuler et d'en recréer.
+
+        Returns:
+            Pour chaque ordre, None s'il a été modifié, sinon sa requête (modification
+            rejetée ou en échec, ou Dex sans modification) : à créer avec `submit_orders`.
+        """
+        if not orders:
+            return []
+        if not hasattr(self.dex, 'modify_orders'):
+            return list(order_requests)
+
+        self.logger.info(f"{self.event_id} --> Re-pricing orders: {[(order.id, request.price) for order, request in zip(orders, order_requests)]}")
+        try:
+            modified_orders = self.dex.modify_orders([order.id for order in orders], order_requests)
+        except Exception as e:
+            # ordre exécuté ou annulé pendant la modification : la réaction continue par une création
+            self.logger.error(f"{self.event_id} --> Modification failed, creating instead: {e}")
+            return list(order_requests)
+        remaining_requests = []
+        for order, request, modified in zip(orders, order_requests, modified_orders):
+            if not modified.id:
+                # l'ordre d'origine reste au repos : il sera annulé ou conservé comme les autres
+                self.logger.error(f"{self.event_id} --> Modification rejected: {order.id} - {request} - status: {modified.status}")
+                remaining_requests.append(request)
+                continue
+            self.order_ladder.remove(order.id)
+            self.register_new_order(request, modified)
+            remaining_requests.append(None)
+        return remaining_requests
+
+    def get_replaceable_open_long(self, request: Optional[OrderRequest]) -> Optional[Order]:
+        """Open long à re-pricer pour la requête : le plus haut, s'il devient obsolète une fois la requête placée"""
+        if request is None:
+            return None
+        highest_open_long = self.order_ladder.max_order(BUY)
+        if highest_open_long is None or highest_open_long.price > request.price:
+            return None
+        return highest_open_long
+
+    def register_new_order(self, request: OrderRequest, order: Order):
+        self.logger.debug(f"{self.event_id} --> Order created: {order}")
+        self.order_ladder.add(order)
+
+        # Enregistrer la nouvelle position
+        symbol = getattr(order, 'symbol', "BTC-USD")
+        user_address = self.dex.get_user_address() if hasattr(self.dex, 'get_user_address') else "unknown"
+        if request.side == BUY:
             self.data_service.on_new_buy_position(
                 symbol=symbol,
                 user_address=user_address,
                 side="LONG",
-                qty=qty,
-                price=price,
+                qty=request.qty,
+                price=request.price,
                 session_id=self.session_id
             )
-            return new_open_long
-        self.logger.info(f"{self.event_id} --> Open long order already exists at {price}")
-        return None
-    
-    def create_close_long_order(self, qty: float, price: float) -> Order:
-        if not self.contains_close_long_at_price(price):
-            self.logger.info(f"{self.event_id} --> Creating close long order: {qty} at {price}")
-            new_close_long = self.dex.create_close_long(qty=qty, price=price)
-            self.logger.debug(f"{self.event_id} --> Close long order created: {new_close_long}")
-            self.previous_orders.append(new_close_long)
-    
-            # Enregistrer la nouvelle position de vente
-            symbol = getattr(new_close_long, 'symbol', "BTC-USD")
-            user_address = self.dex.get_user_address() if hasattr(self.dex, 'get_user_address') else "unknown"
+        else:
             self.data_service.on_new_sell_position(
                 symbol=symbol,
                 user_address=user_address,
                 side="SHORT",
-                qty=qty,
-                price=price,
+                qty=request.qty,
+                price=request.price,
                 session_id=self.session_id
             )
-            return new_close_long
-        self.logger.info(f"{self.event_id} --> Close long order already exists at {price}")
-        return None
+
+    def create_open_long_order(self, qty: float, price: float) -> Order:
+        created_orders = self.submit_orders([self.open_long_request(qty, price)])
+        return created_orders[0] if created_orders else None
+
+    def create_close_long_order(self, qty: float, price: float) -> Order:
+        created_orders = self.submit_orders([self.close_long_request(qty, price)])
+        return created_orders[0] if created_orders else None
 
     def remove_min_open_long_orders(self):
         min_open_long_orders = self.get_min_open_long_orders()
-        for order in min_open_long_orders:
-            self.logger.info(f"{self.event_id} --> Removing min open long order: {order.id}")
-            self.remove_order(order)
+        if min_open_long_orders:
+            self.logger.info(f"{self.event_id} --> Removing min open long orders: {[order.id for order in min_open_long_orders]}")
+            self.remove_orders(min_open_long_orders)
 
     def contains_open_long_at_price(self, price: float) -> bool:
         """Vérifie si un ordre d'achat existe au prix donné"""
-        self.logger.info(f"{self.event_id} - previous orders : {self.previous_orders}")
-        for order in self.previous_orders:
-            if self.isBuyOrder(order) and float(order.price) == price:
-                return True
-        return False
+        return self.order_ladder.contains_price(BUY, price)
 
     def contains_close_long_at_price(self, price: float) -> bool:
         """Vérifie si un ordre de vente existe au prix donné"""
-        for order in self.previous_orders:
-            if self.isSellOrder(order) and float(order.price) == price:
-                return True
-        return False
+        return self.order_ladder.contains_price(SELL, price)
 
     def get_min_open_long_orders(self) -> [Order]:
-        open_long_orders = [order for order in self.previous_orders if self.isBuyOrder(order)]
-        open_long_orders.sort(key=lambda o: o.price)
         # Keep only the highest price open long order (most recent), remove all others
-        if len(open_long_orders) > 1:
-            return open_long_orders[:-1]  # Return all except the last (highest price)
+        if self.order_ladder.count(BUY) > 1:
+            return self.order_ladder.sorted_orders(BUY)[:-1]  # Return all except the last (highest price)
         return []
 
     def get_min_open_long_order(self) -> Optional[Order]:
         """Retrieves the open long order with min price from previous orders."""
-        open_long_orders = [order for order in self.previous_orders if self.isBuyOrder(order)]
-        open_long_orders.sort(key=lambda o: o.price)
-        self.logger.debug(f"{self.event_id} - Open long orders: {open_long_orders}")
-        return open_long_orders[0] if open_long_orders else None
+        return self.order_ladder.min_order(BUY)
 
 
     ## adaptive quantity : because takes in account the margin account
@@ -375,7 +525,12 @@ class Algo:
     
     def remove_order(self, order: Order):
         self.dex.cancel_order(order.id)
-        self.previous_orders = [o for o in self.previous_orders if o.id != order.id]
+        self.order_ladder.remove(order.id)
+
+    def remove_orders(self, orders: [Order]):
+        self.dex.cancel_orders([order.id for order in orders])
+        for order in orders:
+            self.order_ladder.remove(order.id)
 
     def recover_previous_state(self):
         self.logger.info("Enter in recovering previous state")
@@ -385,7 +540,7 @@ class Algo:
             self.logger.info("Nothing to recover")
             return
 
-        if len(self.previous_orders) == 0:
+        if len(self.order_ladder) == 0:
             self.logger.info("requires to setup initial positions")
             self.setup_initial_positions()
             return
@@ -404,10 +559,10 @@ class Algo:
         return not self.contains_close_long() and not self.contains_open_long()
 
     def contains_open_long(self):
-        return any(order for order in self.previous_orders if self.isBuyOrder(order))
+        return self.order_ladder.count(BUY) > 0
 
     def contains_close_long(self):
-        return any(order for order in self.previous_orders if self.isSellOrder(order))
+        return self.order_ladder.count(SELL) > 0
 
     def isBuyOrder(self, order) -> bool:
         """Vérifie si un ordre est un ordre d'achat."""
@@ -0,0 +1,256 @@
+"""
+Backend asynchrone de Dex, sur ccxt.async_support.
+
+Tous les AsyncDex du process partagent une boucle asyncio (thread dédié) et une session
+aiohttp dont le pool de connexions reste ouvert (keep-alive) : une seule boucle sert tous
+les comptes, et les appels indépendants d'un même compte partent en parallèle.
+L'Algo, synchrone, utilise un AsyncDex au travers de `AsyncDexBridge`.
+"""
+
+import asyncio
+import logging
+import ssl
+import threading
+from typing import Coroutine, Optional, Tuple, TypeVar
+
+import aiohttp
+import ccxt.async_support as ccxt_async
+import certifi
+
+from src.generic.cctx_api import DexBase, DexConfig, OrderRequest
+from src.generic.cctx_balance_model import AccountData
+from src.generic.cctx_mapper import parse_balance, parse_order
+from src.generic.cctx_model import Order
+from src.generic.hyperliquid_ws_model import WsOrder
+from src.generic.market_metadata import MarketMetadataCache
+
+T = TypeVar("T")
+
+
+class AsyncDexRuntime:
+    """Boucle asyncio sur un thread daemon et session aiohttp partagée."""
+    logger = logging.getLogger(__name__)
+
+    _shared: Optional['AsyncDexRuntime'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, connection_limit: int = 100, keepalive_timeout: float = 60):
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="AsyncDexRuntime")
+        self._thread.start()
+        self.session: aiohttp.ClientSession = self.run(self._create_session())
+
+    @classmethod
+    def shared(cls) -> 'AsyncDexRuntime':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @classmethod
+    def close_shared(cls):
+        with cls._shared_lock:
+            if cls._shared is not None:
+                cls._shared.close()
+                cls._shared = None
+
+    async def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            keepalive_timeout=self.keepalive_timeout,
+            ssl=ssl.create_default_context(cafile=certifi.where()),
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def run(self, coroutine: Coroutine[None, None, T], timeout: Optional[float] = None) -> T:
+        """Exécute la coroutine sur la boucle partagée et attend son résultat (appel bloquant)"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def close(self):
+        if not self.loop.is_running():
+            return
+        try:
+            self.run(self.session.close(), timeout=5)
+        except Exception as e:
+            self.logger.warning(f"Error closing shared aiohttp session: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(5)
+
+
+class AsyncDex(DexBase):
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, dex_config: DexConfig, session: Optional[aiohttp.ClientSession] = None,
+                 trust_creation_response: bool = False, market_metadata: Optional[MarketMetadataCache] = None):
+        super().__init__(dex_config, trust_creation_response)
+        ccxt_config = self.ccxt_config(dex_config)
+        if session is not None:
+            # ccxt ne ferme pas une session qu'il n'a pas créée
+            ccxt_config['session'] = session
+        self.dex = ccxt_async.hyperliquid(ccxt_config)
+        self._load_market_metadata(self.dex, dex_config, market_metadata)
+        self.exchange_metrics.instrument(self.dex)
+
+    async def close(self):
+        await self.dex.close()
+
+    async def get_open_orders(self) -> [Order]:
+        open_orders = await self.dex.fetch_open_orders()
+        return [parse_order(order) for order in open_orders]
+
+    async def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        """Même contrat que Dex.create_orders"""
+        if not order_requests:
+            return []
+        order_requests = [self._prepare_request(request) for request in order_requests]
+        self.logger.info(f"api - Creating {len(order_requests)} orders in one batch: {order_requests}")
+        try:
+            responses = await self.dex.create_orders([self._order_request_dict(request) for request in order_requests])
+        except ccxt_async.BaseError as e:
+            self.logger.error(f"Failed to create orders: {e}")
+            responses = await self._responses_after_failure(e, order_requests)
+        self.logger.info(f"Orders creation response: {responses}")
+        orders = [parse_order(self._complete_creation_response(response, request))
+                  for response, request in zip(responses, order_requests)]
+        for order in orders:
+            self._track_unconfirmed(order)
+        return orders
+
+    async def create_order(self, request: OrderRequest) -> Order:
+        return (await self.create_orders([request]))[0]
+
+    async def create_open_long(self, qty, price) -> Order:
+        return await self.create_order(OrderRequest(order_type='limit', side=self.buy, qty=qty, price=price))
+
+    async def create_close_long(self, qty, price) -> Order:
+        return await self.create_order(OrderRequest(order_type='limit', side=self.sell, qty=qty, price=price))
+
+    async def buy_at_market_price(self, qty: float, price: float) -> Order:
+        self.logger.info(f"Buying {qty} at market price : {price}")
+        return await self.create_order(OrderRequest(order_type='market', side=self.buy, qty=qty, price=price))
+
+    async def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        """Même contrat que Dex.modify_orders"""
+        if not order_ids:
+            return []
+        order_requests = [self._prepare_request(request) for request in order_requests]
+        self.logger.info(f"api - Modifying {len(order_ids)} orders in one batch: {list(zip(order_ids, order_requests))}")
+        try:
+            responses = await self.dex.edit_orders([self._order_edit_dict(order_id, request)
+                                                    for order_id, request in zip(order_ids, order_requests)])
+        except ccxt_async.BaseError as e:
+            self.logger.error(f"Failed to modify orders: {e}")
+            responses = await self._responses_after_failure(e, order_requests)
+        self.logger.info(f"Orders modification response: {responses}")
+        orders = [parse_order(self._complete_creation_response(response, request))
+                  for response, request in zip(responses, order_requests)]
+        for order in orders:
+            self._track_unconfirmed(order)
+        return orders
+
+    async def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        return (await self.modify_orders([order_id], [request]))[0]
+
+    async def _responses_after_failure(self, error: Exception, order_requests: [OrderRequest]) -> [dict]:
+        """Même reprise que Dex._responses_after_failure"""
+        responses = self._failed_batch_responses(error, len(order_requests))
+        if responses is not None:
+            return responses
+        try:
+            open_orders = await self.dex.fetch_open_orders(self.get_symbol())
+        except Exception as e:
+            self.logger.error(f"Could not reconcile the failed batch with open orders: {e}")
+            raise error
+        return self._reconcile_batch(order_requests, open_orders)
+
+    async def cancel_orders(self, order_ids: [str]):
+        if not order_ids:
+            return
+        self.logger.info(f"api - Cancelling {len(order_ids)} orders in one batch: {order_ids}")
+        await self.dex.cancel_orders(order_ids, symbol=self.get_symbol())
+
+    async def cancel_order(self, order_id: str):
+        self.logger.info(f"api - Cancelling order {order_id}")
+        await self.dex.cancel_order(order_id, symbol=self.get_symbol())
+
+    async def get_current_price(self) -> float:
+        ticker = await self.dex.fetch_ticker(self.get_symbol())
+        return float(ticker['last'])
+
+    async def get_full_account_data(self) -> AccountData:
+        return parse_balance(await self.dex.fetch_balance())
+
+    async def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        """Compte et prix courant, lus en parallèle"""
+        account_data, price = await asyncio.gather(self.get_full_account_data(), self.get_current_price())
+        return account_data, price
+
+    async def set_cross_margin_leverage(self, leverage: int):
+        await self.dex.set_margin_mode('cross', symbol=self.get_symbol(), params={"leverage": leverage})
+
+
+class AsyncDexBridge:
+    """
+    Interface synchrone de Dex pour l'Algo : chaque appel est exécuté sur la boucle partagée.
+
+    Le thread appelant (worker de l'observer) attend le résultat ; les appels groupés
+    (get_account_data_and_price) partent en parallèle sur la boucle.
+    """
+
+    def __init__(self, async_dex: AsyncDex, runtime: AsyncDexRuntime):
+        self.async_dex = async_dex
+        self.runtime = runtime
+        self.symbol = async_dex.symbol
+        self.marginCoin = async_dex.marginCoin
+        self.exchange_metrics = async_dex.exchange_metrics
+
+    def get_symbol(self) -> str:
+        return self.async_dex.get_symbol()
+
+    def get_open_orders(self) -> [Order]:
+        return self.runtime.run(self.async_dex.get_open_orders())
+
+    def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        return self.runtime.run(self.async_dex.create_orders(order_requests))
+
+    def create_open_long(self, qty, price) -> Order:
+        return self.runtime.run(self.async_dex.create_open_long(qty, price))
+
+    def create_close_long(self, qty, price) -> Order:
+        return self.runtime.run(self.async_dex.create_close_long(qty, price))
+
+    def buy_at_market_price(self, qty: float, price: float) -> Order:
+        return self.runtime.run(self.async_dex.buy_at_market_price(qty, price))
+
+    def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        return self.runtime.run(self.async_dex.modify_orders(order_ids, order_requests))
+
+    def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        return self.runtime.run(self.async_dex.modify_order(order_id, request))
+
+    def cancel_orders(self, order_ids: [str]):
+        return self.runtime.run(self.async_dex.cancel_orders(order_ids))
+
+    def cancel_order(self, order_id: str):
+        return self.runtime.run(self.async_dex.cancel_order(order_id))
+
+    def get_current_price(self) -> float:
+        return self.runtime.run(self.async_dex.get_current_price())
+
+    def get_full_account_data(self) -> AccountData:
+        return self.runtime.run(self.async_dex.get_full_account_data())
+
+    def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        return self.runtime.run(self.async_dex.get_account_data_and_price())
+
+    def set_cross_margin_leverage(self, leverage: int):
+        return self.runtime.run(self.async_dex.set_cross_margin_leverage(leverage))
+
+    def on_order_update(self, ws_order: WsOrder) -> Optional[Order]:
+        # pas d'appel réseau : exécuté directement sur le thread appelant
+        return self.async_dex.on_order_update(ws_order)
+
+    def close(self):
+        self.runtime.run(self.async_dex.close())
@@ -0,0 +1,225 @@
+"""
+Cache en lecture devant un Dex (Dex, AsyncDexBridge ou SimulatedDex).
+
+Les lectures (prix, compte, ordres ouverts) sont servies depuis le cache tant que leur TTL
+n'est pas écoulé. Les exécutions et annulations reçues par le websocket, ainsi que les
+écritures passées par ce Dex, invalident les entrées qu'elles rendent obsolètes. Des
+lectures identiques simultanées ne partent qu'une fois sur le réseau (single-flight).
+"""
+
+import dataclasses
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.generic.cctx_api import OrderRequest
+from src.generic.cctx_balance_model import AccountData
+from src.generic.cctx_model import Order
+from src.generic.hyperliquid_ws_model import WsOrder
+
+PRICE = 'price'
+ACCOUNT = 'account'
+AVAILABLE_BALANCE = 'available_balance'
+ACCOUNT_SUMMARY = 'account_summary'
+OPEN_ORDERS = 'open_orders'
+
+DEFAULT_TTLS = {
+    PRICE: 1.0,
+    ACCOUNT: 5.0,
+    AVAILABLE_BALANCE: 5.0,
+    ACCOUNT_SUMMARY: 5.0,
+    OPEN_ORDERS: 5.0,
+}
+
+# entrées rendues obsolètes par une exécution, une annulation ou une création d'ordre
+ACCOUNT_ENTRIES = (ACCOUNT, AVAILABLE_BALANCE, ACCOUNT_SUMMARY)
+ORDER_ENTRIES = ACCOUNT_ENTRIES + (OPEN_ORDERS,)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # lectures servies par un appel réseau déjà en cours (single-flight)
+    shared: int = 0
+    invalidations: int = 0
+
+
+class _Flight:
+    """Appel réseau en cours, partagé par les lecteurs de la même entrée"""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class CachedDex:
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, dex, ttls: Optional[Dict[str, float]] = None, clock: Callable[[], float] = time.monotonic):
+        self.dex = dex
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}  # clé -> (expiration, valeur)
+        self._flights: Dict[str, _Flight] = {}
+        # incrémenté à chaque invalidation : un résultat chargé avant l'invalidation n'est pas mis en cache
+        self._generations: Dict[str, int] = {key: 0 for key in self.ttls}
+        self._stats: Dict[str, CacheStats] = {key: CacheStats() for key in self.ttls}
+
+    def __getattr__(self, name):
+        # symbol, marginCoin, get_user_address... : délégués au Dex
+        return getattr(self.dex, name)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        with self._lock:
+            return {key: dataclasses.replace(stats) for key, stats in self._stats.items()}
+
+    def invalidate(self, *keys: str):
+        with self._lock:
+            for key in keys or tuple(self.ttls):
+                self._generations[key] += 1
+                if self._entries.pop(key, None) is not None:
+                    self._stats[key].invalidations += 1
+
+    def _read(self, key: str, load: Callable[[], Any]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._stats[key].hits += 1
+                return entry[1]
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats[key].shared += 1
+                leader = False
+            else:
+                self._stats[key].misses += 1
+                flight = self._flights[key] = _Flight()
+                generation = self._generations[key]
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = load()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and self._generations[key] == generation:
+                    self._entries[key] = (self.clock() + self.ttls[key], flight.value)
+            flight.done.set()
+        return flight.value
+
+    # --- lectures
+
+    def get_current_price(self) -> float:
+        return self._read(PRICE, self.dex.get_current_price)
+
+    def get_full_account_data(self) -> AccountData:
+        return self._read(ACCOUNT, self.dex.get_full_account_data)
+
+    def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        """Si aucune des deux entrées n'est fraîche, le Dex les lit ensemble (en parallèle pour le backend asynchrone)"""
+        with self._lock:
+            now = self.clock()
+            stale = all(self._entries.get(key, (0.0,))[0] <= now for key in (ACCOUNT, PRICE))
+        if stale:
+            account_data = self._read(ACCOUNT, self._load_account_data_and_price)
+        else:
+            account_data = self.get_full_account_data()
+        return account_data, self.get_current_price()
+
+    def _load_account_data_and_price(self) -> AccountData:
+        """Chargement de l'entrée compte qui met aussi en cache le prix lu avec elle"""
+        with self._lock:
+            generation = self._generations[PRICE]
+        account_data, price = self.dex.get_account_data_and_price()
+        with self._lock:
+            if self._generations[PRICE] == generation:
+                self._entries[PRICE] = (self.clock() + self.ttls[PRICE], price)
+        return account_data
+
+    def get_perp_available_balance(self) -> float:
+        return self._read(AVAILABLE_BALANCE, self.dex.get_perp_available_balance)
+
+    def get_account_data(self):
+        return self._read(ACCOUNT_SUMMARY, self.dex.get_account_data)
+
+    def get_open_orders(self) -> [Order]:
+        return list(self._read(OPEN_ORDERS, self.dex.get_open_orders))
+
+    # --- écritures : transmises au Dex, puis invalidation des lectures qu'elles modifient
+
+    def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        try:
+            return self.dex.create_orders(order_requests)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def create_open_long(self, qty, price) -> Order:
+        try:
+            return self.dex.create_open_long(qty, price)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def create_close_long(self, qty, price) -> Order:
+        try:
+            return self.dex.create_close_long(qty, price)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def buy_at_market_price(self, qty: float, price: float) -> Order:
+        try:
+            return self.dex.buy_at_market_price(qty, price)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        try:
+            return self.dex.modify_orders(order_ids, order_requests)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        try:
+            return self.dex.modify_order(order_id, request)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def cancel_orders(self, order_ids: [str]):
+        try:
+            return self.dex.cancel_orders(order_ids)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def cancel_order(self, order_id: str):
+        try:
+            return self.dex.cancel_order(order_id)
+        finally:
+            self.invalidate(*ORDER_ENTRIES)
+
+    def set_cross_margin_leverage(self, leverage: int):
+        try:
+            return self.dex.set_cross_margin_leverage(leverage)
+        finally:
+            self.invalidate(*ACCOUNT_ENTRIES)
+
+    # --- websocket
+
+    def on_order_update(self, ws_order: WsOrder):
+        """Tout changement d'état d'un ordre (création, exécution, annulation) modifie le compte et les ordres ouverts"""
+        self.invalidate(*ORDER_ENTRIES)
+        if hasattr(self.dex, 'on_order_update'):
+            return self.dex.on_order_update(ws_order)
+        return None
@@ -1,5 +1,11 @@
+import json
 import logging
+import math
+import threading
+import uuid
+from collections import OrderedDict
 from pprint import pprint
+from typing import Optional, Tuple
 
 import ccxt
 import dataclasses
@@ -8,6 +14,9 @@ from ccxt.base.types import Balances
 from src.generic.cctx_balance_model import AccountData
 from src.generic.cctx_mapper import parse_order, parse_balance
 from src.generic.cctx_model import Order
+from src.generic.exchange_metrics import ExchangeMetrics
+from src.generic.hyperliquid_ws_model import WsOrder
+from src.generic.market_metadata import MarketMetadataCache
 
 
 def to_float(value) -> float:
@@ -26,20 +35,213 @@ class DexConfig:
     walletAddress: str
     apiKey: str
 
-class Dex:
+@dataclasses.dataclass
+class OrderRequest:
+    order_type: str  # 'limit', 'market'
+    side: str  # 'buy', 'sell'
+    qty: float
+    price: float
+    params: Optional[dict] = None
+
+def new_cloid() -> str:
+    """Client order id Hyperliquid : 128 bits en hexadécimal"""
+    return '0x' + uuid.uuid4().hex
+
+
+# statut ccxt d'un ordre selon le statut du flux orderUpdates
+WS_ORDER_STATUSES = {'open': 'open', 'filled': 'closed', 'canceled': 'canceled', 'rejected': 'rejected'}
+
+
+class DexBase:
+    """Partie commune aux backends synchrone (Dex) et asynchrone (AsyncDex) : symbole et mapping des requêtes."""
     buy = 'buy'
     sell = 'sell'
 
-    logger = logging.getLogger(__name__)
+    # ordres créés sans fetch_order, en attente de leur premier message orderUpdates
+    max_unconfirmed_orders = 1000
 
-    def __init__(self, dex_config: DexConfig):
+    def __init__(self, dex_config: DexConfig, trust_creation_response: bool = False):
         self.symbol = dex_config.symbol
         self.marginCoin = dex_config.marginCoin
-        self.dex = ccxt.hyperliquid({
+        # l'ordre est construit à partir de la réponse de création et de la requête, sans fetch_order ;
+        # le reste de ses champs est complété par le websocket, corrélé par client order id
+        self.trust_creation_response = trust_creation_response
+        self._unconfirmed_orders: OrderedDict = OrderedDict()  # cloid -> Order
+        self._unconfirmed_lock = threading.Lock()
+        # latences, erreurs et relances des appels au client ccxt, par endpoint
+        self.exchange_metrics = ExchangeMetrics()
+
+    @staticmethod
+    def ccxt_config(dex_config: DexConfig) -> dict:
+        return {
             'walletAddress': dex_config.walletAddress,
             "privateKey": dex_config.apiKey,
             'options': {'sandbox': dex_config.isTest},
-        })
+        }
+
+    def get_symbol(self) -> str:
+        return self.symbol + '/' + self.marginCoin + ':' + self.marginCoin
+
+    def _load_market_metadata(self, exchange, dex_config: DexConfig, market_metadata):
+        """Marchés injectés depuis le cache partagé ; en cas d'échec, ccxt les téléchargera au premier appel"""
+        if market_metadata is None:
+            return
+        try:
+            market_metadata.apply(exchange, dex_config.isTest)
+        except Exception as e:
+            self.logger.warning(f"Could not apply cached market metadata, falling back to load_markets: {e}")
+
+    def _prepare_request(self, request: OrderRequest) -> OrderRequest:
+        """En mode confiance, chaque ordre porte un client order id pour être retrouvé dans le websocket"""
+        if not self.trust_creation_response or (request.params or {}).get('clientOrderId'):
+            return request
+        return dataclasses.replace(request, params={**(request.params or {}), 'clientOrderId': new_cloid()})
+
+    def _track_unconfirmed(self, order: Order):
+        if not self.trust_creation_response or not order.id or not order.clientOrderId:
+            return
+        with self._unconfirmed_lock:
+            self._unconfirmed_orders[order.clientOrderId] = order
+            while len(self._unconfirmed_orders) > self.max_unconfirmed_orders:
+                self._unconfirmed_orders.popitem(last=False)
+
+    def on_order_update(self, ws_order: WsOrder) -> Optional[Order]:
+        """
+        Complète un ordre créé sans fetch_order avec le premier message orderUpdates qui le concerne.
+
+        Returns:
+            Optional[Order]: L'ordre complété (le même objet que celui retourné à la création), ou None.
+        """
+        cloid = getattr(ws_order.order, 'cloid', None)
+        if not cloid:
+            return None
+        with self._unconfirmed_lock:
+            order = self._unconfirmed_orders.pop(cloid, None)
+        if order is None:
+            return None
+
+        update = ws_order.order
+        info = order.info
+        info.coin = info.coin or update.coin
+        info.side = info.side or update.side
+        info.limitPx = info.limitPx or update.limitPx
+        info.sz = info.sz or update.sz
+        info.oid = info.oid or str(update.oid)
+        info.timestamp = info.timestamp or update.timestamp
+        info.origSz = info.origSz or update.origSz
+        info.cloid = cloid
+        order.id = order.id or str(update.oid)
+        order.timestamp = order.timestamp or update.timestamp
+        order.lastUpdateTimestamp = ws_order.statusTimestamp
+        order.status = WS_ORDER_STATUSES.get(ws_order.status, order.status)
+        if ws_order.status == 'filled':
+            order.filled = order.amount
+            order.remaining = 0.0
+        return order
+
+    def _order_request_dict(self, request: OrderRequest) -> dict:
+        return {
+            'symbol': self.get_symbol(),
+            'type': request.order_type,
+            'side': request.side,
+            'amount': request.qty,
+            'price': request.price,
+            'params': request.params or {},
+        }
+
+    def _order_edit_dict(self, order_id: str, request: OrderRequest) -> dict:
+        return {'id': order_id, **self._order_request_dict(request)}
+
+    @staticmethod
+    def _status_dict(status) -> dict:
+        """Réponse au format ccxt (id, statut, exécution) d'un statut d'ordre natif"""
+        if isinstance(status, dict) and 'resting' in status:
+            return {'id': str(status['resting']['oid']), 'info': status, 'status': 'open'}
+        if isinstance(status, dict) and 'filled' in status:
+            filled = status['filled']
+            return {'id': str(filled['oid']), 'info': status, 'status': 'closed', 'remaining': 0.0,
+                    'filled': float(filled['totalSz']), 'average': float(filled['avgPx'])}
+        error = status.get('error') if isinstance(status, dict) else status
+        return {'id': '', 'info': {'error': error}, 'status': 'rejected'}
+
+    def _failed_batch_responses(self, error: Exception, nb_orders: int) -> Optional[list]:
+        """
+        Réponse de chaque ordre d'une action groupée sur laquelle ccxt a levé une erreur.
+
+        ccxt lève dès qu'un statut du batch porte une erreur, alors que les autres ordres ont été
+        placés : son message contient la réponse de l'échange ("hyperliquid {...}"), avec le statut
+        de chaque ordre. None si la réponse est illisible (erreur réseau...) : l'état du batch est inconnu.
+        """
+        try:
+            response = json.loads(str(error).partition(' ')[2])
+        except ValueError:
+            return None
+        if not isinstance(response, dict):
+            return None
+        if response.get('status') == 'err':
+            # action refusée en entier : aucun ordre placé
+            return [self._status_dict({'error': response.get('response')})] * nb_orders
+        data = response.get('response', {}).get('data') if isinstance(response.get('response'), dict) else None
+        statuses = (data or {}).get('statuses')
+        if not isinstance(statuses, list) or len(statuses) != nb_orders:
+            return None
+        return [self._status_dict(status) for status in statuses]
+
+    def _reconcile_batch(self, order_requests: [OrderRequest], open_orders: [dict]) -> [dict]:
+        """Réponse de chaque requête d'après les ordres au repos : même client order id, sinon même côté et prix"""
+        remaining = list(open_orders)
+        responses = []
+        for request in order_requests:
+            cloid = (request.params or {}).get('clientOrderId')
+            match = next((order for order in remaining
+                          if (order.get('clientOrderId') == cloid if cloid else
+                              order.get('side') == request.side and request.price is not None
+                              and math.isclose(float(order.get('price') or 0), request.price, rel_tol=1e-4))), None)
+            if match is None:
+                responses.append(self._status_dict({'error': 'not resting after a failed batch'}))
+            else:
+                remaining.remove(match)
+                responses.append(match)
+        return responses
+
+    def _complete_creation_response(self, response: dict, request: OrderRequest) -> dict:
+        """Complète une réponse de création avec les paramètres connus de la requête."""
+        completed = dict(response)
+        if completed.get('status') == 'rejected':
+            return completed
+        known_values = {
+            'clientOrderId': (request.params or {}).get('clientOrderId'),
+            'symbol': self.get_symbol(),
+            'type': request.order_type,
+            'side': request.side,
+            'price': request.price,
+            'amount': request.qty,
+            'remaining': request.qty,
+        }
+        for key, value in known_values.items():
+            if completed.get(key) is None:
+                completed[key] = value
+        return completed
+
+
+class Dex(DexBase):
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, dex_config: DexConfig, trust_creation_response: bool = False,
+                 market_metadata: Optional[MarketMetadataCache] = None, session=None, public_data=None):
+        """
+        Args:
+            session: Session requests partagée (pool de connexions), sinon ccxt crée la sienne
+            public_data: Source partagée des données publiques (get_current_price), sinon le client ccxt
+        """
+        super().__init__(dex_config, trust_creation_response)
+        ccxt_config = self.ccxt_config(dex_config)
+        if session is not None:
+            ccxt_config['session'] = session
+        self.dex = ccxt.hyperliquid(ccxt_config)
+        self.public_data = public_data
+        self._load_market_metadata(self.dex, dex_config, market_metadata)
+        self.exchange_metrics.instrument(self.dex)
         self.previous_orders = []
 
     def get_open_orders(self) -> [Order]:
@@ -68,9 +270,10 @@ class Dex:
         Raises:
             Exception: Si la création de l'ordre échoue
         """
-        if params is None:
-            params = {}
-            
+        request = self._prepare_request(OrderRequest(order_type=order_type, side=side, qty=qty, price=price,
+                                                     params=params))
+        params = request.params or {}
+
         self.logger.info(f"api - Creating {side} {order_type} order: {qty} at {price}")
         
         try:
@@ -94,7 +297,12 @@ class Dex:
                 raise Exception(f"Order creation failed: {order_creation_response}")
                 
             order_id = order_creation_response['id']
-            
+
+            if self.trust_creation_response:
+                order = parse_order(self._complete_creation_response(order_creation_response, request))
+                self._track_unconfirmed(order)
+                return order
+
             # Récupérer les détails complets de l'ordre
             try:
                 full_order = self.dex.fetch_order(order_id, self.get_symbol())
@@ -113,6 +321,97 @@ class Dex:
             self.logger.error(f"Failed to create order: {e}")
             raise
 
+    def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        """
+        Crée plusieurs ordres en une seule action d'échange (ccxt create_orders).
+
+        La réponse de l'échange ne contient que l'oid (et le statut) de chaque ordre :
+        les champs manquants sont complétés à partir de la requête correspondante,
+        sans fetch_order supplémentaire.
+
+        Args:
+            order_requests: Ordres à créer
+
+        Returns:
+            [Order]: Ordres parsés, dans le même ordre que les requêtes.
+                     Un ordre rejeté a un id vide et le statut 'rejected' : ccxt lève une erreur pour
+                     tout le batch dès qu'un ordre est rejeté, le statut de chaque ordre est alors
+                     relu dans la réponse de l'échange, ou à défaut dans les ordres au repos.
+        """
+        if not order_requests:
+            return []
+
+        order_requests = [self._prepare_request(request) for request in order_requests]
+        self.logger.info(f"api - Creating {len(order_requests)} orders in one batch: {order_requests}")
+        try:
+            responses = self.dex.create_orders([self._order_request_dict(request) for request in order_requests])
+        except ccxt.BaseError as e:
+            self.logger.error(f"Failed to create orders: {e}")
+            responses = self._responses_after_failure(e, order_requests)
+
+        self.logger.info(f"Orders creation response: {responses}")
+        orders = [parse_order(self._complete_creation_response(response, request))
+                  for response, request in zip(responses, order_requests)]
+        for order in orders:
+            self._track_unconfirmed(order)
+        return orders
+
+    def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        """
+        Modifie plusieurs ordres au repos en une seule action d'échange (ccxt edit_orders).
+
+        Remplace l'annulation suivie d'une création : une seule action au lieu de deux,
+        et l'ordre garde sa priorité dans le carnet si son prix ne change pas.
+
+        Args:
+            order_ids: Ordres à modifier
+            order_requests: Nouveaux paramètres de chaque ordre, dans le même ordre
+
+        Returns:
+            [Order]: Ordres modifiés, dans le même ordre que les requêtes.
+                     Une modification rejetée (ordre déjà exécuté ou annulé...) a un id vide et le
+                     statut 'rejected', y compris quand ccxt lève une erreur pour le batch.
+        """
+        if not order_ids:
+            return []
+
+        order_requests = [self._prepare_request(request) for request in order_requests]
+        self.logger.info(f"api - Modifying {len(order_ids)} orders in one batch: {list(zip(order_ids, order_requests))}")
+        try:
+            responses = self.dex.edit_orders([self._order_edit_dict(order_id, request)
+                                              for order_id, request in zip(order_ids, order_requests)])
+        except ccxt.BaseError as e:
+            self.logger.error(f"Failed to modify orders: {e}")
+            responses = self._responses_after_failure(e, order_requests)
+
+        self.logger.info(f"Orders modification response: {responses}")
+        orders = [parse_order(self._complete_creation_response(response, request))
+                  for response, request in zip(responses, order_requests)]
+        for order in orders:
+            self._track_unconfirmed(order)
+        return orders
+
+    def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        return self.modify_orders([order_id], [request])[0]
+
+    def _responses_after_failure(self, error: Exception, order_requests: [OrderRequest]) -> [dict]:
+        responses = self._failed_batch_responses(error, len(order_requests))
+        if responses is not None:
+            return responses
+        try:
+            open_orders = self.dex.fetch_open_orders(self.get_symbol())
+        except Exception as e:
+            self.logger.error(f"Could not reconcile the failed batch with open orders: {e}")
+            raise error
+        return self._reconcile_batch(order_requests, open_orders)
+
+    def cancel_orders(self, order_ids: [str]):
+        """Annule plusieurs ordres en une seule action d'échange (ccxt cancel_orders)."""
+        if not order_ids:
+            return
+        self.logger.info(f"api - Cancelling {len(order_ids)} orders in one batch: {order_ids}")
+        self.dex.cancel_orders(order_ids, symbol=self.get_symbol())
+
     def create_open_long(self, qty, price) -> Order:
         return self._create_and_fetch_order('limit', 'buy', qty, price)
 
@@ -131,19 +430,22 @@ class Dex:
         return self.dex.fetch_balance()
 
     def get_current_price(self) -> float:
+        if self.public_data is not None:
+            return self.public_data.get_current_price()
         price = self.dex.fetch_ticker(self.get_symbol())['last']
         return to_float(price)
 
     def set_cross_margin_leverage(self, leverage: int):
         self.dex.set_margin_mode('cross', symbol=self.get_symbol(), params={"leverage": leverage})
 
-    def get_symbol(self) -> str:
-        return self.symbol + '/' + self.marginCoin + ':' + self.marginCoin
-
     def get_full_account_data(self) -> AccountData:
         data = self.dex.fetch_balance()
         return parse_balance(data)
 
+    def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        """Compte et prix courant (deux appels successifs, parallélisés par le backend asynchrone)"""
+        return self.get_full_account_data(), self.get_current_price()
+
 
     ## TODO: remove
     def get_account_data(self) -> AccountDataOld :
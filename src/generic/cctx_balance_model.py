@@ -1,59 +1,59 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class CumFunding:
-    allTime: str
-    sinceOpen: str
-    sinceChange: str
+    allTime: float
+    sinceOpen: float
+    sinceChange: float
 
-@dataclass
+@dataclass(slots=True)
 class Leverage:
     type: str
-    value: str
+    value: int
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     coin: str
-    szi: str
+    szi: float
     leverage: Leverage
-    entryPx: str
-    positionValue: str
-    unrealizedPnl: str
-    returnOnEquity: str
-    liquidationPx: str
-    marginUsed: str
-    maxLeverage: str
+    entryPx: float
+    positionValue: float
+    unrealizedPnl: float
+    returnOnEquity: float
+    liquidationPx: Optional[float]
+    marginUsed: float
+    maxLeverage: int
     cumFunding: CumFunding
 
-@dataclass
+@dataclass(slots=True)
 class AssetPosition:
     type: str
     position: Position
 
-@dataclass
+@dataclass(slots=True)
 class MarginSummary:
     accountValue: float
     totalNtlPos: float
     totalRawUsd: float
     totalMarginUsed: float
 
-@dataclass
+@dataclass(slots=True)
 class Info:
     marginSummary: MarginSummary
     crossMarginSummary: MarginSummary
-    crossMaintenanceMarginUsed: str
-    withdrawable: str
+    crossMaintenanceMarginUsed: float
+    withdrawable: float
     assetPositions: List[AssetPosition]
-    time: str
+    time: int
 
-@dataclass
+@dataclass(slots=True)
 class BalanceDetails:
     total: float
     used: float
     free: float
 
-@dataclass
+@dataclass(slots=True)
 class AccountData:
     info: Info
     USDC: BalanceDetails
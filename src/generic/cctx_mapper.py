@@ -1,4 +1,6 @@
 import logging
+import threading
+from collections import Counter
 import dacite
 from dacite import Config
 from dacite.data import Data
@@ -16,17 +18,23 @@ logger = logging.getLogger(__name__)
 def parse_order(api_data) -> Order:
     # Définir les valeurs par défaut pour les champs obligatoires
     defaults = {"info.coin": ""}
+    # parsing complet : un ordre est gardé longtemps (carnet de l'algo, suivi du websocket), une vue
+    # garderait la réponse brute de ccxt et un __dict__ en plus de ses slots
     return safe_parse(Order, api_data, defaults)
 
 def parse_balance(api_data) -> AccountData:
-    return safe_parse(AccountData, api_data)
+    # vue paresseuse : l'algo ne lit que USDC et crossMarginSummary, pas les positions
+    return lazy_parse(AccountData, api_data)
 
 
 T = TypeVar('T')
 
 import dacite
 from dacite import Config, from_dict
+from dacite.generics import get_concrete_type_hints, orig
+from dacite.types import is_optional
 from typing import TypeVar, Type, Dict, Any, Optional, cast, get_origin, get_args
+from collections.abc import Mapping
 from dataclasses import fields, is_dataclass, MISSING
 import inspect
 
@@ -37,47 +45,52 @@ def safe_parse(data_class: Type[T], data: Dict[str, Any], default_values: Option
     """
     Fonction générique pour parser de façon sécurisée les données API vers des classes dataclass.
     Gère automatiquement les structures imbriquées et champs manquants.
+
+    En une seule passe : un champ absent (ou None pour un champ non Optional) prend la valeur de
+    `default_values` pour son chemin ("info.coin"), sinon la valeur par défaut de son type
+    ("", 0, 0.0, False, [], {}, dataclass remplie par défaut ; None pour un champ Optional).
+    Chaque valeur par défaut appliquée est comptée par champ (defaulted_field_counts).
+    La donnée d'origine n'est pas modifiée.
     """
-    # Copie des données pour ne pas modifier l'original
-    processed_data = {} if data is None else data.copy()
+    if data is None:
+        data = {}
+    if logger.isEnabledFor(logging.DEBUG):
+        # formater la donnée coûte plus cher que le parsing lui-même
+        logger.debug(f"[MAPPER] Parsing {data_class.__name__} avec data={data}")
+    return _from_dict(data_class, data, default_values or {})
+
+
+# --- compteurs des champs remplis par défaut, par chemin complet ("Order.info.triggerCondition")
+
+_defaulted_fields: Counter = Counter()
+_defaulted_lock = threading.Lock()
 
-    try:
-        logger.debug(f"[MAPPER] Tentative de parsing {data_class.__name__} avec data={processed_data}")
-        return from_dict(
-            data_class=data_class,
-            data=processed_data,
-            config=_create_config()
-        )
-    except dacite.exceptions.MissingValueError as e:
-        logger.debug(f"[MAPPER] MissingValueError: {e}")
-        # Si erreur, récupérer le chemin du champ manquant
-        field_path = str(e).split("missing value for field ")[-1].strip('"')
-
-        # Compléter les structures imbriquées au besoin
-        _ensure_nested_path(processed_data, field_path)
-
-        # Appliquer les valeurs par défaut spécifiées
-        if default_values:
-            for key, value in default_values.items():
-                _set_nested_value(processed_data, key, value)
 
-        # Remplir automatiquement les champs manquants avec des valeurs vides
-        _fill_missing_fields(data_class, processed_data)
+def defaulted_field_counts() -> Dict[str, int]:
+    """Nombre de valeurs par défaut appliquées par champ : les champs que l'échange omet habituellement"""
+    with _defaulted_lock:
+        return dict(_defaulted_fields)
 
-        logger.debug(f"[MAPPER] Nouvelle tentative de parsing {data_class.__name__} avec data={processed_data}")
-        return from_dict(
-            data_class=data_class,
-            data=processed_data,
-            config=_create_config()
-        )
+
+def reset_defaulted_field_counts():
+    with _defaulted_lock:
+        _defaulted_fields.clear()
+
+
+def _count_defaulted(field_key: str):
+    with _defaulted_lock:
+        _defaulted_fields[field_key] += 1
 
 
 def _safe_float(x):
+    # prix et tailles : une valeur illisible n'a pas de repli, 0.0 ferait d'une taille restante
+    # inconnue un ordre entièrement exécuté
+    if x is None or x == "":
+        return 0.0
     try:
-        return 0.0 if x is None or x == "" else float(x)
+        return float(x)
     except (ValueError, TypeError):
-        logger.debug(f"[MAPPER] Fallback float pour valeur: {x!r}")
-        return 0.0
+        raise ValueError(f"[MAPPER] Valeur numérique illisible: {x!r}") from None
 
 def _safe_int(x):
     try:
@@ -93,131 +106,349 @@ def _safe_bool(x):
         logger.debug(f"[MAPPER] Fallback bool pour valeur: {x!r}")
         return False
 
+def _safe_str(x):
+    return "" if x is None else str(x)
+
+def _safe_list(x):
+    return x if isinstance(x, list) else [] if x is None else [x]
+
+_TYPE_HOOKS = {
+    str: _safe_str,
+    float: _safe_float,
+    int: _safe_int,
+    bool: _safe_bool,
+    List[Any]: _safe_list,
+}
+
 def _create_config():
     """Crée une configuration dacite avec des hooks de type sécurisés"""
     return Config(
-        type_hooks={
-            str: lambda x: "" if x is None else str(x),
-            float: _safe_float,
-            int: _safe_int,
-            bool: _safe_bool,
-            List[Any]: lambda x: x if isinstance(x, list) else [] if x is None else [x]
-        },
+        type_hooks=_TYPE_HOOKS,
         strict=False,
         cast=[tuple]  # Enlever list du cast pour éviter la conversion automatique
     )
 
 
-def _ensure_nested_path(data: Dict[str, Any], path: str):
-    """Crée les structures imbriquées nécessaires pour un chemin donné"""
-    parts = path.split('.')
-    current = data
-
-    for i, part in enumerate(parts):
-        if part not in current:
-            # Si c'est le dernier élément, mettre une valeur adaptée
-            if i == len(parts) - 1:
-                if part == "timestamp":
-                    current[part] = 0
-                else:
-                    current[part] = ""
+# --- plans de parsing compilés
+#
+# dacite ré-inspecte les types de la dataclass cible (type hints, champs, Optional, génériques)
+# à chaque appel. Un plan est une fonction de conversion générée une fois par dataclass cible
+# (et par chemin depuis la dataclass racine, pour nommer les compteurs), avec les hooks de type
+# de la configuration ci-dessus. Les champs absents reçoivent leur valeur par défaut pendant ce
+# même parcours. Dès que la donnée sort des formes prévues (type inattendu, union, tuple...),
+# le parsing est délégué à dacite, qui lève la même erreur qu'avant.
+
+class _PlanMismatch(Exception):
+    """Donnée hors des formes couvertes par le plan : le parsing est délégué à dacite"""
+
+
+class _NotCompilable(Exception):
+    """Type non couvert par le compilateur de plans"""
+
+
+_ABSENT = object()
+_plans: Dict[Any, Any] = {}
+# valeur par défaut d'un champ non Optional, par type
+_TYPE_DEFAULTS = {str: str, int: int, float: float, bool: bool, dict: dict}
+
+
+def _from_dict(data_class, data: Dict[str, Any], default_values: Dict[str, Any]):
+    """Parsing par le plan compilé de la dataclass, sinon par dacite"""
+    plan = _plan(data_class, orig(data_class).__name__, "")
+    if plan is not False:
+        try:
+            return plan(data, default_values)
+        except _PlanMismatch:
+            pass
+    return from_dict(data_class=data_class, data=data, config=_create_config())
+
+
+def _plan(data_class, root: str, path: str):
+    key = (data_class, root, path)
+    plan = _plans.get(key)
+    if plan is None:
+        try:
+            plan = _dataclass_plan(data_class, root, path)
+        except _NotCompilable as e:
+            logger.debug(f"[MAPPER] Pas de plan compilé pour {data_class}: {e}")
+            plan = False
+        _plans[key] = plan
+    return plan
+
+
+def _dataclass_plan(data_class, root: str, path: str):
+    """Fonction de parsing générée pour la dataclass : un bloc de code par champ, sans introspection"""
+    cls = orig(data_class)
+    hints = get_concrete_type_hints(data_class)
+    namespace = {'cls': cls, 'ABSENT': _ABSENT, 'DaciteFieldError': dacite.exceptions.DaciteFieldError}
+    lines = ["def parse(data, default_values):"]
+    arguments = []
+    for i, field in enumerate(fields(cls)):
+        if not field.init:
+            raise _NotCompilable(f"champ {field.name} hors __init__")
+        field_type = hints[field.name]
+        field_path = f"{path}.{field.name}" if path else field.name
+        convert = _converter(field_type, root, field_path)
+        optional = is_optional(field_type)
+        name, variable = repr(field.name), f"v{i}"
+        namespace[f"default{i}"] = _field_default(field, field_type, root, field_path, convert)
+        lines.append(f"    {variable} = data.get({name}, ABSENT)")
+        # None est une valeur d'un champ Optional ; pour les autres champs, elle vaut absence
+        lines.append(f"    if {variable} is ABSENT{'' if optional else f' or {variable} is None'}:")
+        lines.append(f"        {variable} = default{i}(default_values)")
+        if convert is not None:
+            namespace[f"convert{i}"] = convert
+            if optional:
+                lines.append(f"    elif {variable} is not None:")
             else:
-                current[part] = {}
-        elif i < len(parts) - 1 and not isinstance(current[part], dict):
-            # Remplacer une valeur non-dict par un dict si nécessaire
-            current[part] = {}
-
-        if i < len(parts) - 1:
-            current = current[part]
-
-
-def _set_nested_value(data: Dict[str, Any], path: str, value: Any):
-    parts = path.split('.')
-    current = data
-    for part in parts[:-1]:
-        if part not in current or not isinstance(current[part], dict):
-            current[part] = {}
-        current = current[part]
-    # N'écrase pas si déjà présent et non None
-    if parts[-1] not in current or current[parts[-1]] is None:
-        current[parts[-1]] = value
-
-
-def _is_list_type(field_type):
-    """Vérifie si un type est un type de liste (List[Any], List[str], etc.)"""
-    origin = typing.get_origin(field_type)
-    return origin is list or field_type is list
-
-
-def _is_type(field_type, target_type):
-    origin = typing.get_origin(field_type)
-    args = typing.get_args(field_type)
-    if origin is None:
-        return field_type == target_type
-    return target_type in args
-
-
-def _resolve_type(field_type):
-    """Retourne la liste plate de tous les types de base d'un type (gère Union, Optional, etc.)"""
-    origin = typing.get_origin(field_type)
-    args = typing.get_args(field_type)
-    if origin is None:
-        return [field_type]
-    types = []
-    for arg in args:
-        types.extend(_resolve_type(arg))
-    return types
-
-
-def _fill_missing_fields(data_class: Type, data: Dict[str, Any], prefix: str = ""):
-    """Remplit récursivement tous les champs manquants dans un dataclass"""
-    if not is_dataclass(data_class):
-        return
-
-    for field in fields(data_class):
-        field_path = f"{prefix}{field.name}" if prefix else field.name
-        parts = field_path.split('.')
-
-        # Vérifier si le champ existe déjà dans les données
-        target = data
-        exists = True
-        for i, part in enumerate(parts):
-            if part not in target:
-                exists = False
-                break
-            if i < len(parts) - 1:
-                if not isinstance(target[part], dict):
-                    target[part] = {}
-                target = target[part]
-
-        # Ne remplit que si la valeur n'existe pas ou est None
-        if not exists or (exists and target.get(parts[-1], None) is None):
-            # D'abord vérifier si c'est un type liste directement
-            if _is_list_type(field.type):
-                _set_nested_value(data, field_path, [])
-                continue
-                
-            base_types = _resolve_type(field.type)
-            
-            # Ensuite vérifier les autres types
-            if any(isinstance(t, type) and issubclass(t, numbers.Integral) and t is not bool for t in base_types):
-                _set_nested_value(data, field_path, 0)
-            elif any(isinstance(t, type) and issubclass(t, numbers.Real) and t is not bool for t in base_types):
-                _set_nested_value(data, field_path, 0.0)
-            elif any(t is bool for t in base_types):
-                _set_nested_value(data, field_path, False)
+                lines.append("    else:")
+            if field_type in _TYPE_DEFAULTS and field_type is not dict:
+                # les hooks de type ne lèvent pas d'erreur de champ
+                lines.append(f"        {variable} = convert{i}({variable})")
             else:
-                _set_nested_value(data, field_path, "")
-
-        # Traitement récursif pour les dataclasses imbriquées
-        if is_dataclass(field.type):
-            nested_target = data
-            for part in parts[:-1]:
-                if part not in nested_target:
-                    nested_target[part] = {}
-                nested_target = nested_target[part]
-
-            if parts[-1] not in nested_target:
-                nested_target[parts[-1]] = {}
-
-            _fill_missing_fields(field.type, nested_target[parts[-1]], "")
\ No newline at end of file
+                lines.append("        try:")
+                lines.append(f"            {variable} = convert{i}({variable}, default_values)")
+                lines.append("        except DaciteFieldError as e:")
+                lines.append(f"            e.update_path({name})")
+                lines.append("            raise")
+        arguments.append(f"{field.name}={variable}")
+    lines.append(f"    return cls({', '.join(arguments)})")
+    exec("\n".join(lines), namespace)
+    return namespace['parse']
+
+
+def _field_default(field, field_type, root: str, field_path: str, convert, type_default=None):
+    """Valeur d'un champ absent : default_values[chemin], sinon défaut du champ, sinon défaut du type"""
+    counter_key = f"{root}.{field_path}"
+    scalar = field_type in _TYPE_DEFAULTS and field_type is not dict
+    if field.default is not MISSING:
+        fallback = (lambda value: lambda default_values: value)(field.default)
+    elif field.default_factory is not MISSING:
+        fallback = lambda default_values: field.default_factory()
+    elif is_optional(field_type):
+        fallback = lambda default_values: None
+    else:
+        fallback = (type_default or _type_default)(field_type, root, field_path)
+
+    def default(default_values):
+        _count_defaulted(counter_key)
+        if default_values:
+            value = default_values.get(field_path)
+            if value is not None:
+                if convert is None:
+                    return value
+                return convert(value) if scalar else convert(value, default_values)
+        return fallback(default_values)
+    return default
+
+
+def _type_default(type_, root: str, field_path: str):
+    if type_ in _TYPE_DEFAULTS:
+        factory = _TYPE_DEFAULTS[type_]
+        return lambda default_values: factory()
+    if typing.get_origin(type_) is list:
+        return lambda default_values: []
+    if is_dataclass(orig(type_)):
+        # dataclass imbriquée absente : tous ses champs prennent leur valeur par défaut
+        def nested_default(default_values):
+            plan = _plan(type_, root, field_path)
+            if plan is False:
+                raise _PlanMismatch()
+            return plan({}, default_values)
+        return nested_default
+    return lambda default_values: None
+
+
+def _converter(type_, root: str, field_path: str):
+    """
+    Fonction de conversion d'une valeur vers `type_` (None : valeur gardée telle quelle).
+    Les types scalaires sont convertis par leur hook (valeur seule) ; les autres reçoivent aussi default_values.
+    """
+    hook = _TYPE_HOOKS.get(type_)
+    if type_ in (str, float, int, bool):
+        # les hooks renvoient toujours une valeur du bon type
+        return hook
+    if type_ is Any:
+        return None
+    if type_ is dict:
+        def convert_dict(value, default_values):
+            if not isinstance(value, dict):
+                raise _PlanMismatch()
+            return value
+        return convert_dict
+    if is_optional(type_):
+        inner_types = [t for t in typing.get_args(type_) if t is not type(None)]
+        if len(inner_types) != 1:
+            raise _NotCompilable(f"union {type_}")
+        inner_type = inner_types[0]
+        convert_inner = _converter(inner_type, root, field_path)
+        if convert_inner is None:
+            return None
+        if inner_type in (str, float, int, bool):
+            return lambda value, default_values=None: convert_inner(value)
+        return convert_inner
+    if typing.get_origin(type_) is list:
+        args = typing.get_args(type_)
+        convert_item = _converter(args[0], root, field_path) if args else None
+        scalar_items = bool(args) and args[0] in (str, float, int, bool)
+
+        def convert_list(value, default_values):
+            if hook is not None:
+                value = hook(value)
+            if type(value) is not list:
+                raise _PlanMismatch()
+            if convert_item is None:
+                return list(value)
+            if scalar_items:
+                return [convert_item(item) for item in value]
+            return [convert_item(item, default_values) for item in value]
+        return convert_list
+    if is_dataclass(orig(type_)):
+        # plan compilé au premier appel : permet les types récursifs
+        def convert_dataclass(value, default_values):
+            if not isinstance(value, Mapping):
+                raise _PlanMismatch()
+            plan = _plan(type_, root, field_path)
+            if plan is False:
+                raise _PlanMismatch()
+            return plan(value, default_values)
+        return convert_dataclass
+    raise _NotCompilable(f"type {type_}")
+
+
+# --- vues paresseuses
+#
+# Une vue enveloppe la réponse brute de ccxt : chaque champ n'est converti (hook de type, valeur
+# par défaut) qu'à sa première lecture, puis gardé dans l'instance. La vue est une sous-classe de
+# sa dataclass (isinstance, fields, asdict, égalité avec une instance de la dataclass) ; une
+# dataclass imbriquée est elle-même une vue, une liste de dataclasses une liste de vues.
+# Un champ absent n'est compté (defaulted_field_counts) qu'à sa première lecture.
+
+_view_classes: Dict[Any, Any] = {}
+
+
+def lazy_parse(data_class: Type[T], data: Dict[str, Any], default_values: Optional[Dict] = None) -> T:
+    """Même résultat que safe_parse, mais chaque champ n'est converti qu'à sa première lecture"""
+    if data is None:
+        data = {}
+    view_class = _view_class(data_class, orig(data_class).__name__, "") if isinstance(data, Mapping) else False
+    if view_class is False:
+        return safe_parse(data_class, data, default_values)
+    return view_class(data, default_values or {})
+
+
+class _LazyField:
+    """Champ d'une vue : converti à la première lecture, puis gardé dans l'instance (qui masque le descripteur)"""
+    __slots__ = ('name', 'data_class', 'optional', 'scalar', 'convert', 'default')
+
+    def __init__(self, name: str, data_class, field_type, convert, default):
+        self.name = name
+        self.data_class = data_class
+        self.optional = is_optional(field_type)
+        self.scalar = field_type in _TYPE_DEFAULTS and field_type is not dict
+        self.convert = convert
+        self.default = default
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        data, default_values = instance._lazy_data, instance._lazy_defaults
+        value = data.get(self.name, _ABSENT)
+        try:
+            if value is _ABSENT or (value is None and not self.optional):
+                value = self.default(default_values)
+            elif value is not None and self.convert is not None:
+                value = self.convert(value) if self.scalar else self.convert(value, default_values)
+        except _PlanMismatch:
+            # donnée hors des formes prévues : parsing complet de la dataclass, même résultat ou erreur que safe_parse
+            value = getattr(_from_dict(self.data_class, data, default_values), self.name)
+        instance.__dict__[self.name] = value
+        return value
+
+
+def _view_class(data_class, root: str, path: str):
+    key = (data_class, root, path)
+    view_class = _view_classes.get(key)
+    if view_class is None:
+        try:
+            view_class = _make_view_class(data_class, root, path)
+        except _NotCompilable as e:
+            logger.debug(f"[MAPPER] Pas de vue paresseuse pour {data_class}: {e}")
+            view_class = False
+        _view_classes[key] = view_class
+    return view_class
+
+
+def _make_view_class(data_class, root: str, path: str):
+    cls = orig(data_class)
+    hints = get_concrete_type_hints(data_class)
+    namespace = {}
+    names = []
+    for field in fields(cls):
+        if not field.init:
+            raise _NotCompilable(f"champ {field.name} hors __init__")
+        field_type = hints[field.name]
+        field_path = f"{path}.{field.name}" if path else field.name
+        convert = _lazy_converter(field_type, root, field_path)
+        default = _field_default(field, field_type, root, field_path, convert, _lazy_type_default)
+        namespace[field.name] = _LazyField(field.name, data_class, field_type, convert, default)
+        names.append(field.name)
+
+    def __init__(self, data, default_values):
+        self._lazy_data = data
+        self._lazy_defaults = default_values
+
+    def __eq__(self, other):
+        if not isinstance(other, cls):
+            return NotImplemented
+        return tuple(getattr(self, name) for name in names) == tuple(getattr(other, name) for name in names)
+
+    def __reduce__(self):
+        # copie ou pickle : instance de la dataclass, sans la réponse brute
+        return cls, tuple(getattr(self, name) for name in names)
+
+    namespace.update(__init__=__init__, __eq__=__eq__, __hash__=None, __reduce__=__reduce__,
+                     __module__=__name__)
+    return type(f"Lazy{cls.__name__}", (cls,), namespace)
+
+
+def _lazy_converter(type_, root: str, field_path: str):
+    """Comme _converter, mais une dataclass imbriquée devient une vue"""
+    if is_optional(type_):
+        inner_types = [t for t in typing.get_args(type_) if t is not type(None)]
+        if len(inner_types) == 1 and inner_types[0] not in _TYPE_DEFAULTS:
+            return _lazy_converter(inner_types[0], root, field_path)
+    if typing.get_origin(type_) is list:
+        args = typing.get_args(type_)
+        if args and is_dataclass(orig(args[0])):
+            convert_item = _lazy_converter(args[0], root, field_path)
+
+            def convert_list(value, default_values):
+                if type(value) is not list:
+                    raise _PlanMismatch()
+                return [convert_item(item, default_values) for item in value]
+            return convert_list
+    if is_dataclass(orig(type_)):
+        def convert_view(value, default_values):
+            if not isinstance(value, Mapping):
+                raise _PlanMismatch()
+            return _nested_view(type_, root, field_path, value, default_values)
+        return convert_view
+    return _converter(type_, root, field_path)
+
+
+def _lazy_type_default(type_, root: str, field_path: str):
+    if is_dataclass(orig(type_)):
+        # dataclass imbriquée absente : vue sur une donnée vide
+        return lambda default_values: _nested_view(type_, root, field_path, {}, default_values)
+    return _type_default(type_, root, field_path)
+
+
+def _nested_view(data_class, root: str, path: str, data, default_values):
+    view_class = _view_class(data_class, root, path)
+    if view_class is not False:
+        return view_class(data, default_values)
+    plan = _plan(data_class, root, path)
+    if plan is False:
+        raise _PlanMismatch()
+    return plan(data, default_values)
@@ -1,26 +1,26 @@
 from dataclasses import dataclass
 from typing import Optional, List, Any
 
-@dataclass
+@dataclass(slots=True)
 class Info:
     coin: str
     side: str
-    limitPx: str
-    sz: str
+    limitPx: float
+    sz: float
     oid: str
-    timestamp: str
+    timestamp: int
     triggerCondition: str
     isTrigger: bool
-    triggerPx: str
+    triggerPx: float
     children: List[Any]
     isPositionTpsl: bool
     reduceOnly: bool
     orderType: str
-    origSz: str
+    origSz: float
     tif: str
     cloid: Optional[str]
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     info: Info
     id: str
@@ -51,7 +51,7 @@ class Order:
     stopLossPrice: Optional[float]
 
 
-    @dataclass
+    @dataclass(slots=True)
     class Balance:
         total: float
         used: float
@@ -0,0 +1,143 @@
+"""
+Pool des clients d'échange, par (réseau, wallet, clé, symbole).
+
+Chaque wallet garde son propre client ccxt (clé privée, nonce, options de signature), mais
+tous les clients d'un même réseau partagent :
+- la session HTTP (un seul pool de connexions keep-alive) ;
+- les marchés : mêmes dictionnaires que le premier client chargé au lieu d'une copie par client ;
+- les données publiques : un client sans clé par (réseau, symbole) lit le prix, derrière un
+  cache court, pour tous les observers ; avec un scheduler de débit, seuls ses appels réseau
+  (défauts de cache) sont comptés.
+"""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.generic.cached_dex import PRICE, CachedDex
+from src.generic.cctx_api import Dex, DexConfig
+from src.generic.market_metadata import MarketMetadata, MarketMetadataCache, network_name
+from src.generic.rate_limiter import RateLimitedDex, RateLimitScheduler
+
+# attributs ccxt construits par set_markets, partagés tels quels entre les clients d'un réseau
+MARKET_ATTRIBUTES = ('markets', 'markets_by_id', 'symbols', 'ids', 'currencies', 'currencies_by_id',
+                     'baseCurrencies', 'quoteCurrencies', 'codes')
+
+PoolKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class ClientPoolStats:
+    networks: int
+    clients: int
+    references: int
+    public_clients: int
+
+
+class _Network:
+    """Ressources partagées par les clients d'un réseau"""
+
+    def __init__(self, connection_limit: int):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=connection_limit, pool_maxsize=connection_limit)
+        self.session.mount('https://', adapter)
+        # marchés du premier client chargé du réseau : les suivants partagent ses dictionnaires
+        self.markets: Optional[MarketMetadata] = None
+        self.markets_source: Optional[Dex] = None
+        self.public: Dict[str, CachedDex] = {}  # symbole -> client public en cache
+
+
+class ExchangeClientPool:
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, market_metadata: Optional[MarketMetadataCache] = None, ticker_ttl: float = 1.0,
+                 trust_creation_response: bool = False, connection_limit: int = 50,
+                 rate_limit_scheduler: Optional[RateLimitScheduler] = None):
+        self.market_metadata = market_metadata
+        self.ticker_ttl = ticker_ttl
+        self.trust_creation_response = trust_creation_response
+        self.connection_limit = connection_limit
+        self.rate_limit_scheduler = rate_limit_scheduler
+        self._lock = threading.Lock()
+        self._networks: Dict[str, _Network] = {}
+        self._clients: Dict[PoolKey, Dex] = {}
+        self._references: Dict[PoolKey, int] = {}
+
+    @staticmethod
+    def key(dex_config: DexConfig) -> PoolKey:
+        # un Dex porte le symbole de ses ordres : un client par symbole d'un même wallet ;
+        # un client signe avec sa clé : deux clés d'un même wallet (agents) ne partagent pas de client
+        api_key = hashlib.sha256((dex_config.apiKey or '').encode()).hexdigest()
+        return network_name(dex_config.isTest), dex_config.walletAddress.lower(), api_key, dex_config.symbol
+
+    def acquire(self, dex_config: DexConfig) -> Dex:
+        """Client du wallet, créé au premier appel puis partagé ; à rendre avec `release`"""
+        key = self.key(dex_config)
+        with self._lock:
+            dex = self._clients.get(key)
+            if dex is None:
+                dex = self._clients[key] = self._create(dex_config)
+            self._references[key] = self._references.get(key, 0) + 1
+            return dex
+
+    def release(self, dex_config: DexConfig):
+        key = self.key(dex_config)
+        with self._lock:
+            references = self._references.get(key, 0) - 1
+            if references > 0:
+                self._references[key] = references
+                return
+            self._references.pop(key, None)
+            self._clients.pop(key, None)
+
+    def stats(self) -> ClientPoolStats:
+        with self._lock:
+            return ClientPoolStats(networks=len(self._networks), clients=len(self._clients),
+                                   references=sum(self._references.values()),
+                                   public_clients=sum(len(network.public) for network in self._networks.values()))
+
+    def _create(self, dex_config: DexConfig) -> Dex:
+        network = self._network(network_name(dex_config.isTest))
+        public = self._public(network, dex_config)
+        dex = Dex(dex_config, trust_creation_response=self.trust_creation_response, session=network.session,
+                  public_data=public)
+        self._share_markets(network, dex, dex_config)
+        return dex
+
+    def _share_markets(self, network: _Network, dex: Dex, dex_config: DexConfig):
+        if network.markets_source is not None:
+            # le client source n'est que lu (set_markets_from_exchange exige toutes ses options dérivées)
+            source = network.markets_source.dex
+            for attribute in MARKET_ATTRIBUTES:
+                setattr(dex.dex, attribute, getattr(source, attribute))
+            dex.dex.options.update(network.markets.helpers)
+            return
+        dex._load_market_metadata(dex.dex, dex_config, self.market_metadata)
+        if dex.dex.markets:
+            network.markets = MarketMetadata.from_exchange(dex.dex, network_name(dex_config.isTest))
+            network.markets_source = dex
+
+    def _network(self, name: str) -> _Network:
+        network = self._networks.get(name)
+        if network is None:
+            network = self._networks[name] = _Network(self.connection_limit)
+        return network
+
+    def _public(self, network: _Network, dex_config: DexConfig) -> CachedDex:
+        public = network.public.get(dex_config.symbol)
+        if public is None:
+            # lectures publiques uniquement : pas de clé
+            public_config = DexConfig(symbol=dex_config.symbol, marginCoin=dex_config.marginCoin,
+                                      isTest=dex_config.isTest, walletAddress='', apiKey='')
+            public_dex = Dex(public_config, session=network.session)
+            self._share_markets(network, public_dex, public_config)
+            # limiteur sous le cache : une lecture servie par le cache ne consomme pas de poids
+            source = public_dex if self.rate_limit_scheduler is None else RateLimitedDex(public_dex,
+                                                                                         self.rate_limit_scheduler)
+            public = network.public[dex_config.symbol] = CachedDex(source, ttls={PRICE: self.ticker_ttl})
+        return public
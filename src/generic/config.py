@@ -14,6 +14,40 @@ class Config:
         
         # Observer settings
         self.max_observers: int = int(os.getenv("MAX_OBSERVERS", "10"))
+        # Seconds between two exchange reconciliations of the local account model
+        self.account_reconcile_interval: float = float(os.getenv("ACCOUNT_RECONCILE_INTERVAL", "60"))
+
+        # Per-observer order update queue: capacity and overflow policy (block, drop_oldest, drop_newest)
+        self.observer_queue_size: int = int(os.getenv("OBSERVER_QUEUE_SIZE", "1000"))
+        self.observer_queue_overflow: str = os.getenv("OBSERVER_QUEUE_OVERFLOW", "block")
+        # Number of executed orders kept per algo for the rolling execution stats
+        self.executed_orders_capacity: int = int(os.getenv("EXECUTED_ORDERS_CAPACITY", "1024"))
+        # Volatility-driven gap selection: candle interval of the websocket feed and percentile window (in candles)
+        self.adaptive_gap: bool = os.getenv("ADAPTIVE_GAP", "false").lower() == "true"
+        self.volatility_candle_interval: str = os.getenv("VOLATILITY_CANDLE_INTERVAL", "1m")
+        self.volatility_percentile_window: int = int(os.getenv("VOLATILITY_PERCENTILE_WINDOW", "1440"))
+        # Default exchange client backend: "sync" (ccxt, one blocking client per observer), "async" (ccxt.async_support
+        # on a shared event loop and aiohttp session) or "native" (Hyperliquid SDK actions); selectable per observer
+        self.dex_backend: str = os.getenv("DEX_BACKEND", "sync")
+        # Build created orders from the creation response (no fetch_order), completed later by orderUpdates
+        self.trust_creation_response: bool = os.getenv("TRUST_CREATION_RESPONSE", "false").lower() == "true"
+        # Read-through cache in front of the exchange client, TTLs in seconds (invalidated by order updates)
+        self.dex_cache: bool = os.getenv("DEX_CACHE", "false").lower() == "true"
+        self.dex_cache_price_ttl: float = float(os.getenv("DEX_CACHE_PRICE_TTL", "1"))
+        self.dex_cache_account_ttl: float = float(os.getenv("DEX_CACHE_ACCOUNT_TTL", "5"))
+        self.dex_cache_open_orders_ttl: float = float(os.getenv("DEX_CACHE_OPEN_ORDERS_TTL", "5"))
+        # On-disk market metadata shared by every exchange client, refreshed after the TTL (seconds)
+        self.market_metadata_dir: str = os.getenv("MARKET_METADATA_DIR", "data/markets")
+        self.market_metadata_ttl: float = float(os.getenv("MARKET_METADATA_TTL", "86400"))
+        # Share HTTP session, markets and ticker reads between the ccxt clients of all observers ("sync" backend)
+        self.client_pool: bool = os.getenv("CLIENT_POOL", "true").lower() == "true"
+        self.client_pool_ticker_ttl: float = float(os.getenv("CLIENT_POOL_TICKER_TTL", "1"))
+        # Record every exchange client call to a gzip cassette in this directory, for offline replay (empty: off)
+        self.dex_record_dir: str = os.getenv("DEX_RECORD_DIR", "")
+        # Process-wide token bucket for all exchange calls (Hyperliquid limits REST weight per IP)
+        self.rate_limit: bool = os.getenv("RATE_LIMIT", "true").lower() == "true"
+        self.rate_limit_weight_per_minute: float = float(os.getenv("RATE_LIMIT_WEIGHT_PER_MINUTE", "1200"))
+        self.rate_limit_burst: float = float(os.getenv("RATE_LIMIT_BURST", "100"))
         
         # API settings
         self.testnet_url: str = os.getenv("TESTNET_URL")
@@ -0,0 +1,208 @@
+"""
+Enregistrement et rejeu des appels au client ccxt d'un Dex (cassette).
+
+L'enregistreur enveloppe les méthodes d'échange du client ccxt (comme ExchangeMetrics) et
+écrit chaque appel dans un journal gzip en ajout seul, une ligne JSON par appel : méthode,
+arguments, réponse brute de ccxt (ou erreur) et latence. Le Dex de rejeu sert ces réponses
+dans l'ordre d'enregistrement, sans réseau, avec les latences d'origine, accélérées ou nulles :
+Algo et le parsing des réponses (safe_parse) tournent alors sur du trafic réel, hors ligne.
+"""
+
+import contextvars
+import functools
+import gzip
+import inspect
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+import ccxt
+
+from src.generic.cctx_api import Dex, DexConfig
+from src.generic.exchange_metrics import INSTRUMENTED_ENDPOINTS
+
+CASSETTE_FORMAT_VERSION = 1
+
+# appel enregistré en cours : les appels imbriqués (create_order -> create_orders) n'en font pas partie
+_recording = contextvars.ContextVar('dex_cassette_recording', default=False)
+
+# valeur des client order ids comparés en rejeu strict
+CLIENT_ORDER_ID = '<clientOrderId>'
+
+
+class CassetteError(Exception):
+    """Appel absent de la cassette (cassette épuisée ou appel différent de l'enregistrement)"""
+
+
+def read_cassette(path: str) -> Iterator[dict]:
+    """Appels enregistrés, dans l'ordre ; une ligne tronquée (process arrêté en cours d'écriture) termine la lecture"""
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        try:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+        except (EOFError, OSError, zlib.error):
+            return
+
+
+class DexRecorder:
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._lock = threading.Lock()
+        # chaque ouverture ajoute un membre gzip : le fichier reste lisible d'un seul tenant
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+
+    def record(self, method: str, args: tuple, kwargs: dict, started_at: float, latency: float,
+               response=None, error: Optional[BaseException] = None):
+        entry = {'v': CASSETTE_FORMAT_VERSION, 'method': method, 'args': list(args), 'kwargs': kwargs,
+                 'started_at': started_at, 'latency': latency}
+        if error is not None:
+            entry['error'] = {'type': type(error).__name__, 'message': str(error)}
+        else:
+            entry['response'] = response
+        line = json.dumps(entry, default=str, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            # flush de la compression : un appel enregistré reste lisible même si le process s'arrête
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def instrument(self, client, methods=INSTRUMENTED_ENDPOINTS):
+        """Remplace les méthodes `methods` du client ccxt (synchrone ou asynchrone) par des versions enregistrées"""
+        for method_name in methods:
+            method = getattr(client, method_name, None)
+            if method is not None:
+                setattr(client, method_name, self._recorded(method_name, method))
+
+    def _recorded(self, method_name: str, method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def recorded_async(*args, **kwargs):
+                if _recording.get():
+                    return await method(*args, **kwargs)
+                token = _recording.set(True)
+                started_at, start = self.clock(), time.perf_counter()
+                try:
+                    response = await method(*args, **kwargs)
+                except Exception as e:
+                    self.record(method_name, args, kwargs, started_at, time.perf_counter() - start, error=e)
+                    raise
+                finally:
+                    _recording.reset(token)
+                self.record(method_name, args, kwargs, started_at, time.perf_counter() - start, response)
+                return response
+            return recorded_async
+
+        @functools.wraps(method)
+        def recorded(*args, **kwargs):
+            if _recording.get():
+                return method(*args, **kwargs)
+            token = _recording.set(True)
+            started_at, start = self.clock(), time.perf_counter()
+            try:
+                response = method(*args, **kwargs)
+            except Exception as e:
+                self.record(method_name, args, kwargs, started_at, time.perf_counter() - start, error=e)
+                raise
+            finally:
+                _recording.reset(token)
+            self.record(method_name, args, kwargs, started_at, time.perf_counter() - start, response)
+            return response
+        return recorded
+
+
+def record_client(client, path: str) -> DexRecorder:
+    """Enregistre les appels du client ccxt dans `path` ; un client partagé (pool) n'est enregistré qu'une fois"""
+    recorder = getattr(client, '_dex_recorder', None)
+    if recorder is None:
+        recorder = DexRecorder(path)
+        recorder.instrument(client)
+        client._dex_recorder = recorder
+    return recorder
+
+
+class ReplayClient:
+    """
+    Client ccxt de rejeu : chaque méthode sert les réponses enregistrées pour elle, dans l'ordre.
+
+    Args:
+        entries: Appels enregistrés (read_cassette)
+        speed: None pour répondre sans attendre, 1 pour les latences d'origine, 10 pour dix fois plus vite
+        strict: Vérifie que les arguments de chaque appel sont ceux de l'enregistrement, aux client
+            order ids près (tirés au hasard à chaque création en mode confiance)
+    """
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, entries: List[dict], speed: Optional[float] = None, strict: bool = False,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.speed = speed
+        self.strict = strict
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[dict]] = defaultdict(deque)
+        for entry in entries:
+            self._queues[entry['method']].append(entry)
+
+    def remaining(self) -> Dict[str, int]:
+        with self._lock:
+            return {method: len(queue) for method, queue in self._queues.items() if queue}
+
+    def __getattr__(self, name: str):
+        # seules les méthodes enregistrées existent ; le reste du client ccxt est absent du rejeu
+        if name.startswith('_') or name not in self.__dict__.get('_queues', {}):
+            raise AttributeError(name)
+        return functools.partial(self._replay, name)
+
+    def _replay(self, method: str, *args, **kwargs):
+        with self._lock:
+            queue = self._queues[method]
+            if not queue:
+                raise CassetteError(f"No recorded response left for {method}")
+            entry = queue.popleft()
+        if self.strict:
+            recorded = _without_client_order_ids([entry['args'], entry['kwargs']])
+            called = _without_client_order_ids(json.loads(json.dumps((list(args), kwargs), default=str)))
+            if recorded != called:
+                raise CassetteError(f"{method} called with {called}, recorded with {recorded}")
+        if self.speed:
+            self.sleep(entry['latency'] / self.speed)
+        if 'error' in entry:
+            error = entry['error']
+            error_type = getattr(ccxt, error['type'], None)
+            if not (isinstance(error_type, type) and issubclass(error_type, Exception)):
+                error_type = Exception
+            raise error_type(error['message'])
+        return entry['response']
+
+
+def _without_client_order_ids(value):
+    """Arguments d'appel dont chaque clientOrderId présent est remplacé par une valeur fixe"""
+    if isinstance(value, dict):
+        return {key: CLIENT_ORDER_ID if key == 'clientOrderId' and item is not None
+                else _without_client_order_ids(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_without_client_order_ids(item) for item in value]
+    return value
+
+
+class ReplayDex(Dex):
+    """Dex servi par une cassette : même code de création et de parsing des ordres que Dex, sans réseau"""
+
+    def __init__(self, dex_config: DexConfig, path: str, speed: Optional[float] = None, strict: bool = False,
+                 trust_creation_response: bool = False):
+        super().__init__(dex_config, trust_creation_response)
+        self.dex = ReplayClient(list(read_cassette(path)), speed=speed, strict=strict)
+        self.exchange_metrics.instrument(self.dex, [method for method in INSTRUMENTED_ENDPOINTS
+                                                    if method in self.dex.remaining()])
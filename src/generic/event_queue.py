@@ -0,0 +1,169 @@
+"""File d'événements bornée, vidée par un worker dédié."""
+
+import dataclasses
+import logging
+import queue
+import threading
+import time
+import traceback
+from enum import Enum
+from typing import Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class OverflowPolicy(Enum):
+    BLOCK = 'block'              # le producteur attend qu'une place se libère
+    DROP_OLDEST = 'drop_oldest'  # l'événement le plus ancien est abandonné
+    DROP_NEWEST = 'drop_newest'  # le nouvel événement est abandonné
+
+
+@dataclasses.dataclass
+class EventQueueMetrics:
+    depth: int
+    max_depth: int
+    capacity: int
+    processed: int
+    dropped: int
+    avg_wait_time: float  # secondes entre la mise en file et le début du traitement
+    max_wait_time: float
+    last_wait_time: float
+
+
+_STOP = object()
+
+
+class EventQueue(Generic[T]):
+    """
+    File bornée entre un producteur (thread websocket) et un worker qui appelle `handler`.
+
+    Le producteur ne fait que déposer l'événement : le traitement (et ses appels REST
+    bloquants) se fait sur le thread du worker.
+
+    Les événements dont seul le dernier compte (bougie en cours) passent par `put_latest` :
+    ils sont gardés hors de la file, un par clé, et traités par le même worker quand la file
+    est vide. Ils ne prennent jamais la place d'un événement de la file ni ne le retardent.
+    """
+    logger = logging.getLogger(__name__)
+    # attente maximale du worker inactif avant de traiter les derniers événements par clé
+    latest_poll_interval = 0.5
+
+    def __init__(self, handler: Callable[[T], None], maxsize: int = 1000,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK, name: str = "EventQueue"):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._put_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._worker: threading.Thread = None
+        self._latest: Dict[Hashable, T] = {}
+        self._latest_lock = threading.Lock()
+
+        self._max_depth = 0
+        self._processed = 0
+        self._dropped = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._last_wait_time = 0.0
+
+    def start(self):
+        if self._worker and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, daemon=True, name=f"{self.name}-worker")
+        self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Arrête le worker après traitement des événements déjà en file."""
+        if not self._worker:
+            return
+        try:
+            self._queue.put((_STOP, 0.0), timeout=timeout)
+        except queue.Full:
+            self.logger.warning(f"{self.name} - queue still full on stop, worker not joined")
+            return
+        self._worker.join(timeout)
+        self._worker = None
+
+    def put(self, event: T) -> bool:
+        """Dépose un événement, retourne False s'il a été abandonné."""
+        item = (event, time.monotonic())
+        if self.overflow_policy == OverflowPolicy.BLOCK:
+            self._queue.put(item)
+        else:
+            with self._put_lock:
+                try:
+                    self._queue.put_nowait(item)
+                except queue.Full:
+                    if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                        self._on_dropped(event)
+                        return False
+                    try:
+                        dropped_event, _ = self._queue.get_nowait()
+                        self._on_dropped(dropped_event)
+                    except queue.Empty:
+                        pass
+                    self._queue.put_nowait(item)
+
+        with self._metrics_lock:
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+        return True
+
+    def put_latest(self, key: Hashable, event: T):
+        """Dépose un événement coalescé : remplace le précédent de même clé encore non traité."""
+        with self._latest_lock:
+            self._latest[key] = event
+
+    def metrics(self) -> EventQueueMetrics:
+        with self._metrics_lock:
+            return EventQueueMetrics(
+                depth=self._queue.qsize(),
+                max_depth=self._max_depth,
+                capacity=self.maxsize,
+                processed=self._processed,
+                dropped=self._dropped,
+                avg_wait_time=self._total_wait_time / self._processed if self._processed else 0.0,
+                max_wait_time=self._max_wait_time,
+                last_wait_time=self._last_wait_time,
+            )
+
+    def _on_dropped(self, event: T):
+        with self._metrics_lock:
+            self._dropped += 1
+        self.logger.error(f"{self.name} - queue full ({self.maxsize}), event dropped: {event}")
+
+    def _run(self):
+        while True:
+            try:
+                event, enqueued_at = self._queue.get(timeout=self.latest_poll_interval)
+            except queue.Empty:
+                self._process_latest()
+                continue
+            if event is _STOP:
+                self._process_latest()
+                break
+            wait_time = time.monotonic() - enqueued_at
+            self._handle(event)
+            with self._metrics_lock:
+                self._processed += 1
+                self._total_wait_time += wait_time
+                self._max_wait_time = max(self._max_wait_time, wait_time)
+                self._last_wait_time = wait_time
+            if self._queue.empty():
+                self._process_latest()
+
+    def _process_latest(self):
+        with self._latest_lock:
+            if not self._latest:
+                return
+            events, self._latest = list(self._latest.values()), {}
+        for event in events:
+            self._handle(event)
+
+    def _handle(self, event: T):
+        try:
+            self.handler(event)
+        except Exception as e:
+            self.logger.error(f"{self.name} - error processing event: {e}")
+            self.logger.error(traceback.format_exc())
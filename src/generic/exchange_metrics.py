@@ -0,0 +1,227 @@
+"""
+Latences, erreurs et relances des appels au client ccxt, par endpoint.
+
+Chaque Dex instrumente son propre client ccxt : les méthodes d'échange (create_order,
+fetch_order, cancel_order, fetch_balance...) sont enveloppées par un chronomètre qui
+enregistre la durée dans un histogramme à classes log-linéaires (à la manière des
+histogrammes HDR : précision relative constante, enregistrement en O(1), mémoire fixe).
+Les relances faites par ccxt (option maxRetriesOnFailure) sont comptées en interceptant
+les requêtes (fetch2) et les envois HTTP (fetch) de l'appel en cours.
+"""
+
+import contextvars
+import functools
+import inspect
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+INSTRUMENTED_ENDPOINTS = (
+    'create_order', 'create_orders', 'edit_order', 'edit_orders', 'fetch_order', 'cancel_order', 'cancel_orders',
+    'fetch_balance', 'fetch_ticker', 'fetch_open_orders', 'set_margin_mode', 'set_leverage',
+)
+
+
+class LatencyHistogram:
+    """
+    Histogramme de durées en microsecondes, de 1 µs à ~2^31 µs (≈ 36 min).
+
+    Les classes sont des puissances de 2 découpées en `sub_buckets` classes linéaires :
+    l'erreur relative d'un percentile est au plus 1 / sub_buckets.
+    """
+
+    max_exponent = 31
+
+    def __init__(self, sub_buckets: int = 32):
+        self.sub_buckets = sub_buckets
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self._counts = array('q', bytes(8 * (self.max_exponent + 1) * sub_buckets))
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float):
+        micros = max(1, int(seconds * 1e6))
+        self._counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Borne haute de la classe contenant le percentile `q` (entre 0 et 1), en secondes"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._upper_bound(index) / 1e6, self.max)
+        return self.max
+
+    def _index(self, micros: int) -> int:
+        exponent = micros.bit_length() - 1
+        if exponent < self._sub_bits:
+            # petites valeurs : une classe par microseconde
+            return micros
+        exponent = min(exponent, self.max_exponent)
+        sub = (micros >> (exponent - self._sub_bits)) - self.sub_buckets
+        return (exponent - self._sub_bits + 1) * self.sub_buckets + min(sub, self.sub_buckets - 1)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self.sub_buckets:
+            return index + 1
+        exponent = index // self.sub_buckets + self._sub_bits - 1
+        sub = index % self.sub_buckets
+        return (self.sub_buckets + sub + 1) << (exponent - self._sub_bits)
+
+
+@dataclass
+class EndpointStats:
+    calls: int
+    errors: int
+    retries: int
+    mean: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+    p999: Optional[float]
+    max: Optional[float]
+
+
+class _Endpoint:
+    __slots__ = ('histogram', 'errors', 'retries')
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.retries = 0
+
+
+class _Call:
+    """Appel d'endpoint en cours : requêtes ccxt (fetch2) et envois HTTP (fetch, relances comprises)"""
+    __slots__ = ('requests', 'attempts')
+
+    def __init__(self):
+        self.requests = 0
+        self.attempts = 0
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - self.requests)
+
+
+# contextvars plutôt que threading.local : suit aussi les tâches asyncio concurrentes d'un même thread
+_current_call: contextvars.ContextVar[Optional[_Call]] = contextvars.ContextVar('exchange_call', default=None)
+
+
+class ExchangeMetrics:
+    """Statistiques par endpoint d'un client ccxt (donc d'un observer)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+
+    def record(self, endpoint: str, seconds: float, error: bool = False, retries: int = 0):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = _Endpoint()
+            stats.histogram.record(seconds)
+            stats.errors += error
+            stats.retries += retries
+
+    def snapshot(self) -> Dict[str, EndpointStats]:
+        with self._lock:
+            return {endpoint: EndpointStats(
+                calls=stats.histogram.count,
+                errors=stats.errors,
+                retries=stats.retries,
+                mean=stats.histogram.mean,
+                p50=stats.histogram.percentile(0.5),
+                p90=stats.histogram.percentile(0.9),
+                p99=stats.histogram.percentile(0.99),
+                p999=stats.histogram.percentile(0.999),
+                max=stats.histogram.max,
+            ) for endpoint, stats in self._endpoints.items()}
+
+    def instrument(self, client, endpoints=INSTRUMENTED_ENDPOINTS):
+        """Remplace les méthodes `endpoints` du client ccxt (synchrone ou asynchrone) par des versions chronométrées"""
+        for endpoint in endpoints:
+            method = getattr(client, endpoint, None)
+            if method is not None:
+                setattr(client, endpoint, self._timed(endpoint, method))
+        for counter in ('fetch2', 'fetch'):
+            if getattr(client, counter, None) is not None:
+                setattr(client, counter, self._counted(counter, getattr(client, counter)))
+
+    def _timed(self, endpoint: str, method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def timed_async(*args, **kwargs):
+                if _current_call.get() is not None:
+                    # appel imbriqué (create_order -> create_orders...) : compté dans l'appel englobant
+                    return await method(*args, **kwargs)
+                token = _current_call.set(_Call())
+                start = time.perf_counter()
+                error = False
+                try:
+                    return await method(*args, **kwargs)
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    self._finish(endpoint, start, error, token)
+            return timed_async
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if _current_call.get() is not None:
+                return method(*args, **kwargs)
+            token = _current_call.set(_Call())
+            start = time.perf_counter()
+            error = False
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                error = True
+                raise
+            finally:
+                self._finish(endpoint, start, error, token)
+        return timed
+
+    def _finish(self, endpoint: str, start: float, error: bool, token):
+        call = _current_call.get()
+        _current_call.reset(token)
+        self.record(endpoint, time.perf_counter() - start, error, call.retries)
+
+    @staticmethod
+    def _counted(counter: str, fetch):
+        attribute = 'requests' if counter == 'fetch2' else 'attempts'
+
+        def count_attempt():
+            call = _current_call.get()
+            if call is not None:
+                setattr(call, attribute, getattr(call, attribute) + 1)
+
+        if inspect.iscoroutinefunction(fetch):
+            @functools.wraps(fetch)
+            async def counted_async(*args, **kwargs):
+                count_attempt()
+                return await fetch(*args, **kwargs)
+            return counted_async
+
+        @functools.wraps(fetch)
+        def counted(*args, **kwargs):
+            count_attempt()
+            return fetch(*args, **kwargs)
+        return counted
@@ -0,0 +1,147 @@
+"""Historique borné des ordres exécutés, avec statistiques glissantes en O(1)."""
+
+import dataclasses
+import math
+import time
+from array import array
+from collections import deque
+from typing import Callable, List, Literal, Optional
+
+from src.generic.hyperliquid_ws_model import WsOrder
+
+_BUY = 1
+_SELL = -1
+
+
+@dataclasses.dataclass
+class ExecutedOrder:
+    type: Literal['buy', 'sell']
+    price: float
+    timestamp: float
+
+
+@dataclasses.dataclass
+class ExecutionStats:
+    count: int                      # exécutions dans la fenêtre (au plus `capacity`)
+    total_count: int                # exécutions depuis le démarrage
+    buys: int
+    sells: int
+    buy_sell_imbalance: float       # (achats - ventes) / exécutions, entre -1 et 1
+    fills_per_minute: float
+    avg_time_between_fills: Optional[float]   # secondes
+    last_time_between_fills: Optional[float]
+    avg_grid_spread: Optional[float]          # prix de vente - prix de l'achat apparié
+
+
+class ExecutedOrdersTracker:
+    """
+    Les `capacity` dernières exécutions, dans des tableaux typés utilisés en buffer circulaire.
+
+    Les statistiques portent sur la fenêtre retenue et sont mises à jour à chaque ajout et à
+    chaque éviction : la mémoire reste constante quelle que soit la durée de vie de l'algo.
+    Le spread réalisé d'une vente est calculé contre l'achat le plus récent pas encore
+    apparié (une vente de la grille ferme le dernier open long exécuté).
+    """
+
+    def __init__(self, capacity: int = 1024, clock: Callable[[], float] = time.time):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.clock = clock
+        self._sides = array('b', bytes(capacity))
+        self._prices = array('d', bytes(8 * capacity))
+        self._timestamps = array('d', bytes(8 * capacity))
+        self._spreads = array('d', bytes(8 * capacity))  # nan quand la vente n'a pas d'achat apparié
+        self._start = 0
+        self._size = 0
+        self.total_count = 0
+
+        self._buys = 0
+        self._sells = 0
+        self._spread_sum = 0.0
+        self._spread_count = 0
+        self._evictions = 0
+        self._unmatched_buys: deque = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_order(self, wsOrder: WsOrder):
+        if not wsOrder or not wsOrder.order:
+            return
+        side = _BUY if wsOrder.order.side == 'B' else _SELL
+        self._push(side, float(wsOrder.order.limitPx), self.clock())
+
+    def add_buy(self, price: float):
+        self._push(_BUY, float(price), self.clock())
+
+    def add_sell(self, price: float):
+        self._push(_SELL, float(price), self.clock())
+
+    @property
+    def last_executed_orders(self) -> List[ExecutedOrder]:
+        """Copie des exécutions retenues, de la plus ancienne à la plus récente"""
+        return [ExecutedOrder(type='buy' if self._sides[i] == _BUY else 'sell', price=self._prices[i],
+                              timestamp=self._timestamps[i]) for i in self._indexes()]
+
+    def stats(self) -> ExecutionStats:
+        size = self._size
+        span = self._timestamps[self._index(size - 1)] - self._timestamps[self._start] if size > 1 else 0.0
+        return ExecutionStats(
+            count=size,
+            total_count=self.total_count,
+            buys=self._buys,
+            sells=self._sells,
+            buy_sell_imbalance=(self._buys - self._sells) / size if size else 0.0,
+            fills_per_minute=(size - 1) * 60 / span if span > 0 else 0.0,
+            avg_time_between_fills=span / (size - 1) if size > 1 else None,
+            last_time_between_fills=self._timestamps[self._index(size - 1)] - self._timestamps[self._index(size - 2)]
+            if size > 1 else None,
+            avg_grid_spread=self._spread_sum / self._spread_count if self._spread_count else None,
+        )
+
+    def _index(self, offset: int) -> int:
+        return (self._start + offset) % self.capacity
+
+    def _indexes(self):
+        return (self._index(offset) for offset in range(self._size))
+
+    def _push(self, side: int, price: float, timestamp: float):
+        if self._size == self.capacity:
+            self._evict()
+
+        spread = math.nan
+        if side == _BUY:
+            self._unmatched_buys.append(price)
+            self._buys += 1
+        else:
+            if self._unmatched_buys:
+                spread = price - self._unmatched_buys.pop()
+                self._spread_sum += spread
+                self._spread_count += 1
+            self._sells += 1
+
+        i = self._index(self._size)
+        self._sides[i] = side
+        self._prices[i] = price
+        self._timestamps[i] = timestamp
+        self._spreads[i] = spread
+        self._size += 1
+        self.total_count += 1
+
+    def _evict(self):
+        i = self._start
+        if self._sides[i] == _BUY:
+            self._buys -= 1
+        else:
+            self._sells -= 1
+        if not math.isnan(self._spreads[i]):
+            self._spread_sum -= self._spreads[i]
+            self._spread_count -= 1
+        self._start = self._index(1)
+        self._size -= 1
+
+        # la somme glissante accumule des erreurs d'arrondi : recalcul exact une fois par tour de buffer
+        self._evictions += 1
+        if self._evictions % self.capacity == 0:
+            self._spread_sum = math.fsum(s for s in (self._spreads[j] for j in self._indexes()) if not math.isnan(s))
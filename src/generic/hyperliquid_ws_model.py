@@ -1,27 +1,41 @@
 from dataclasses import dataclass
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, List, Optional
 
 T = TypeVar("T")
 
-@dataclass
+@dataclass(slots=True)
 class WsMessage(Generic[T]):
     channel: str
     data: List[T]
 
 
-@dataclass
+@dataclass(slots=True)
 class WsBasicOrder:
     coin: str
     side: str
     limitPx: float
-    sz: str
+    sz: float
     oid: int
     timestamp: int
-    origSz: str
+    origSz: float
+    cloid: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class WsOrder:
     order: WsBasicOrder
     status: str
     statusTimestamp: int
 
+
+@dataclass(slots=True)
+class WsCandle:
+    t: int   # ouverture de la bougie (ms)
+    T: int   # clôture de la bougie (ms)
+    s: str   # coin
+    i: str   # intervalle
+    o: float
+    c: float
+    h: float
+    l: float
+    v: float
+    n: int
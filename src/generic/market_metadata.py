@@ -0,0 +1,155 @@
+"""
+Cache disque des métadonnées de marchés ccxt (symboles, pas de prix, pas de quantité, levier max).
+
+Sans ce cache, chaque client ccxt télécharge la liste complète des marchés (load_markets)
+au premier appel, avant le premier ordre. Les métadonnées sont chargées une fois par réseau
+(testnet / mainnet) puis injectées dans tous les clients du process ; le fichier est réécrit
+quand il est expiré (TTL) ou produit par un autre format / une autre version de ccxt.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional
+
+import ccxt
+
+# à incrémenter quand le contenu du fichier change de forme
+METADATA_FORMAT_VERSION = 1
+
+
+def network_name(is_test: bool) -> str:
+    return 'testnet' if is_test else 'mainnet'
+
+
+@dataclass
+class MarketMetadata:
+    version: int
+    ccxt_version: str
+    network: str
+    fetched_at: float
+    markets: dict
+    currencies: dict
+    # options ccxt dérivées des marchés (exchange.options['marketHelperProps'])
+    helpers: dict
+
+    @classmethod
+    def from_exchange(cls, exchange, network: str) -> 'MarketMetadata':
+        helper_names = exchange.options.get('marketHelperProps', [])
+        return cls(version=METADATA_FORMAT_VERSION, ccxt_version=ccxt.__version__, network=network,
+                   fetched_at=time.time(), markets=exchange.markets, currencies=exchange.currencies or {},
+                   helpers={name: exchange.options[name] for name in helper_names
+                            if exchange.options.get(name) is not None})
+
+    def apply(self, exchange):
+        """Injecte les marchés dans un client ccxt : son load_markets ne fait plus d'appel réseau"""
+        exchange.set_markets(self.markets, self.currencies)
+        exchange.options.update(self.helpers)
+
+    def market_info(self, symbol: str) -> Optional['MarketInfo']:
+        market = self.markets.get(symbol)
+        if market is None:
+            return None
+        precision = market.get('precision') or {}
+        leverage = (market.get('limits') or {}).get('leverage') or {}
+        return MarketInfo(symbol=symbol, tick_size=precision.get('price'), lot_size=precision.get('amount'),
+                          max_leverage=leverage.get('max'))
+
+
+@dataclass
+class MarketInfo:
+    symbol: str
+    tick_size: Optional[float]
+    lot_size: Optional[float]
+    max_leverage: Optional[float]
+
+
+class MarketMetadataCache:
+    """Métadonnées par réseau, en mémoire et sur disque, partagées par tous les Dex du process"""
+    logger = logging.getLogger(__name__)
+
+    _shared: Optional['MarketMetadataCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory: str, ttl: float = 86400, clock: Callable[[], float] = time.time):
+        self.directory = directory
+        self.ttl = ttl
+        self.clock = clock
+        self._metadata: Dict[str, MarketMetadata] = {}
+        # un verrou par réseau : un seul téléchargement même si plusieurs Dex démarrent en même temps
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, directory: str, ttl: float = 86400) -> 'MarketMetadataCache':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(directory, ttl)
+            return cls._shared
+
+    def path(self, network: str) -> str:
+        return os.path.join(self.directory, f"markets_{network}.json")
+
+    def get(self, is_test: bool, fetch: Callable[[], MarketMetadata] = None) -> MarketMetadata:
+        """Métadonnées du réseau : mémoire, sinon disque, sinon `fetch` (téléchargement ccxt par défaut)"""
+        network = network_name(is_test)
+        with self._lock(network):
+            metadata = self._metadata.get(network)
+            if metadata is None or not self._is_fresh(metadata):
+                metadata = self._read(network)
+            if metadata is None:
+                metadata = (fetch or (lambda: self.fetch(is_test)))()
+                self._write(metadata)
+            self._metadata[network] = metadata
+            return metadata
+
+    def apply(self, exchange, is_test: bool):
+        self.get(is_test).apply(exchange)
+
+    def warm(self, is_test: bool):
+        """Chargement au démarrage, sans faire échouer le démarrage (le Dex retombe sur load_markets)"""
+        try:
+            self.get(is_test)
+        except Exception as e:
+            self.logger.warning(f"Could not load {network_name(is_test)} market metadata: {e}")
+
+    @staticmethod
+    def fetch(is_test: bool) -> MarketMetadata:
+        exchange = ccxt.hyperliquid()
+        exchange.set_sandbox_mode(is_test)
+        exchange.load_markets()
+        return MarketMetadata.from_exchange(exchange, network_name(is_test))
+
+    def _lock(self, network: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(network, threading.Lock())
+
+    def _is_fresh(self, metadata: MarketMetadata) -> bool:
+        return (metadata.version == METADATA_FORMAT_VERSION and metadata.ccxt_version == ccxt.__version__
+                and self.clock() - metadata.fetched_at < self.ttl)
+
+    def _read(self, network: str) -> Optional[MarketMetadata]:
+        try:
+            with open(self.path(network)) as f:
+                metadata = MarketMetadata(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable market metadata {self.path(network)}: {e}")
+            return None
+        if not self._is_fresh(metadata):
+            self.logger.info(f"Market metadata {self.path(network)} is stale, refreshing")
+            return None
+        return metadata
+
+    def _write(self, metadata: MarketMetadata):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(metadata.network)
+        # écriture atomique : un autre process ne lit jamais un fichier à moitié écrit
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(metadata), f)
+        os.replace(tmp_path, path)
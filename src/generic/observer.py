@@ -1,17 +1,32 @@
 import traceback
+from typing import Optional, Union
 
-from src.generic.cctx_mapper import safe_parse
-from src.generic.hyperliquid_ws_model import WsMessage, WsOrder
+from src.generic.event_queue import EventQueue, EventQueueMetrics, OverflowPolicy
+from src.generic.executed_orders import ExecutionStats
+from src.generic.hyperliquid_ws_model import WsCandle, WsOrder
 from src.generic.algo import Algo
 
 import logging
 class HyperliquidObserver:
     logger = logging.getLogger(__name__)
 
-    def __init__(self, address: str, observer_id: str, websocket_url: str, algo: Algo):
+    def __init__(self, address: str, observer_id: str, websocket_url: str, algo: Algo,
+                 queue_size: int = 1000, overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 process_inline: bool = False, candle_interval: Optional[str] = None):
         self.address = address
         self.observer_id = observer_id
         self.algo = algo
+        # intervalle du flux de bougies alimentant la volatilité de l'algo (None : pas d'abonnement)
+        self.candle_interval = candle_interval
+        # traitement synchrone des ordres, sans worker (simulation hors ligne, tests)
+        self.process_inline = process_inline
+        # les ordres sont traités par un worker dédié, jamais sur le thread websocket
+        self.event_queue: EventQueue[Union[WsOrder, WsCandle]] = EventQueue(
+            handler=self.process_event,
+            maxsize=queue_size,
+            overflow_policy=overflow_policy,
+            name=f"Observer-{observer_id}"
+        )
         self.hyperliquid_ws = HyperliquidWebSocket(
             url=websocket_url,
             address=address,
@@ -19,24 +34,56 @@ class HyperliquidObserver:
         )
 
     def handle_order_updates(self, ws_orders: [WsOrder]):
+        """Appelé par le thread websocket : met les ordres en file sans les traiter."""
         self.logger.debug(f"Observer {self.observer_id} received {len(ws_orders)} order updates")
         for ws_order in ws_orders:
-            self.logger.debug(f"Observer {self.observer_id} processing order: {ws_order}")
-            try:
-                #if order.status == 'deleted':
-                #    self.algo.on_deleted_order(order)
-                if ws_order.status == 'filled':
-                    self.algo.on_executed_order(ws_order)
-                else:
-                    pass
-            except Exception as e:
-                self.logger.error(f"Observer {self.observer_id} error processing order {ws_order.order.oid if hasattr(ws_order.order, 'oid') else 'unknown'}: {e}")
-                self.logger.error(traceback.format_exc())
+            if self.process_inline:
+                self.process_order_update(ws_order)
+            else:
+                self.event_queue.put(ws_order)
+
+    def handle_candle(self, candle: WsCandle):
+        """
+        Appelé par le thread websocket : seule la dernière mise à jour de chaque bougie est gardée,
+        hors de la file des ordres (une bougie ne bloque, ne retarde ni n'évince jamais un ordre).
+        """
+        if self.process_inline:
+            self.process_event(candle)
+        else:
+            self.event_queue.put_latest((candle.s, candle.i, candle.t), candle)
+
+    def process_event(self, event: Union[WsOrder, WsCandle]):
+        if isinstance(event, WsCandle):
+            self.algo.on_candle(event.t, float(event.h), float(event.l), float(event.c))
+        else:
+            self.process_order_update(event)
+
+    def process_order_update(self, ws_order: WsOrder):
+        """Appelé par le worker de la file."""
+        self.logger.debug(f"Observer {self.observer_id} processing order: {ws_order}")
+        try:
+            #if order.status == 'deleted':
+            #    self.algo.on_deleted_order(order)
+            self.algo.on_order_update(ws_order)
+            if ws_order.status == 'filled':
+                self.algo.on_executed_order(ws_order)
+            else:
+                pass
+        except Exception as e:
+            self.logger.error(f"Observer {self.observer_id} error processing order {ws_order.order.oid if hasattr(ws_order.order, 'oid') else 'unknown'}: {e}")
+            self.logger.error(traceback.format_exc())
+
+    def get_queue_metrics(self) -> EventQueueMetrics:
+        return self.event_queue.metrics()
+
+    def get_execution_stats(self) -> ExecutionStats:
+        return self.algo.get_execution_stats()
 
 
     def start(self):
         """Start the observer and keep it running."""
         self.logger.info(f"Starting HyperliquidObserver for {self.address}")
+        self.event_queue.start()
         self.hyperliquid_ws.start_watch()
         
         # Garder le thread principal vivant tant que le WebSocket tourne
@@ -49,6 +96,7 @@ class HyperliquidObserver:
     def stop(self):
         self.logger.info(f"Observer {self.observer_id} stopping HyperliquidObserver for address {self.address}")
         self.hyperliquid_ws.stop()
+        self.event_queue.stop()
         self.logger.info(f"Observer {self.observer_id} HyperliquidObserver stopped successfully for address {self.address}")
 
 
@@ -71,7 +119,8 @@ except ImportError:
         raise ImportError("Neither 'websocket' with WebSocketApp nor 'websocket-client' is available")
 from dacite import from_dict
 
-from src.generic.hyperliquid_ws_model import WsMessage, WsOrder
+from src.generic.hyperliquid_ws_model import WsCandle, WsOrder
+from src.generic.ws_decoder import CANDLE, ORDER_UPDATES, decode_message
 import logging
 
 class HyperliquidWebSocket:
@@ -163,12 +212,13 @@ class HyperliquidWebSocket:
             return
             
         try:
-            msg = json.loads(message)
-            channel = msg.get("channel")
-            self.logger.debug(f"Received message: {msg}")
-            if channel == "orderUpdates":
-                order_updates = safe_parse(WsMessage[WsOrder], msg)
-                self.observer.handle_order_updates(order_updates.data)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Received message: {message}")
+            channel, payload = decode_message(message)
+            if channel == ORDER_UPDATES:
+                self.observer.handle_order_updates(payload)
+            elif channel == CANDLE:
+                self.observer.handle_candle(payload)
             #else:
             #    ("Autre message :", msg)
         except Exception as e:
@@ -218,6 +268,16 @@ class HyperliquidWebSocket:
         }
         ws.send(json.dumps(subscription_message))
 
+        if self.observer.candle_interval:
+            ws.send(json.dumps({
+                "method": "subscribe",
+                "subscription": {
+                    "type": "candle",
+                    "coin": self.observer.algo.dex.symbol,
+                    "interval": self.observer.candle_interval
+                }
+            }))
+
         # keep connection alive with ping
         threading.Thread(target=self.run_ping, daemon=True).start()
 
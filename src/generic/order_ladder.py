@@ -0,0 +1,147 @@
+"""Carnet local des ordres ouverts de l'algo, indexé par oid et par prix."""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Literal, Optional
+
+from src.generic.cctx_model import Order
+
+LadderSide = Literal['buy', 'sell']
+
+# tolérance utilisée pour comparer deux prix (float) d'un même niveau
+PRICE_TOLERANCE = 1e-6
+
+
+def is_same_price(price_a: float, price_b: float) -> bool:
+    """Compare deux prix avec la tolérance du carnet."""
+    return abs(float(price_a) - float(price_b)) <= PRICE_TOLERANCE
+
+
+def ladder_side(order) -> Optional[LadderSide]:
+    """Normalise le côté d'un ordre ('B'/'buy' -> 'buy', 'A'/'sell' -> 'sell')."""
+    if order.side in ('B', 'buy'):
+        return 'buy'
+    if order.side in ('A', 'sell'):
+        return 'sell'
+    return None
+
+
+class _SideLevels:
+    """Niveaux de prix triés d'un côté du carnet."""
+
+    def __init__(self) -> None:
+        self.prices: List[float] = []            # prix distincts, triés
+        self.levels: Dict[float, Dict[str, Order]] = {}  # prix -> {oid: ordre}
+        self.size = 0
+
+    def add(self, price: float, order: Order) -> None:
+        level = self.levels.get(price)
+        if level is None:
+            level = self.levels[price] = {}
+            insort(self.prices, price)
+        level[order.id] = order
+        self.size += 1
+
+    def remove(self, price: float, order_id: str) -> None:
+        level = self.levels[price]
+        del level[order_id]
+        self.size -= 1
+        if not level:
+            del self.levels[price]
+            del self.prices[bisect_left(self.prices, price)]
+
+    def find_price(self, price: float) -> Optional[float]:
+        """Retourne le niveau existant égal à `price` (à la tolérance près)."""
+        idx = bisect_left(self.prices, price - PRICE_TOLERANCE)
+        if idx < len(self.prices) and is_same_price(self.prices[idx], price):
+            return self.prices[idx]
+        return None
+
+
+class OrderLadder:
+    """
+    Carnet des ordres ouverts : map oid -> ordre et niveaux de prix triés par côté.
+
+    - recherche par oid en O(1)
+    - recherche / min / max par prix en O(log n) (bisect sur les niveaux)
+    - ajout / suppression : O(log n) pour la recherche du niveau, le décalage de la liste
+      des niveaux n'ayant lieu qu'à la création ou disparition d'un niveau
+
+    L'itération renvoie les ordres dans leur ordre d'insertion.
+    """
+
+    def __init__(self, orders: Iterable[Order] = ()) -> None:
+        self._orders: Dict[str, Order] = {}
+        self._prices: Dict[str, float] = {}
+        self._sides: Dict[LadderSide, _SideLevels] = {'buy': _SideLevels(), 'sell': _SideLevels()}
+        for order in orders:
+            self.add(order)
+
+    def add(self, order: Order) -> None:
+        """Ajoute (ou remplace) un ordre dans le carnet."""
+        if order.id in self._orders:
+            self.remove(order.id)
+        self._orders[order.id] = order
+        side = ladder_side(order)
+        if side is None:
+            return
+        price = float(order.price)
+        self._prices[order.id] = price
+        self._sides[side].add(price, order)
+
+    def remove(self, order_id: str) -> Optional[Order]:
+        """Retire un ordre par son oid, retourne l'ordre retiré ou None."""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+        price = self._prices.pop(order_id, None)
+        if price is not None:
+            self._sides[ladder_side(order)].remove(price, order_id)
+        return order
+
+    def get(self, order_id: str) -> Optional[Order]:
+        return self._orders.get(order_id)
+
+    def clear(self) -> None:
+        self._orders.clear()
+        self._prices.clear()
+        self._sides = {'buy': _SideLevels(), 'sell': _SideLevels()}
+
+    def count(self, side: LadderSide) -> int:
+        return self._sides[side].size
+
+    def contains_price(self, side: LadderSide, price: float) -> bool:
+        """Vérifie si un ordre existe sur ce côté au prix donné."""
+        return self._sides[side].find_price(float(price)) is not None
+
+    def at_price(self, side: LadderSide, price: float) -> List[Order]:
+        levels = self._sides[side]
+        level_price = levels.find_price(float(price))
+        return [] if level_price is None else list(levels.levels[level_price].values())
+
+    def min_order(self, side: LadderSide) -> Optional[Order]:
+        """Ordre de plus petit prix du côté donné."""
+        levels = self._sides[side]
+        if not levels.prices:
+            return None
+        return next(iter(levels.levels[levels.prices[0]].values()))
+
+    def max_order(self, side: LadderSide) -> Optional[Order]:
+        """Ordre de plus grand prix du côté donné."""
+        levels = self._sides[side]
+        if not levels.prices:
+            return None
+        return next(reversed(levels.levels[levels.prices[-1]].values()))
+
+    def sorted_orders(self, side: LadderSide) -> List[Order]:
+        """Ordres du côté donné triés par prix croissant."""
+        levels = self._sides[side]
+        return [order for price in levels.prices for order in levels.levels[price].values()]
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(list(self._orders.values()))
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._orders
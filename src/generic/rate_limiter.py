@@ -0,0 +1,231 @@
+"""
+Limitation de débit commune à tous les Dex du process.
+
+Hyperliquid limite le poids des requêtes REST par IP (1200 par minute) : le client ccxt
+de chaque observer ne connaît que ses propres appels, et une centaine d'observers sur la
+même IP finit en rafales de 429. Tous les appels passent ici par un seau à jetons unique,
+servi par priorité : les annulations et ordres reduce-only d'abord, puis les créations
+d'ordres, puis les lectures (compte, prix, ordres ouverts).
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Callable, Dict, Optional, Tuple
+
+from src.generic.cctx_api import Dex, OrderRequest
+from src.generic.cctx_balance_model import AccountData
+from src.generic.cctx_model import Order
+
+
+class Priority(IntEnum):
+    HIGH = 0    # annulations, ordres reduce-only
+    NORMAL = 1  # créations et modifications d'ordres, levier
+    LOW = 2     # lectures
+
+
+# poids Hyperliquid des requêtes /info utilisées par ccxt
+PRICE_WEIGHT = 20         # metaAndAssetCtxs
+ACCOUNT_WEIGHT = 2        # clearinghouseState
+OPEN_ORDERS_WEIGHT = 20   # frontendOpenOrders
+ORDER_STATUS_WEIGHT = 2   # orderStatus (fetch_order)
+
+
+def action_weight(batch_length: int) -> int:
+    """Poids d'une action /exchange : 1 + 1 par tranche de 40 ordres ou annulations"""
+    return 1 + batch_length // 40
+
+
+@dataclass
+class LaneMetrics:
+    priority: str
+    waiting: int
+    granted: int
+    weight: int
+    avg_wait: float
+    max_wait: float
+
+
+class RateLimitScheduler:
+    """
+    Seau à jetons de `weight_per_minute` jetons par minute et de capacité `burst`.
+
+    Une demande n'est servie que si aucune demande de priorité plus haute (ou plus ancienne
+    dans la même file) n'attend : une rafale de lectures ne retarde jamais une annulation.
+    """
+
+    _shared: Optional['RateLimitScheduler'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, weight_per_minute: float = 1200, burst: float = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = weight_per_minute / 60
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._condition = threading.Condition()
+        self._lanes: Dict[Priority, deque] = {priority: deque() for priority in Priority}
+        self._granted = {priority: 0 for priority in Priority}
+        self._granted_weight = {priority: 0 for priority in Priority}
+        self._total_wait = {priority: 0.0 for priority in Priority}
+        self._max_wait = {priority: 0.0 for priority in Priority}
+
+    @classmethod
+    def shared(cls, weight_per_minute: float = 1200, burst: float = 100) -> 'RateLimitScheduler':
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(weight_per_minute, burst)
+            return cls._shared
+
+    def acquire(self, priority: Priority, weight: int = 1) -> float:
+        """
+        Bloque jusqu'à ce que la demande puisse partir.
+
+        Returns:
+            float: Temps d'attente en secondes.
+        """
+        # une demande plus lourde que le seau ne passerait jamais
+        weight = min(weight, self.burst)
+        ticket = object()
+        with self._condition:
+            requested_at = self.clock()
+            lane = self._lanes[priority]
+            lane.append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    if self._is_next(priority, ticket) and self._tokens >= weight:
+                        self._tokens -= weight
+                        break
+                    if self._is_next(priority, ticket):
+                        self._condition.wait((weight - self._tokens) / self.rate)
+                    else:
+                        self._condition.wait()
+            finally:
+                lane.remove(ticket)
+                self._condition.notify_all()
+            wait = self.clock() - requested_at
+            self._granted[priority] += 1
+            self._granted_weight[priority] += weight
+            self._total_wait[priority] += wait
+            self._max_wait[priority] = max(self._max_wait[priority], wait)
+            return wait
+
+    def metrics(self) -> Dict[str, LaneMetrics]:
+        with self._condition:
+            return {priority.name.lower(): LaneMetrics(
+                priority=priority.name.lower(),
+                waiting=len(self._lanes[priority]),
+                granted=self._granted[priority],
+                weight=self._granted_weight[priority],
+                avg_wait=self._total_wait[priority] / self._granted[priority] if self._granted[priority] else 0.0,
+                max_wait=self._max_wait[priority],
+            ) for priority in Priority}
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _is_next(self, priority: Priority, ticket) -> bool:
+        for other in Priority:
+            if other >= priority:
+                break
+            if self._lanes[other]:
+                return False
+        return self._lanes[priority][0] is ticket
+
+
+class RateLimitedDex:
+    """Dex dont chaque appel réseau passe par le scheduler, dans la file de sa priorité"""
+
+    def __init__(self, dex, scheduler: RateLimitScheduler):
+        self.dex = dex
+        self.scheduler = scheduler
+
+    def __getattr__(self, name):
+        # symbol, marginCoin, get_user_address, on_order_update... : délégués au Dex
+        return getattr(self.dex, name)
+
+    # --- lectures
+
+    def get_current_price(self) -> float:
+        if not self._shares_public_data():
+            self.scheduler.acquire(Priority.LOW, PRICE_WEIGHT)
+        return self.dex.get_current_price()
+
+    def get_full_account_data(self) -> AccountData:
+        self.scheduler.acquire(Priority.LOW, ACCOUNT_WEIGHT)
+        return self.dex.get_full_account_data()
+
+    def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        self.scheduler.acquire(Priority.LOW, ACCOUNT_WEIGHT + (0 if self._shares_public_data() else PRICE_WEIGHT))
+        return self.dex.get_account_data_and_price()
+
+    def get_perp_available_balance(self) -> float:
+        self.scheduler.acquire(Priority.LOW, ACCOUNT_WEIGHT)
+        return self.dex.get_perp_available_balance()
+
+    def get_account_data(self):
+        self.scheduler.acquire(Priority.LOW, ACCOUNT_WEIGHT)
+        return self.dex.get_account_data()
+
+    def get_open_orders(self) -> [Order]:
+        self.scheduler.acquire(Priority.LOW, OPEN_ORDERS_WEIGHT)
+        return self.dex.get_open_orders()
+
+    # --- actions
+
+    def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        if order_requests:
+            reduce_only = all((request.params or {}).get('reduceOnly') for request in order_requests)
+            self.scheduler.acquire(Priority.HIGH if reduce_only else Priority.NORMAL,
+                                   action_weight(len(order_requests)))
+        return self.dex.create_orders(order_requests)
+
+    def create_open_long(self, qty, price) -> Order:
+        self.scheduler.acquire(Priority.NORMAL, self._single_order_weight())
+        return self.dex.create_open_long(qty, price)
+
+    def create_close_long(self, qty, price) -> Order:
+        self.scheduler.acquire(Priority.NORMAL, self._single_order_weight())
+        return self.dex.create_close_long(qty, price)
+
+    def buy_at_market_price(self, qty: float, price: float) -> Order:
+        self.scheduler.acquire(Priority.NORMAL, self._single_order_weight())
+        return self.dex.buy_at_market_price(qty, price)
+
+    def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        if order_ids:
+            self.scheduler.acquire(Priority.NORMAL, action_weight(len(order_ids)))
+        return self.dex.modify_orders(order_ids, order_requests)
+
+    def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        self.scheduler.acquire(Priority.NORMAL, action_weight(1))
+        return self.dex.modify_order(order_id, request)
+
+    def cancel_orders(self, order_ids: [str]):
+        if order_ids:
+            self.scheduler.acquire(Priority.HIGH, action_weight(len(order_ids)))
+        return self.dex.cancel_orders(order_ids)
+
+    def cancel_order(self, order_id: str):
+        self.scheduler.acquire(Priority.HIGH, action_weight(1))
+        return self.dex.cancel_order(order_id)
+
+    def set_cross_margin_leverage(self, leverage: int):
+        self.scheduler.acquire(Priority.NORMAL, action_weight(1))
+        return self.dex.set_cross_margin_leverage(leverage)
+
+    def _shares_public_data(self) -> bool:
+        """Prix lu par le client public partagé du pool : son poids est compté à ses défauts de cache"""
+        return isinstance(self.dex, Dex) and self.dex.public_data is not None
+
+    def _single_order_weight(self) -> int:
+        """Création d'un ordre ; hors mode confiance, le Dex ccxt le relit aussitôt par fetch_order"""
+        if isinstance(self.dex, Dex) and not self.dex.trust_creation_response:
+            return action_weight(1) + ORDER_STATUS_WEIGHT
+        return action_weight(1)
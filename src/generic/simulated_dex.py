@@ -0,0 +1,372 @@
+"""Echange simulé en mémoire, compatible avec l'interface de Dex utilisée par Algo."""
+
+import heapq
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ccxt.base.errors import OrderNotFound
+
+from src.generic.cctx_api import OrderRequest
+from src.generic.cctx_balance_model import (AccountData, AssetPosition, BalanceDetails, CumFunding, Leverage,
+                                            MarginSummary, Position)
+from src.generic.cctx_balance_model import Info as AccountInfo
+from src.generic.cctx_model import Info as OrderInfo
+from src.generic.cctx_model import Order
+from src.generic.hyperliquid_ws_model import WsBasicOrder, WsOrder
+
+OrderUpdatesListener = Callable[[List[WsOrder]], None]
+
+
+@dataclass
+class _RestingOrder:
+    oid: int
+    side: str  # 'buy' / 'sell'
+    price: float
+    qty: float
+    timestamp: int
+    reserved_margin: float
+
+
+class SimulatedDex:
+    """
+    Echange simulé : carnet d'ordres en priorité prix-temps et compte en marge croisée.
+
+    Le marché est représenté par un flux de prix (`on_price`). Un ordre limite acheteur
+    est exécuté à son prix dès que le prix passe sous sa limite, un vendeur dès que le
+    prix passe au-dessus ; à chaque tick, les meilleurs prix sont servis en premier puis
+    les plus anciens. Un ordre limite qui croise le prix courant, ou un ordre au marché,
+    est exécuté immédiatement au prix courant (taker).
+
+    Les exécutions sont publiées sous forme de `WsOrder` ('filled') aux listeners
+    abonnés (typiquement `HyperliquidObserver.handle_order_updates`). Comme sur l'échange
+    réel, elles sont publiées après coup : au tick suivant ou lors d'un `flush()`, jamais
+    pendant l'appel qui les a provoquées.
+    """
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, symbol: str = 'BTC', marginCoin: str = 'USDC', initial_balance: float = 10000.0,
+                 initial_price: float = 0.0, leverage: int = 40, maker_fee: float = 0.00015,
+                 taker_fee: float = 0.00045, maintenance_margin_rate: Optional[float] = None):
+        self.symbol = symbol
+        self.marginCoin = marginCoin
+        self.leverage = leverage
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.maintenance_margin_rate = maintenance_margin_rate
+
+        self.current_price = initial_price
+        self.timestamp = 0
+
+        # compte en marge croisée
+        self.balance = initial_balance  # USDC réalisé (dépôts + PnL réalisé - frais)
+        self.position_size = 0.0
+        self.entry_price = 0.0
+        self.fees_paid = 0.0
+        self.reserved_margin = 0.0
+        self.liquidated = False
+
+        # carnet : tas (prix, oid), l'oid croissant donne la priorité temps ; suppression paresseuse des ordres annulés
+        self._open: Dict[int, _RestingOrder] = {}
+        self._bids: List[tuple] = []
+        self._asks: List[tuple] = []
+        self._next_oid = 1
+
+        self._listeners: List[OrderUpdatesListener] = []
+        self._pending_updates: List[WsOrder] = []
+        self._dispatching = False
+
+        self.fill_count = 0
+        self.tick_count = 0
+
+    # ------------------------------------------------------------------ flux de prix
+
+    def subscribe(self, listener: OrderUpdatesListener):
+        self._listeners.append(listener)
+
+    def on_price(self, price: float, timestamp: Optional[int] = None):
+        """Fait avancer le marché d'un tick et publie les exécutions qui en résultent."""
+        self.current_price = price
+        if timestamp is not None:
+            self.timestamp = timestamp
+        self.tick_count += 1
+
+        if (self._bids and -self._bids[0][0] >= price) or (self._asks and self._asks[0][0] <= price):
+            self._match(price)
+        if self.position_size:
+            self._check_liquidation()
+        if self._pending_updates:
+            self.flush()
+
+    def run(self, prices: Iterable[float]) -> int:
+        """Rejoue une série de prix, retourne le nombre de ticks traités."""
+        count = 0
+        for price in prices:
+            self.on_price(price)
+            count += 1
+        return count
+
+    def flush(self):
+        """Publie les exécutions en attente, y compris celles provoquées par les listeners."""
+        if self._dispatching:
+            return
+        self._dispatching = True
+        try:
+            while self._pending_updates:
+                updates, self._pending_updates = self._pending_updates, []
+                for listener in self._listeners:
+                    listener(updates)
+        finally:
+            self._dispatching = False
+
+    def _match(self, price: float):
+        while self._bids and -self._bids[0][0] >= price:
+            _, oid = heapq.heappop(self._bids)
+            resting = self._open.pop(oid, None)
+            if resting is not None:
+                self._fill(resting, resting.price, self.maker_fee)
+        while self._asks and self._asks[0][0] <= price:
+            _, oid = heapq.heappop(self._asks)
+            resting = self._open.pop(oid, None)
+            if resting is not None:
+                self._fill(resting, resting.price, self.maker_fee)
+
+    # ------------------------------------------------------------------ interface Dex
+
+    def get_symbol(self) -> str:
+        return self.symbol + '/' + self.marginCoin + ':' + self.marginCoin
+
+    def get_current_price(self) -> float:
+        return self.current_price
+
+    def set_cross_margin_leverage(self, leverage: int):
+        self.leverage = leverage
+
+    def create_open_long(self, qty, price) -> Order:
+        return self.create_orders([OrderRequest(order_type='limit', side='buy', qty=qty, price=price)])[0]
+
+    def create_close_long(self, qty, price) -> Order:
+        return self.create_orders([OrderRequest(order_type='limit', side='sell', qty=qty, price=price)])[0]
+
+    def buy_at_market_price(self, qty: float, price: float):
+        return self.create_orders([OrderRequest(order_type='market', side='buy', qty=qty, price=price)])[0]
+
+    def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        return [self._create_order(request) for request in order_requests]
+
+    def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        return [self._modify_order(int(order_id), request) for order_id, request in zip(order_ids, order_requests)]
+
+    def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        return self.modify_orders([order_id], [request])[0]
+
+    def cancel_order(self, order_id: str):
+        if not self._cancel(int(order_id)):
+            raise OrderNotFound(f"Order {order_id} not found")
+
+    def cancel_orders(self, order_ids: [str]):
+        for order_id in order_ids:
+            if not self._cancel(int(order_id)):
+                self.logger.warning(f"Cancel: order {order_id} not found")
+
+    def get_open_orders(self) -> [Order]:
+        return [self._to_order(resting, 'open') for resting in self._open.values()]
+
+    def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        return self.get_full_account_data(), self.current_price
+
+    def get_full_account_data(self) -> AccountData:
+        equity = self.equity
+        margin_used = self.margin_used
+        notional = abs(self.position_size) * self.current_price
+        margin_summary = MarginSummary(accountValue=equity, totalNtlPos=notional,
+                                       totalRawUsd=self.balance, totalMarginUsed=margin_used)
+        asset_positions = []
+        if self.position_size:
+            asset_positions.append(AssetPosition(type='oneWay', position=Position(
+                coin=self.symbol,
+                szi=self.position_size,
+                leverage=Leverage(type='cross', value=self.leverage),
+                entryPx=self.entry_price,
+                positionValue=notional,
+                unrealizedPnl=self.unrealized_pnl,
+                returnOnEquity=self.unrealized_pnl / margin_used if margin_used else 0.0,
+                liquidationPx=None,
+                marginUsed=margin_used,
+                maxLeverage=self.leverage,
+                cumFunding=CumFunding(allTime=0.0, sinceOpen=0.0, sinceChange=0.0),
+            )))
+        free = max(0.0, equity - margin_used - self.reserved_margin)
+        return AccountData(
+            info=AccountInfo(marginSummary=margin_summary, crossMarginSummary=margin_summary,
+                             crossMaintenanceMarginUsed=self._maintenance_margin(),
+                             withdrawable=free, assetPositions=asset_positions, time=self.timestamp),
+            USDC=BalanceDetails(total=equity, used=margin_used, free=free),
+            timestamp=self.timestamp,
+            datetime="",
+            free={self.marginCoin: free},
+            used={self.marginCoin: margin_used},
+            total={self.marginCoin: equity},
+        )
+
+    # ------------------------------------------------------------------ compte
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.position_size * (self.current_price - self.entry_price)
+
+    @property
+    def equity(self) -> float:
+        return self.balance + self.unrealized_pnl
+
+    @property
+    def margin_used(self) -> float:
+        return abs(self.position_size) * self.current_price / self.leverage
+
+    def _maintenance_margin(self) -> float:
+        rate = self.maintenance_margin_rate if self.maintenance_margin_rate is not None else 1 / (2 * self.leverage)
+        return abs(self.position_size) * self.current_price * rate
+
+    def _check_liquidation(self):
+        if self.equity > self._maintenance_margin():
+            return
+        self.logger.error(f"Simulated liquidation at {self.current_price}: equity {self.equity}")
+        self.liquidated = True
+        for oid in list(self._open):
+            self._cancel(oid)
+        side = 'sell' if self.position_size > 0 else 'buy'
+        self._apply_fill(side, abs(self.position_size), self.current_price, self.taker_fee)
+
+    def _apply_fill(self, side: str, qty: float, price: float, fee_rate: float):
+        fee = qty * price * fee_rate
+        self.balance -= fee
+        self.fees_paid += fee
+
+        signed_qty = qty if side == 'buy' else -qty
+        position = self.position_size
+        if position == 0 or (position > 0) == (signed_qty > 0):
+            new_position = position + signed_qty
+            self.entry_price = (abs(position) * self.entry_price + qty * price) / abs(new_position)
+        else:
+            closed_qty = min(qty, abs(position))
+            self.balance += closed_qty * (price - self.entry_price) * (1 if position > 0 else -1)
+            new_position = position + signed_qty
+            if abs(new_position) < 1e-12:
+                new_position = 0.0
+                self.entry_price = 0.0
+            elif (new_position > 0) != (position > 0):
+                self.entry_price = price
+        self.position_size = new_position
+
+    def _required_margin(self, side: str, qty: float, price: float) -> float:
+        # un ordre de vente couvert par la position longue ne consomme pas de marge
+        if side == 'sell' and self.position_size > 0:
+            qty = max(0.0, qty - self.position_size)
+        elif side == 'buy' and self.position_size < 0:
+            qty = max(0.0, qty + self.position_size)
+        return qty * price / self.leverage
+
+    # ------------------------------------------------------------------ ordres
+
+    def _create_order(self, request: OrderRequest) -> Order:
+        oid = self._next_oid
+        self._next_oid += 1
+        is_market = request.order_type == 'market'
+        price = self.current_price if is_market else float(request.price)
+        qty = float(request.qty)
+
+        required_margin = self._required_margin(request.side, qty, price)
+        if qty <= 0 or price <= 0 or required_margin > self.equity - self.margin_used - self.reserved_margin:
+            self.logger.warning(f"Simulated order rejected: {request}")
+            return self._rejected_order(request)
+
+        crosses = request.side == 'buy' and price >= self.current_price > 0 \
+            or request.side == 'sell' and 0 < price <= self.current_price
+        resting = _RestingOrder(oid=oid, side=request.side, price=price, qty=qty, timestamp=self.timestamp,
+                                reserved_margin=0.0)
+        if is_market or crosses:
+            fill_price = self.current_price
+            self._fill(resting, fill_price, self.taker_fee)
+            return self._to_order(resting, 'closed')
+
+        resting.reserved_margin = required_margin
+        self.reserved_margin += required_margin
+        self._open[oid] = resting
+        if request.side == 'buy':
+            heapq.heappush(self._bids, (-price, oid))
+        else:
+            heapq.heappush(self._asks, (price, oid))
+        return self._to_order(resting, 'open')
+
+    def _modify_order(self, oid: int, request: OrderRequest) -> Order:
+        """
+        Modification atomique d'un ordre au repos : à prix inchangé et quantité non augmentée,
+        l'ordre garde sa priorité ; sinon il est remplacé (nouvel oid, en fin de file).
+        Une modification rejetée laisse l'ordre d'origine intact.
+        """
+        resting = self._open.get(oid)
+        if resting is None or request.order_type == 'market':
+            self.logger.warning(f"Simulated modification rejected: {oid} - {request}")
+            return self._rejected_order(request)
+
+        price, qty = float(request.price), float(request.qty)
+        if resting.side == request.side and resting.price == price and 0 < qty <= resting.qty:
+            required_margin = self._required_margin(resting.side, qty, price)
+            self.reserved_margin += required_margin - resting.reserved_margin
+            resting.qty, resting.reserved_margin = qty, required_margin
+            return self._to_order(resting, 'open')
+
+        self._cancel(oid)
+        order = self._create_order(request)
+        if order.status == 'rejected':
+            # l'entrée du carnet est toujours dans le tas (suppression paresseuse) : il suffit de la rétablir
+            self._open[oid] = resting
+            self.reserved_margin += resting.reserved_margin
+        return order
+
+    def _cancel(self, oid: int) -> bool:
+        resting = self._open.pop(oid, None)
+        if resting is None:
+            return False
+        self.reserved_margin -= resting.reserved_margin
+        return True
+
+    def _fill(self, resting: _RestingOrder, price: float, fee_rate: float):
+        self.reserved_margin -= resting.reserved_margin
+        self._apply_fill(resting.side, resting.qty, price, fee_rate)
+        self.fill_count += 1
+        self._pending_updates.append(WsOrder(
+            order=WsBasicOrder(
+                coin=self.symbol,
+                side='B' if resting.side == 'buy' else 'A',
+                limitPx=price,
+                sz=0.0,
+                oid=resting.oid,
+                timestamp=resting.timestamp,
+                origSz=resting.qty,
+            ),
+            status='filled',
+            statusTimestamp=self.timestamp,
+        ))
+
+    def _to_order(self, resting: _RestingOrder, status: str) -> Order:
+        oid = str(resting.oid)
+        return Order(
+            info=OrderInfo(coin=self.symbol, side='B' if resting.side == 'buy' else 'A', limitPx=resting.price,
+                           sz=resting.qty, oid=oid, timestamp=resting.timestamp, triggerCondition="",
+                           isTrigger=False, triggerPx=0.0, children=[], isPositionTpsl=False, reduceOnly=False,
+                           orderType="Limit", origSz=resting.qty, tif="Gtc", cloid=None),
+            id=oid, clientOrderId=None, timestamp=resting.timestamp, datetime="", lastTradeTimestamp=None,
+            lastUpdateTimestamp=None, symbol=self.get_symbol(), type='limit', timeInForce='GTC', postOnly=False,
+            reduceOnly=False, side=resting.side, price=resting.price, triggerPrice=None, amount=resting.qty,
+            cost=0.0, average=None, filled=0.0 if status == 'open' else resting.qty,
+            remaining=resting.qty if status == 'open' else 0.0, status=status, fee=None, trades=[], fees=[],
+            stopPrice=None, takeProfitPrice=None, stopLossPrice=None,
+        )
+
+    def _rejected_order(self, request: OrderRequest) -> Order:
+        rejected = self._to_order(_RestingOrder(oid=0, side=request.side, price=float(request.price or 0),
+                                                qty=float(request.qty), timestamp=self.timestamp,
+                                                reserved_margin=0.0), 'rejected')
+        rejected.id = ""
+        return rejected
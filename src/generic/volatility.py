@@ -0,0 +1,225 @@
+"""
+Indicateurs de volatilité en flux (ATR, largeur des bandes de Bollinger, percentile glissant).
+
+Chaque nouvelle bougie met à jour les indicateurs en temps constant : rien n'est recalculé
+sur l'historique. Le percentile de la volatilité courante sur la fenêtre glissante sert à
+choisir le gap de la grille (voir `Algo.update_gap_from_volatility`), à la manière de
+`experimentals/volatility.ipynb`.
+"""
+
+import math
+from array import array
+from collections import deque
+from typing import Optional
+
+
+class StreamingATR:
+    """Average True Range, lissage de Wilder (initialisé par la moyenne des `length` premiers TR)"""
+
+    def __init__(self, length: int = 14):
+        self.length = length
+        self.value: Optional[float] = None
+        self._previous_close: Optional[float] = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._previous_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._previous_close = close
+
+        if self.value is None:
+            self._seed_sum += true_range
+            self._seed_count += 1
+            if self._seed_count == self.length:
+                self.value = self._seed_sum / self.length
+        else:
+            self.value = (self.value * (self.length - 1) + true_range) / self.length
+        return self.value
+
+
+class StreamingBollingerWidth:
+    """Ecart entre bande haute et bande basse : 2 * num_std * écart-type des `length` dernières clôtures"""
+
+    def __init__(self, length: int = 20, num_std: float = 2.0):
+        self.length = length
+        self.num_std = num_std
+        self.value: Optional[float] = None
+        self._closes: deque = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._updates = 0
+
+    def update(self, close: float) -> Optional[float]:
+        self._closes.append(close)
+        self._sum += close
+        self._sum_sq += close * close
+        if len(self._closes) > self.length:
+            oldest = self._closes.popleft()
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        # les sommes glissantes accumulent des erreurs d'arrondi : recalcul exact de temps en temps
+        self._updates += 1
+        if self._updates % 1000 == 0:
+            self._sum = math.fsum(self._closes)
+            self._sum_sq = math.fsum(c * c for c in self._closes)
+        if len(self._closes) < self.length:
+            return None
+
+        mean = self._sum / self.length
+        variance = max(0.0, self._sum_sq / self.length - mean * mean)
+        self.value = 2 * self.num_std * math.sqrt(variance)
+        return self.value
+
+
+class RollingPercentile:
+    """
+    Rang des `window` dernières valeurs, dans un arbre de Fenwick sur des classes logarithmiques.
+
+    Une valeur est rangée dans la classe de largeur relative `resolution` qui la contient :
+    ajout, retrait, rang et quantile coûtent O(log nb_classes), indépendamment de la fenêtre.
+    Les valeurs hors de [min_value, max_value] sont ramenées aux classes extrêmes.
+    """
+
+    def __init__(self, window: int, resolution: float = 0.01, min_value: float = 1e-6, max_value: float = 1e7):
+        self.window = window
+        self._log_min = math.log(min_value)
+        self._log_step = math.log1p(resolution)
+        self._nb_bins = int(math.ceil((math.log(max_value) - self._log_min) / self._log_step)) + 1
+        self._tree = array('q', bytes(8 * (self._nb_bins + 1)))
+        self._bins: deque = deque()
+        self._top_bit = 1 << (self._nb_bins.bit_length() - 1)
+
+    def __len__(self) -> int:
+        return len(self._bins)
+
+    def add(self, value: float):
+        if len(self._bins) == self.window:
+            self._update(self._bins.popleft(), -1)
+        b = self._bin(value)
+        self._bins.append(b)
+        self._update(b, 1)
+
+    def rank(self, value: float) -> float:
+        """Part des valeurs de la fenêtre strictement inférieures à `value` (à la résolution près)"""
+        if not self._bins:
+            return 0.0
+        return self._prefix(self._bin(value)) / len(self._bins)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Valeur (centre de classe) sous laquelle se trouve une part `q` de la fenêtre"""
+        if not self._bins:
+            return None
+        k = min(len(self._bins) - 1, max(0, int(q * len(self._bins))))
+        # descente binaire dans l'arbre : plus grande position dont le préfixe est <= k
+        position = 0
+        step = self._top_bit
+        while step:
+            next_position = position + step
+            if next_position <= self._nb_bins and self._tree[next_position] <= k:
+                position = next_position
+                k -= self._tree[next_position]
+            step >>= 1
+        return math.exp(self._log_min + (position + 0.5) * self._log_step)
+
+    def _bin(self, value: float) -> int:
+        if value <= 0:
+            return 0
+        b = int((math.log(value) - self._log_min) / self._log_step)
+        return min(self._nb_bins - 1, max(0, b))
+
+    def _update(self, b: int, delta: int):
+        i = b + 1
+        while i <= self._nb_bins:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, b: int) -> int:
+        """Nombre de valeurs dans les classes < b"""
+        total = 0
+        i = b
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class VolatilityEngine:
+    """
+    ATR et largeur de Bollinger sur des bougies, et leur percentile sur les `percentile_window`
+    dernières bougies.
+
+    Les bougies arrivent soit closes (`on_bar`), soit en mises à jour successives de la bougie
+    en cours (`on_candle`, flux `candle` du websocket), soit en ticks de prix regroupés en
+    bougies de `bar_seconds` (`on_price`).
+    """
+
+    def __init__(self, bar_seconds: float = 60, atr_length: int = 14, bb_length: int = 20, bb_num_std: float = 2.0,
+                 percentile_window: int = 1440, min_samples: int = 30):
+        self.bar_seconds = bar_seconds
+        self.min_samples = min_samples
+        self.atr = StreamingATR(atr_length)
+        self.bb_width = StreamingBollingerWidth(bb_length, bb_num_std)
+        self.atr_percentiles = RollingPercentile(percentile_window)
+        self.bb_width_percentiles = RollingPercentile(percentile_window)
+        self.bar_count = 0
+
+        # bougie en cours de construction
+        self._bar_key = None
+        self._high = 0.0
+        self._low = 0.0
+        self._close = 0.0
+
+    @property
+    def is_ready(self) -> bool:
+        return len(self.atr_percentiles) >= self.min_samples and len(self.bb_width_percentiles) >= self.min_samples
+
+    @property
+    def atr_percentile(self) -> Optional[float]:
+        if self.atr.value is None or not len(self.atr_percentiles):
+            return None
+        return self.atr_percentiles.rank(self.atr.value)
+
+    @property
+    def bb_width_percentile(self) -> Optional[float]:
+        if self.bb_width.value is None or not len(self.bb_width_percentiles):
+            return None
+        return self.bb_width_percentiles.rank(self.bb_width.value)
+
+    @property
+    def volatility_percentile(self) -> Optional[float]:
+        """Moyenne des percentiles ATR et Bollinger, entre 0 (volatilité la plus faible) et 1"""
+        atr_percentile, bb_width_percentile = self.atr_percentile, self.bb_width_percentile
+        if atr_percentile is None or bb_width_percentile is None:
+            return None
+        return (atr_percentile + bb_width_percentile) / 2
+
+    def on_bar(self, high: float, low: float, close: float):
+        self.bar_count += 1
+        atr = self.atr.update(high, low, close)
+        if atr is not None:
+            self.atr_percentiles.add(atr)
+        bb_width = self.bb_width.update(close)
+        if bb_width is not None:
+            self.bb_width_percentiles.add(bb_width)
+
+    def on_candle(self, open_time: int, high: float, low: float, close: float):
+        """Mise à jour de la bougie `open_time` ; la précédente est close quand open_time change"""
+        if self._bar_key is not None and open_time != self._bar_key:
+            self.on_bar(self._high, self._low, self._close)
+        self._bar_key = open_time
+        self._high, self._low, self._close = high, low, close
+
+    def on_price(self, price: float, timestamp: float):
+        key = int(timestamp // self.bar_seconds)
+        if key != self._bar_key:
+            if self._bar_key is not None:
+                self.on_bar(self._high, self._low, self._close)
+            self._bar_key = key
+            self._high = self._low = price
+        else:
+            self._high = max(self._high, price)
+            self._low = min(self._low, price)
+        self._close = price
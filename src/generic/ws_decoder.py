@@ -0,0 +1,114 @@
+"""
+Décodage direct des trames websocket Hyperliquid des canaux connus.
+
+Une trame orderUpdates (ou candle) est décodée par orjson quand il est installé, sinon par json,
+puis ses objets WsOrder (ou WsCandle) sont construits champ par champ, sans passer par safe_parse.
+Une trame dont la forme diffère de celle attendue (champ absent, type inattendu) est parsée par
+safe_parse comme avant : même résultat, au coût du parsing générique.
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple, Union
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+from src.generic.cctx_mapper import safe_parse
+from src.generic.hyperliquid_ws_model import WsBasicOrder, WsCandle, WsMessage, WsOrder
+
+logger = logging.getLogger(__name__)
+
+ORDER_UPDATES = "orderUpdates"
+CANDLE = "candle"
+
+
+class _UnexpectedShape(Exception):
+    """Trame hors de la forme décodée directement"""
+
+
+def decode_message(message: Union[str, bytes]) -> Tuple[Optional[str], Any]:
+    """
+    Canal et contenu d'une trame websocket.
+
+    Returns:
+        (canal, contenu) : List[WsOrder] pour orderUpdates, WsCandle pour candle, la trame décodée sinon
+    """
+    msg = _loads(message)
+    channel = msg.get("channel") if isinstance(msg, dict) else None
+    if channel == ORDER_UPDATES:
+        return channel, decode_order_updates(msg)
+    if channel == CANDLE:
+        return channel, decode_candle(msg)
+    return channel, msg
+
+
+def decode_order_updates(msg: dict) -> List[WsOrder]:
+    try:
+        data = msg["data"]
+        if type(data) is not list:
+            raise _UnexpectedShape()
+        return [_ws_order(item) for item in data]
+    except (_UnexpectedShape, KeyError, TypeError, ValueError):
+        logger.debug("[WS] Trame orderUpdates hors forme attendue, parsing générique")
+        return safe_parse(WsMessage[WsOrder], msg).data
+
+
+def decode_candle(msg: dict) -> WsCandle:
+    try:
+        return _ws_candle(msg["data"])
+    except (_UnexpectedShape, KeyError, TypeError, ValueError):
+        logger.debug("[WS] Trame candle hors forme attendue, parsing générique")
+        return safe_parse(WsCandle, msg["data"])
+
+
+def _ws_order(item: dict) -> WsOrder:
+    order = item["order"]
+    basic_order = WsBasicOrder(
+        coin=_str(order["coin"]),
+        side=_str(order["side"]),
+        limitPx=_float(order["limitPx"]),
+        sz=_float(order["sz"]),
+        oid=_int(order["oid"]),
+        timestamp=_int(order["timestamp"]),
+        origSz=_float(order["origSz"]),
+        cloid=_optional_str(order.get("cloid")),
+    )
+    return WsOrder(order=basic_order, status=_str(item["status"]), statusTimestamp=_int(item["statusTimestamp"]))
+
+
+def _ws_candle(data: dict) -> WsCandle:
+    return WsCandle(t=_int(data["t"]), T=_int(data["T"]), s=_str(data["s"]), i=_str(data["i"]),
+                    o=_float(data["o"]), c=_float(data["c"]), h=_float(data["h"]), l=_float(data["l"]),
+                    v=_float(data["v"]), n=_int(data["n"]))
+
+
+# conversions strictes : toute autre valeur renvoie la trame au parsing générique (et à ses valeurs de repli)
+
+def _str(value) -> str:
+    if type(value) is not str:
+        raise _UnexpectedShape()
+    return value
+
+
+def _optional_str(value) -> Optional[str]:
+    return None if value is None else _str(value)
+
+
+def _int(value) -> int:
+    if type(value) is not int:
+        raise _UnexpectedShape()
+    return value
+
+
+def _float(value) -> float:
+    # Hyperliquid envoie prix et tailles en chaînes décimales
+    if type(value) is str and value:
+        return float(value)
+    if type(value) is float or type(value) is int:
+        return float(value)
+    raise _UnexpectedShape()
@@ -1,3 +1,4 @@
 from .hyperliquid_api import HyperliquidAPI
+from .hyperliquid_dex import HyperliquidDex
 
-__all__ = ['HyperliquidAPI']
+__all__ = ['HyperliquidAPI', 'HyperliquidDex']
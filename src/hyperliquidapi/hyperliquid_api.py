@@ -1,13 +1,21 @@
 import os
 from dotenv import load_dotenv
-from hyperliquid.info import Info
-from hyperliquid.utils.constants import MAINNET_API_URL, TESTNET_API_URL
+try:
+    from hyperliquid.info import Info
+    from hyperliquid.utils.constants import MAINNET_API_URL, TESTNET_API_URL
+except ImportError:
+    # SDK absent : le paquet reste importable (HyperliquidDex sur un Exchange fourni)
+    Info = None
 from .hyperliquid_mappers import HyperliquidApiMapper
+from .hyperliquid_dex import HyperliquidDex
 from .hyperliquid_models import Position, Order
+from src.generic.cctx_api import DexConfig
 from typing import List, Dict
 
 class HyperliquidAPI:
     def __init__(self):
+        if Info is None:
+            raise ImportError("HyperliquidAPI requiert hyperliquid-python-sdk")
         load_dotenv()
         self.wallet_address = os.getenv("WALLET_ADDRESS")
         if not self.wallet_address:
@@ -21,6 +29,7 @@ class HyperliquidAPI:
         print(f"Mainnet URL: {MAINNET_API_URL}")
         print(f"Testnet URL: {TESTNET_API_URL}")
         self.info = Info(base_url=self.api_url, skip_ws=True)
+        self._dexes: Dict[str, HyperliquidDex] = {}
 
     def get_balance(self) -> Dict:
         user_state = self.info.user_state(self.wallet_address)
@@ -39,15 +48,25 @@ class HyperliquidAPI:
         open_orders = self.info.open_orders(self.wallet_address)
         return HyperliquidApiMapper.map_orders(open_orders)
 
+    def _dex(self, symbol: str, marginCoin: str) -> HyperliquidDex:
+        # les actions d'échange sont signées avec la clé API_KEY
+        if symbol not in self._dexes:
+            api_key = os.getenv("API_KEY")
+            if not api_key:
+                raise ValueError("API_KEY environment variable is not set")
+            self._dexes[symbol] = HyperliquidDex(DexConfig(symbol=symbol, marginCoin=marginCoin, isTest=not self.is_prod,
+                                                           walletAddress=self.wallet_address, apiKey=api_key))
+        return self._dexes[symbol]
+
     def buyAtMarketPrice(self, symbol: str, marginCoin: str, qty: float):
-        print("")
+        dex = self._dex(symbol, marginCoin)
+        return dex.buy_at_market_price(qty, dex.get_current_price())
 
     def openLongPosition(self, symbol: str, marginCoin: str, qty: float):
-        print("")
+        return self.buyAtMarketPrice(symbol, marginCoin, qty)
 
     def createLongOrder(self, symbol: str, marginCoin: str, qty: float, price: float):
-        self.info.exchange_order(self.wallet_address, symbol, marginCoin, qty, price)
-        print("")
+        return self._dex(symbol, marginCoin).create_open_long(qty, price)
 
     def createShortOrder(self, symbol: str, marginCoin: str, qty: float, price: float):
-        print("")
\ No newline at end of file
+        return self._dex(symbol, marginCoin).create_close_long(qty, price)
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""
+Backend Dex natif : actions d'échange Hyperliquid signées et envoyées par le SDK
+hyperliquid-python-sdk, sans passer par la normalisation générique de ccxt.
+
+Même interface que `src.generic.cctx_api.Dex` (mêmes modèles Order / AccountData en
+sortie), pour comparer les deux backends sur un même algo.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+try:
+    import eth_account
+    from hyperliquid.exchange import Exchange
+    from hyperliquid.utils.constants import MAINNET_API_URL, TESTNET_API_URL
+    from hyperliquid.utils.types import Cloid
+except ImportError:
+    # SDK absent : le backend n'est utilisable qu'avec un `exchange` fourni (tests sur un faux Exchange)
+    eth_account = Exchange = Cloid = None
+
+from src.generic.cctx_api import DexBase, DexConfig, OrderRequest
+from src.generic.cctx_balance_model import AccountData
+from src.generic.cctx_mapper import parse_balance, parse_order
+from src.generic.cctx_model import Order
+
+# écart de prix d'un ordre au marché (IOC), comme la valeur par défaut de ccxt et du SDK
+DEFAULT_SLIPPAGE = 0.05
+
+# méthodes du SDK chronométrées par ExchangeMetrics
+EXCHANGE_ENDPOINTS = ('bulk_orders', 'bulk_modify_orders_new', 'bulk_cancel', 'update_leverage')
+INFO_ENDPOINTS = ('frontend_open_orders', 'all_mids', 'user_state')
+
+
+class HyperliquidDex(DexBase):
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, dex_config: DexConfig, trust_creation_response: bool = False,
+                 exchange: Optional['Exchange'] = None, slippage: float = DEFAULT_SLIPPAGE):
+        super().__init__(dex_config, trust_creation_response)
+        self.wallet_address = dex_config.walletAddress
+        self.slippage = slippage
+        if exchange is None:
+            if Exchange is None:
+                raise ImportError("Le backend natif requiert hyperliquid-python-sdk et eth-account")
+            exchange = Exchange(eth_account.Account.from_key(dex_config.apiKey),
+                                TESTNET_API_URL if dex_config.isTest else MAINNET_API_URL,
+                                account_address=dex_config.walletAddress)
+        self.exchange = exchange
+        # le SDK charge les métadonnées (meta) une fois, dans l'Info de l'Exchange
+        self.info = exchange.info
+        self.sz_decimals = self.info.asset_to_sz_decimals[self.info.name_to_asset(self.symbol)]
+        self.exchange_metrics.instrument(self.exchange, EXCHANGE_ENDPOINTS)
+        self.exchange_metrics.instrument(self.info, INFO_ENDPOINTS)
+
+    # --- arrondis imposés par Hyperliquid
+
+    def round_size(self, qty: float) -> float:
+        return round(qty, self.sz_decimals)
+
+    def round_price(self, price: float) -> float:
+        """5 chiffres significatifs au plus, et au plus 6 - szDecimals décimales (perps)"""
+        return round(float(f"{price:.5g}"), 6 - self.sz_decimals)
+
+    # --- lectures
+
+    def get_open_orders(self) -> [Order]:
+        return [parse_order(self._open_order_dict(order))
+                for order in self.info.frontend_open_orders(self.wallet_address)
+                if order['coin'] == self.symbol]
+
+    def get_current_price(self) -> float:
+        return float(self.info.all_mids()[self.symbol])
+
+    def get_full_account_data(self) -> AccountData:
+        """Même structure que le fetch_balance de ccxt : état du compte (clearinghouseState) et solde de marge"""
+        user_state = self.info.user_state(self.wallet_address)
+        margin_summary = user_state['marginSummary']
+        balance = {
+            'total': float(margin_summary['accountValue']),
+            'used': float(margin_summary['totalMarginUsed']),
+            'free': float(user_state['withdrawable']),
+        }
+        timestamp = int(user_state['time'])
+        return parse_balance({
+            'info': user_state,
+            self.marginCoin: balance,
+            'timestamp': timestamp,
+            'datetime': datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).isoformat(),
+            **{key: {self.marginCoin: value} for key, value in balance.items()},
+        })
+
+    def get_account_data_and_price(self) -> Tuple[AccountData, float]:
+        return self.get_full_account_data(), self.get_current_price()
+
+    # --- actions
+
+    def create_orders(self, order_requests: [OrderRequest]) -> [Order]:
+        """Action `order` groupée ; même contrat que Dex.create_orders"""
+        if not order_requests:
+            return []
+        order_requests = [self._prepare_request(request) for request in order_requests]
+        self.logger.info(f"api - Creating {len(order_requests)} orders in one batch: {order_requests}")
+        response = self.exchange.bulk_orders([self._order_wire(request) for request in order_requests])
+        self.logger.info(f"Orders creation response: {response}")
+        orders = [parse_order(self._complete_creation_response(self._status_dict(status), request))
+                  for status, request in zip(self._statuses(response), order_requests)]
+        for order in orders:
+            self._track_unconfirmed(order)
+        return orders
+
+    def create_order(self, request: OrderRequest) -> Order:
+        return self.create_orders([request])[0]
+
+    def create_open_long(self, qty, price) -> Order:
+        return self.create_order(OrderRequest(order_type='limit', side=self.buy, qty=qty, price=price))
+
+    def create_close_long(self, qty, price) -> Order:
+        return self.create_order(OrderRequest(order_type='limit', side=self.sell, qty=qty, price=price))
+
+    def buy_at_market_price(self, qty: float, price: float) -> Order:
+        self.logger.info(f"Buying {qty} at market price : {price}")
+        return self.create_order(OrderRequest(order_type='market', side=self.buy, qty=qty, price=price))
+
+    def modify_orders(self, order_ids: [str], order_requests: [OrderRequest]) -> [Order]:
+        """Action `batchModify` : chaque ordre garde sa place dans le carnet seulement si son prix ne change pas"""
+        if not order_ids:
+            return []
+        order_requests = [self._prepare_request(request) for request in order_requests]
+        self.logger.info(f"api - Modifying {len(order_ids)} orders in one batch: {list(zip(order_ids, order_requests))}")
+        response = self.exchange.bulk_modify_orders_new([
+            {'oid': int(order_id), 'order': self._order_wire(request)}
+            for order_id, request in zip(order_ids, order_requests)
+        ])
+        self.logger.info(f"Orders modification response: {response}")
+        orders = [parse_order(self._complete_creation_response(self._status_dict(status), request))
+                  for status, request in zip(self._statuses(response), order_requests)]
+        for order in orders:
+            self._track_unconfirmed(order)
+        return orders
+
+    def modify_order(self, order_id: str, request: OrderRequest) -> Order:
+        return self.modify_orders([order_id], [request])[0]
+
+    def cancel_orders(self, order_ids: [str]):
+        """Action `cancel` groupée"""
+        if not order_ids:
+            return
+        self.logger.info(f"api - Cancelling {len(order_ids)} orders in one batch: {order_ids}")
+        response = self.exchange.bulk_cancel([{'coin': self.symbol, 'oid': int(order_id)} for order_id in order_ids])
+        for order_id, status in zip(order_ids, self._statuses(response)):
+            if isinstance(status, dict) and 'error' in status:
+                self.logger.warning(f"Could not cancel order {order_id}: {status['error']}")
+
+    def cancel_order(self, order_id: str):
+        self.cancel_orders([order_id])
+
+    def set_cross_margin_leverage(self, leverage: int):
+        self._statuses(self.exchange.update_leverage(leverage, self.symbol, is_cross=True))
+
+    # --- conversions
+
+    def _order_wire(self, request: OrderRequest) -> dict:
+        params = request.params or {}
+        is_buy = request.side == self.buy
+        if request.order_type == 'market':
+            # un ordre au marché Hyperliquid est un ordre IOC au prix limite du glissement toléré
+            price = request.price * (1 + self.slippage if is_buy else 1 - self.slippage)
+            order_type = {'limit': {'tif': 'Ioc'}}
+        else:
+            price = request.price
+            order_type = {'limit': {'tif': params.get('timeInForce', 'Gtc')}}
+        cloid = params.get('clientOrderId')
+        return {
+            'coin': self.symbol,
+            'is_buy': is_buy,
+            'sz': self.round_size(request.qty),
+            'limit_px': self.round_price(price),
+            'order_type': order_type,
+            'reduce_only': bool(params.get('reduceOnly', False)),
+            'cloid': Cloid.from_str(cloid) if cloid else None,
+        }
+
+    @staticmethod
+    def _statuses(response: dict) -> List:
+        if response.get('status') != 'ok':
+            raise Exception(f"Exchange action failed: {response.get('response')}")
+        data = response['response'].get('data') if isinstance(response['response'], dict) else None
+        return (data or {}).get('statuses', [])
+
+    def _open_order_dict(self, order: dict) -> dict:
+        orig_sz = float(order.get('origSz', order['sz']))
+        sz = float(order['sz'])
+        return {
+            'info': order,
+            'id': str(order['oid']),
+            'clientOrderId': order.get('cloid'),
+            'timestamp': order.get('timestamp'),
+            'symbol': self.get_symbol(),
+            'type': 'limit' if order.get('orderType', 'Limit') == 'Limit' else 'market',
+            'timeInForce': order.get('tif'),
+            'reduceOnly': order.get('reduceOnly', False),
+            'side': self.buy if order['side'] == 'B' else self.sell,
+            'price': float(order['limitPx']),
+            'amount': orig_sz,
+            'filled': orig_sz - sz,
+            'remaining': sz,
+            'status': 'open',
+        }
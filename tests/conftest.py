@@ -5,7 +5,27 @@ from src.generic.cctx_model import Order, Info
 from src.generic.cctx_api import Dex as CctxDex
 # Import local OrderSide type
 from src.generic.algo import OrderSide
-from src.generic.hyperliquid_ws_model import WsOrder
+from src.generic.hyperliquid_ws_model import WsBasicOrder, WsOrder
+
+
+# Mesures de temps ou de mémoire : hors de la suite unitaire, lancées avec --benchmark
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", default=False,
+                     help="lance aussi les tests marqués benchmark (mesures de temps ou de mémoire)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: mesure de performance, lancée seulement avec --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark : lancer avec --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
 
 # Helper to create mock Order objects
 def make_mock_order(price: float, side: OrderSide, qty: float = 0.1) -> Order:
@@ -26,18 +46,18 @@ def make_real_order(price: float, side: str, qty: float = 0.1) -> Order:
         info=Info(
             coin="BTC",
             side=hyperliquid_side,
-            limitPx=str(price),
-            sz=str(qty),
+            limitPx=price,
+            sz=qty,
             oid=f"mock_order_{price}_{side}",
-            timestamp="0",
+            timestamp=0,
             triggerCondition="",
             isTrigger=False,
-            triggerPx="",
+            triggerPx=0.0,
             children=[],
             isPositionTpsl=False,
             reduceOnly=False,
             orderType="limit",
-            origSz=str(qty),
+            origSz=qty,
             tif="",
             cloid=None
         ),
@@ -68,17 +88,17 @@ def make_real_order(price: float, side: str, qty: float = 0.1) -> Order:
         takeProfitPrice=None,
         stopLossPrice=None
     )
-    # Ajout des attributs dynamiques attendus par l'algo
-    order.oid = order.id
-    order.limitPx = order.price
-    order.coin = order.info.coin
-    order.sz = order.info.sz
     return order
 
 def make_real_wsorder(price: float, side: str, qty: float = 0.1) -> WsOrder:
-    ws_order = MagicMock(spec=WsOrder)
-    ws_order.order = make_real_order(price, side, qty)
-    return ws_order
+    # exécution de l'ordre créé par make_real_order (même oid que son id)
+    order = make_real_order(price, side, qty)
+    return WsOrder(
+        order=WsBasicOrder(coin=order.info.coin, side=order.side, limitPx=price, sz=qty, oid=order.id,
+                           timestamp=0, origSz=qty),
+        status='filled',
+        statusTimestamp=0,
+    )
 
 @pytest.fixture
 def mock_dex():
@@ -92,7 +112,9 @@ def mock_dex():
     # Mock order creation methods to use the helper
     dex.create_open_long.side_effect = lambda qty, price: make_real_order(price, 'buy', qty)
     dex.create_close_long.side_effect = lambda qty, price: make_real_order(price, 'sell', qty)
+    dex.create_orders.side_effect = lambda order_requests: [make_real_order(r.price, r.side, r.qty) for r in order_requests]
     dex.cancel_order.return_value = None
+    dex.cancel_orders.return_value = None
     dex.get_open_orders.return_value = []
     return dex
 
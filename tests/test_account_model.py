@@ -0,0 +1,96 @@
+import pytest
+from src.generic.account_model import LocalAccountModel
+from src.generic.cctx_mapper import parse_balance
+from src.generic.hyperliquid_ws_model import WsOrder, WsBasicOrder
+
+
+class FakeClock:
+    """Horloge contrôlée par le test."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_fill(side: str, price: float, qty: float) -> WsOrder:
+    return WsOrder(
+        order=WsBasicOrder(coin="BTC", side=side, limitPx=price, sz=0.0, oid=1, timestamp=0, origSz=qty),
+        status="filled",
+        statusTimestamp=0,
+    )
+
+
+def make_account_data(total: float, szi: float, position_value: float):
+    margin_summary = {"accountValue": total, "totalNtlPos": position_value, "totalRawUsd": 0.0, "totalMarginUsed": 0.0}
+    return parse_balance({
+        "info": {
+            "marginSummary": margin_summary,
+            "crossMarginSummary": margin_summary,
+            "assetPositions": [
+                {"type": "oneWay", "position": {
+                    "coin": "BTC", "szi": str(szi), "positionValue": str(position_value),
+                    "leverage": {"type": "cross", "value": "10"}, "entryPx": "100000.0",
+                    "unrealizedPnl": "0.0", "returnOnEquity": "0.0", "liquidationPx": "0.0",
+                    "marginUsed": "0.0", "maxLeverage": "40",
+                    "cumFunding": {"allTime": "0", "sinceOpen": "0", "sinceChange": "0"},
+                }}
+            ],
+            "crossMaintenanceMarginUsed": "0.0", "withdrawable": str(total), "time": "0",
+        },
+        "timestamp": 0, "datetime": "", "free": {}, "used": {}, "total": {},
+        "USDC": {"total": total, "used": 0.0, "free": total},
+    })
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def account(clock: FakeClock) -> LocalAccountModel:
+    """Modèle réconcilié : 1000 USDC d'equity dont 0.1 BTC à 100000."""
+    account = LocalAccountModel(coin="BTC", leverage=10, reconcile_interval=60, clock=clock)
+    account.reconcile(make_account_data(total=1000, szi=0.1, position_value=10000))
+    return account
+
+
+def test_reconcile_sets_state(account: LocalAccountModel) -> None:
+    """La réconciliation reprend equity, position et prix de marque de l'échange."""
+    assert account.equity == pytest.approx(1000)
+    assert account.position_size == pytest.approx(0.1)
+    assert account.mark_price == pytest.approx(100000)
+    assert account.margin_used == pytest.approx(1000)
+    assert not account.needs_reconcile()
+
+
+def test_fills_update_equity_and_position(account: LocalAccountModel) -> None:
+    """Un achat puis une vente un gap plus haut réalisent le gain du gap."""
+    account.on_fill(make_fill('B', 99000, 0.01))
+    assert account.position_size == pytest.approx(0.11)
+    # la position existante est revalorisée au prix d'exécution
+    assert account.equity == pytest.approx(1000 - 0.1 * 1000)
+
+    account.on_fill(make_fill('A', 100000, 0.01))
+    assert account.position_size == pytest.approx(0.1)
+    assert account.equity == pytest.approx(1000 + 0.01 * 1000)
+
+
+def test_reconcile_after_interval(account: LocalAccountModel, clock: FakeClock) -> None:
+    """Une réconciliation est demandée une fois l'intervalle écoulé."""
+    clock.now = 59
+    assert not account.needs_reconcile()
+    clock.now = 60
+    assert account.needs_reconcile()
+
+
+def test_invalid_fill_marks_drift(account: LocalAccountModel) -> None:
+    """Une exécution illisible ou une position négative force une réconciliation."""
+    account.on_fill(make_fill('B', 99000, 0))
+    assert account.needs_reconcile()
+
+    account.reconcile(make_account_data(total=1000, szi=0.1, position_value=10000))
+    account.on_fill(make_fill('A', 100000, 0.2))
+    assert account.needs_reconcile()
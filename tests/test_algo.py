@@ -47,7 +47,7 @@ def mock_data_service() -> MagicMock:
 @pytest.fixture
 def algo(mock_dex: MagicMock, mock_data_service: MagicMock) -> Algo:
     """Create an Algo instance with mocked dependencies for testing."""
-    algo = Algo(dex=mock_dex, data_service=mock_data_service)
+    algo = Algo(dex=mock_dex, gap=1000, session_id="test", data_service=mock_data_service)
     # Force le gap à 1000 pour le test
     algo.GAPS = [1000]
     # Patch create_open_long and create_close_long to return real orders
@@ -57,6 +57,12 @@ def algo(mock_dex: MagicMock, mock_data_service: MagicMock) -> Algo:
         return make_real_order(price, 'sell', qty)
     mock_dex.create_open_long.side_effect = _create_open_long
     mock_dex.create_close_long.side_effect = _create_close_long
+    def _create_orders(order_requests):
+        return [make_real_order(r.price, r.side, r.qty) for r in order_requests]
+    mock_dex.create_orders.side_effect = _create_orders
+    def _modify_orders(order_ids, order_requests):
+        return [make_real_order(r.price, r.side, r.qty) for r in order_requests]
+    mock_dex.modify_orders.side_effect = _modify_orders
     algo.current_gap_idx = 0
     return algo
 
@@ -282,34 +288,131 @@ def test_scenario_open_close_long_sequence(algo: Algo, mock_dex) -> None:
     Scénario :
     - Prix initial 100000
     - OL à 99k, CL à 101k
-    - Descend à 99k : CL exécuté, OL à 98k et CL à 100k créés
-    - Remonte à 100k : OL exécuté, il doit rester OL à 99k et CL à 101k
+    - Descend à 99k : OL exécuté, OL à 98k et CL à 100k créés
+    - Remonte à 100k : CL exécuté, l'OL à 98k est re-pricé à 99k ; il doit rester OL à 99k et CL à 101k
     """
     gap = 1000
-    initial_price = 100000
     algo.GAPS = [gap]
     algo.current_gap_idx = 0
 
     # 1. État initial
-    ol_99k = make_real_order(99000, 'buy')
-    cl_101k = make_real_order(101000, 'sell')
-    algo.previous_orders = [ol_99k, cl_101k]
-
-    # 2. Descend à 99k (exécution du CL à 99k)
-    ws_cl_99k = make_real_wsorder(99000, 'sell')
-    algo.on_executed_order(wsOrder=ws_cl_99k)
-    # On doit avoir OL à 98k et CL à 100k en plus
-    assert any(o for o in algo.previous_orders if Algo.is_same_price(o.price, 98000) and algo.isBuyOrder(o))
-    assert any(o for o in algo.previous_orders if Algo.is_same_price(o.price, 100000) and algo.isSellOrder(o))
-
-    # 3. Remonte à 100k (exécution de l'OL à 100k)
-    ws_ol_100k = make_real_wsorder(100000, 'buy')
-    algo.on_executed_order(wsOrder=ws_ol_100k)
-    # Il doit rester OL à 99k et CL à 101k
-    ol_99k_exists = any(o for o in algo.previous_orders if Algo.is_same_price(o.price, 99000) and algo.isBuyOrder(o))
-    cl_101k_exists = any(o for o in algo.previous_orders if Algo.is_same_price(o.price, 101000) and algo.isSellOrder(o))
-    assert ol_99k_exists, "Il doit rester un OL à 99k"
-    assert cl_101k_exists, "Il doit rester un CL à 101k"
-    # Il ne doit pas y avoir de doublons
-    assert sum(1 for o in algo.previous_orders if Algo.is_same_price(o.price, 99000) and algo.isBuyOrder(o)) == 1
-    assert sum(1 for o in algo.previous_orders if Algo.is_same_price(o.price, 101000) and algo.isSellOrder(o)) == 1
\ No newline at end of file
+    algo.previous_orders = [make_real_order(99000, 'buy'), make_real_order(101000, 'sell')]
+
+    # 2. Descend à 99k (exécution de l'OL à 99k)
+    algo.on_executed_order(wsOrder=make_real_wsorder(99000, 'buy'))
+    # On doit avoir OL à 98k et CL à 100k, en plus du CL à 101k
+    assert sorted((o.side, o.price) for o in algo.previous_orders) == [('A', 100000), ('A', 101000), ('B', 98000)]
+
+    # 3. Remonte à 100k (exécution du CL à 100k)
+    algo.on_executed_order(wsOrder=make_real_wsorder(100000, 'sell'))
+    # Il doit rester OL à 99k et CL à 101k, sans doublon
+    assert sorted((o.side, o.price) for o in algo.previous_orders) == [('A', 101000), ('B', 99000)]
+
+
+def test_fill_reaction_is_sent_as_one_batch(algo: Algo, mock_dex) -> None:
+    """Une exécution envoie au plus un batch de modification, un de création et un d'annulation."""
+    gap = algo.get_gap()
+    initial_price = 100000
+    algo.previous_orders = [
+        make_real_order(initial_price - 2 * gap, 'buy'),
+        make_real_order(initial_price - gap, 'buy'),
+        make_real_order(initial_price + gap, 'sell'),
+    ]
+
+    algo.on_executed_order(wsOrder=make_real_wsorder(initial_price + gap, 'sell'))
+
+    # le nouvel open long re-price l'open long le plus haut au lieu d'être créé
+    mock_dex.modify_orders.assert_called_once()
+    order_ids, requests = mock_dex.modify_orders.call_args.args
+    assert order_ids == [f"mock_order_{initial_price - gap}_buy"]
+    assert [(r.side, r.price) for r in requests] == [('buy', initial_price)]
+    assert mock_dex.create_orders.call_count == 1
+    requests = mock_dex.create_orders.call_args.args[0]
+    assert [(r.side, r.price) for r in requests] == [('sell', initial_price + 2 * gap)]
+    mock_dex.cancel_orders.assert_called_once_with([f"mock_order_{initial_price - 2 * gap}_buy"])
+    mock_dex.create_open_long.assert_not_called()
+    mock_dex.create_close_long.assert_not_called()
+    mock_dex.cancel_order.assert_not_called()
+    check_order(algo, initial_price, 'buy')
+    assert len(algo.previous_orders) == 2
+
+
+def test_grid_shift_is_a_single_modify(algo: Algo, mock_dex) -> None:
+    """Re-pricing seul : une action (modification) au lieu d'une création et d'une annulation."""
+    gap = algo.get_gap()
+    initial_price = 100000
+    algo.previous_orders = [
+        make_real_order(initial_price - gap, 'buy'),
+        make_real_order(initial_price + gap, 'sell'),
+        make_real_order(initial_price + 2 * gap, 'sell'),
+    ]
+
+    algo.on_executed_order(wsOrder=make_real_wsorder(initial_price + gap, 'sell'))
+
+    mock_dex.modify_orders.assert_called_once()
+    mock_dex.create_orders.assert_not_called()
+    mock_dex.cancel_orders.assert_not_called()
+    check_order(algo, initial_price, 'buy')
+    check_order(algo, initial_price + 2 * gap, 'sell')
+
+
+def test_rejected_modify_falls_back_to_create(algo: Algo, mock_dex) -> None:
+    gap = algo.get_gap()
+    initial_price = 100000
+    algo.previous_orders = [make_real_order(initial_price - gap, 'buy'),
+                            make_real_order(initial_price + 2 * gap, 'sell')]
+    rejected = make_real_order(initial_price, 'buy')
+    rejected.id = ""
+    mock_dex.modify_orders.side_effect = None
+    mock_dex.modify_orders.return_value = [rejected]
+
+    algo.on_executed_order(wsOrder=make_real_wsorder(initial_price + gap, 'sell'))
+
+    requests = mock_dex.create_orders.call_args.args[0]
+    assert [(r.side, r.price) for r in requests] == [('buy', initial_price)]
+    mock_dex.cancel_orders.assert_called_once_with([f"mock_order_{initial_price - gap}_buy"])
+    check_order(algo, initial_price, 'buy')
+
+
+def test_failed_modify_falls_back_to_create(algo: Algo, mock_dex) -> None:
+    """Une modification qui lève n'interrompt pas la réaction : l'open long est créé, le close long aussi."""
+    gap = algo.get_gap()
+    initial_price = 100000
+    algo.previous_orders = [make_real_order(initial_price - gap, 'buy')]
+    mock_dex.modify_orders.side_effect = Exception("order was filled")
+
+    algo.on_executed_order(wsOrder=make_real_wsorder(initial_price + gap, 'sell'))
+
+    requests = mock_dex.create_orders.call_args.args[0]
+    assert [(r.side, r.price) for r in requests] == [('buy', initial_price), ('sell', initial_price + 2 * gap)]
+    mock_dex.cancel_orders.assert_called_once_with([f"mock_order_{initial_price - gap}_buy"])
+    check_order(algo, initial_price, 'buy')
+
+
+def test_refill_market_buy_is_in_the_same_batch(algo: Algo, mock_dex) -> None:
+    """Le rachat au marché (trop peu de coins) part dans le même batch que la grille."""
+    algo.coin_manager.setInitialCoinCount(algo.minNbCoins + 1)
+    algo.previous_orders = [make_real_order(99000, 'buy'), make_real_order(101000, 'sell')]
+
+    algo.on_executed_order(wsOrder=make_real_wsorder(101000, 'sell'))
+
+    assert mock_dex.create_orders.call_count == 1
+    requests = mock_dex.create_orders.call_args.args[0]
+    # l'open long est re-pricé, le close long et le rachat partent dans le même batch
+    assert [(r.order_type, r.side) for r in requests] == [('limit', 'sell'), ('market', 'buy')]
+    mock_dex.modify_orders.assert_called_once()
+    mock_dex.buy_at_market_price.assert_not_called()
+    # l'ordre au marché n'est pas suivi comme ordre ouvert
+    assert len(algo.previous_orders) == 2
+
+
+def test_account_equity_is_not_fetched_on_every_fill(algo: Algo, mock_dex) -> None:
+    """L'equity est lue sur le modèle local : une seule lecture du solde pour plusieurs exécutions."""
+    algo.previous_orders = [make_real_order(99000, 'buy'), make_real_order(101000, 'sell')]
+    for price, side in [(101000, 'sell'), (100000, 'buy')]:
+        ws_order = make_real_wsorder(price, side)
+        ws_order.order.origSz = 0.1
+        ws_order.order.sz = 0.0
+        algo.on_executed_order(wsOrder=ws_order)
+
+    assert mock_dex.get_full_account_data.call_count == 1
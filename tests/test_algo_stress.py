@@ -0,0 +1,95 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from src.backtesting.grid_backtester import FILL_DTYPE, GridParams, OhlcData, backtest_grid
+from src.data.null_data import NullData
+from src.generic.algo import Algo
+from src.generic.observer import HyperliquidObserver
+from src.generic.simulated_dex import SimulatedDex
+
+NB_INSTANCES = 500
+# suite unitaire : chaque combinaison de gap (3) et de diviseur de quantité (5)
+NB_CROSS_TALK_INSTANCES = 15
+NB_TICKS = 200
+GAPS = [500, 1000, 1500]
+
+
+class Tenant:
+    """Un compte : son échange simulé, son Algo, son observer et les exécutions reçues."""
+
+    def __init__(self, index: int):
+        steps = np.random.default_rng(index).choice([-250.0, 250.0], size=NB_TICKS)
+        self.prices = 100000 + np.concatenate([[0], np.cumsum(steps)])
+        self.params = GridParams(gap=GAPS[index % len(GAPS)], qty_divider=6 + index % 5, max_leverage=10,
+                                 maker_fee=0, taker_fee=0)
+        self.dex = SimulatedDex(initial_balance=self.params.initial_balance, initial_price=self.prices[0],
+                                leverage=self.params.max_leverage, maker_fee=0, taker_fee=0)
+        self.algo = Algo(dex=self.dex, gap=self.params.gap, session_id=f"tenant-{index}", data_service=NullData(),
+                         max_leverage=self.params.max_leverage)
+        self.algo.qtyDivider = self.params.qty_divider
+        self.observer = HyperliquidObserver(address=f"0x{index}", observer_id=f"tenant-{index}",
+                                            websocket_url=None, algo=self.algo, process_inline=True)
+        self.fills = []
+        self.tick = 0
+        self.dex.subscribe(self.record)
+        self.dex.subscribe(self.observer.handle_order_updates)
+
+    def record(self, updates):
+        for update in updates:
+            side = 1 if update.order.side == 'B' else -1
+            self.fills.append((self.tick, side, update.order.limitPx, float(update.order.origSz), False))
+
+    def on_tick(self, i: int):
+        self.tick = i
+        self.dex.on_price(self.prices[i])
+
+
+def run_tenants(nb_instances: int) -> list:
+    """Algo entrelacés tick par tick dans le même process"""
+    tenants = [Tenant(i) for i in range(nb_instances)]
+    for tenant in tenants:
+        tenant.algo.setup_initial_positions()
+    for i in range(NB_TICKS + 1):
+        for tenant in tenants:
+            tenant.on_tick(i)
+    return tenants
+
+
+def assert_no_cross_talk(tenants: list):
+    """Chaque Algo produit exactement les exécutions du backtest de son propre compte"""
+    for tenant in tenants:
+        expected = backtest_grid(OhlcData.from_prices(tenant.prices), tenant.params)
+        fills = np.array(tenant.fills, dtype=FILL_DTYPE)
+        assert len(fills) == len(expected.fills)
+        assert np.array_equal(fills['index'], expected.fills['index'])
+        assert np.allclose(fills['qty'], expected.fills['qty'])
+        assert tenant.algo.coin_manager.count == expected_coin_count(tenant, expected)
+        assert {o.id for o in tenant.algo.previous_orders} == {o.id for o in tenant.dex.get_open_orders()}
+
+
+def test_algos_share_a_process_without_cross_talk() -> None:
+    """Quelques Algo entrelacés (un par gap et par diviseur de quantité) restent indépendants."""
+    assert_no_cross_talk(run_tenants(NB_CROSS_TALK_INSTANCES))
+
+
+@pytest.mark.benchmark
+def test_many_algos_share_a_process_without_cross_talk() -> None:
+    """500 Algo dans le même process : mémoire par instance, puis mêmes exécutions que leurs backtests."""
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tenants = run_tenants(NB_INSTANCES)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_instance = (current - baseline) / NB_INSTANCES
+    assert per_instance < 256 * 1024, \
+        f"{NB_INSTANCES} instances, {NB_TICKS} ticks: {per_instance / 1024:.1f} KiB per instance " \
+        f"(algo + simulated exchange + observer)"
+    assert_no_cross_talk(tenants)
+
+
+def expected_coin_count(tenant: Tenant, expected) -> int:
+    """nbCoins + achats - ventes, les achats au marché comptant comme des open longs exécutés"""
+    sides = expected.fills['side']
+    return tenant.algo.nbCoins + int(np.count_nonzero(sides > 0)) - int(np.count_nonzero(sides < 0))
@@ -163,4 +163,48 @@ class TestErrorHandling:
         """Test behavior when environment variables are missing."""
         with patch.dict(os.environ, {}, clear=True):
             response = client.get("/observers", headers={"Authorization": "Basic dGVzdDp0ZXN0"})
-            assert response.status_code == 500 
\ No newline at end of file
+            assert response.status_code == 500 
+
+class TestObserverServiceClientPool:
+    """Pooled exchange clients are given back when an observer goes away."""
+
+    @patch('src.api.service.SQLiteDataService')
+    @patch('src.api.service.HyperliquidObserver')
+    @patch('src.api.service.Algo')
+    def test_deleted_observer_releases_its_pooled_client(
+        self,
+        mock_algo: MagicMock,
+        mock_observer: MagicMock,
+        mock_data_service: MagicMock,
+        tmp_path
+    ) -> None:
+        """Start, delete, restart: the delete empties the pool and the restart gets a fresh client."""
+        from src.api.service import ObserverService
+        from src.generic.client_pool import ExchangeClientPool
+        from tests.test_client_pool import make_cache
+
+        service = ObserverService()
+        pool = service._exchange_client_pool = ExchangeClientPool(market_metadata=make_cache(tmp_path))
+        dexes = []
+        mock_algo.side_effect = lambda dex, **kwargs: dexes.append(dex) or MagicMock(dex=dex)
+        address, api_key = '0x' + 'a' * 40, '0x' + '1' * 64
+
+        with patch('src.api.service.config.client_pool', True), patch('src.api.service.config.rate_limit', False), \
+                patch('src.api.service.config.dex_cache', False), patch('src.api.service.config.dex_record_dir', None):
+            observer_id = service.start_observer(address, True, 500, api_key, dex_backend="sync")
+            assert pool.stats().clients == 1
+
+            assert service.delete_observer(observer_id)
+            assert pool.stats().clients == 0
+            assert pool.stats().references == 0
+
+            restarted_id = service.start_observer(address, True, 500, api_key, dex_backend="sync")
+            assert pool.stats().clients == 1
+            assert dexes[1] is not dexes[0]
+            assert service.delete_observer(restarted_id)
+
+            # a failed start gives its client back too
+            mock_observer.side_effect = RuntimeError("websocket unavailable")
+            with pytest.raises(RuntimeError):
+                service.start_observer('0x' + 'b' * 40, True, 500, api_key, dex_backend="sync")
+            assert pool.stats().clients == 0
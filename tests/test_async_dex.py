@@ -0,0 +1,89 @@
+import asyncio
+import dataclasses
+import threading
+
+import pytest
+from src.generic.async_dex import AsyncDex, AsyncDexBridge, AsyncDexRuntime
+from src.generic.cctx_api import DexConfig, OrderRequest
+from tests.test_account_model import make_account_data
+
+DEX_CONFIG = DexConfig(symbol="BTC", marginCoin="USDC", isTest=True, walletAddress="0x0", apiKey="0x" + "1" * 64)
+
+
+class FakeAsyncExchange:
+    """Client ccxt asynchrone factice : chaque appel dure `delay` et le nombre d'appels simultanés est mesuré."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.loop_threads = set()
+        self.created = []
+
+    async def _call(self, result):
+        self.loop_threads.add(threading.current_thread().name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return result
+
+    async def fetch_balance(self):
+        balance = make_account_data(total=1000, szi=0.0, position_value=0.0)
+        return await self._call(dataclasses.asdict(balance))
+
+    async def fetch_ticker(self, symbol):
+        return await self._call({'last': 100000.0})
+
+    async def create_orders(self, orders):
+        self.created.append(orders)
+        return await self._call([{'id': str(i), 'info': {}, 'status': 'open'} for i, _ in enumerate(orders)])
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def runtime():
+    runtime = AsyncDexRuntime(connection_limit=10)
+    yield runtime
+    runtime.close()
+
+
+def test_dexes_share_the_runtime_session(runtime: AsyncDexRuntime) -> None:
+    """Les clients ccxt utilisent la session aiohttp partagée, sans en être propriétaires."""
+    first = AsyncDex(DEX_CONFIG, session=runtime.session)
+    second = AsyncDex(DEX_CONFIG, session=runtime.session)
+
+    assert first.dex.session is runtime.session is second.dex.session
+    assert not first.dex.own_session
+    runtime.run(first.close())
+    assert not runtime.session.closed
+    assert runtime.session.connector.limit == 10
+
+
+def test_account_and_price_are_read_concurrently(runtime: AsyncDexRuntime) -> None:
+    """Le compte et le prix partent en parallèle sur la boucle partagée."""
+    async_dex = AsyncDex(DEX_CONFIG, session=runtime.session)
+    fake = async_dex.dex = FakeAsyncExchange()
+    bridge = AsyncDexBridge(async_dex, runtime)
+
+    account_data, price = bridge.get_account_data_and_price()
+
+    assert price == 100000.0
+    assert account_data.USDC.total == 1000
+    assert fake.max_in_flight == 2
+    assert fake.loop_threads == {"AsyncDexRuntime"}
+
+
+def test_bridge_creates_orders_in_one_batch(runtime: AsyncDexRuntime) -> None:
+    async_dex = AsyncDex(DEX_CONFIG, session=runtime.session)
+    fake = async_dex.dex = FakeAsyncExchange(delay=0)
+    bridge = AsyncDexBridge(async_dex, runtime)
+
+    orders = bridge.create_orders([OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+                                   OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000)])
+
+    assert len(fake.created) == 1
+    assert [(o.id, o.side, o.price) for o in orders] == [("0", 'buy', 99000), ("1", 'sell', 101000)]
+    assert bridge.symbol == "BTC"
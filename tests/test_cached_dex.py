@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+from src.generic.cached_dex import ACCOUNT, OPEN_ORDERS, PRICE, CachedDex
+from src.generic.hyperliquid_ws_model import WsOrder, WsBasicOrder
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingDex:
+    """Dex factice qui compte les appels réseau."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = {}
+        self.price = 100000.0
+        self.symbol = "BTC"
+
+    def _call(self, name, value):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        time.sleep(self.delay)
+        return value
+
+    def get_current_price(self) -> float:
+        return self._call('price', self.price)
+
+    def get_full_account_data(self):
+        return self._call('account', {'equity': 1000})
+
+    def get_account_data_and_price(self):
+        return self._call('account_and_price', ({'equity': 1000}, self.price))
+
+    def get_open_orders(self):
+        return self._call('open_orders', ['order'])
+
+    def cancel_order(self, order_id: str):
+        return self._call('cancel', None)
+
+
+def make_update(status: str) -> WsOrder:
+    return WsOrder(order=WsBasicOrder(coin="BTC", side="B", limitPx=99000, sz=0.0, oid=1, timestamp=0,
+                                      origSz=0.01),
+                   status=status, statusTimestamp=0)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_reads_are_served_until_ttl(clock: FakeClock) -> None:
+    dex = CountingDex()
+    cached = CachedDex(dex, ttls={PRICE: 1.0}, clock=clock)
+
+    assert cached.get_current_price() == 100000.0
+    dex.price = 101000.0
+    clock.now = 0.9
+    assert cached.get_current_price() == 100000.0
+    clock.now = 1.0
+    assert cached.get_current_price() == 101000.0
+
+    assert dex.calls['price'] == 2
+    stats = cached.cache_stats()[PRICE]
+    assert (stats.hits, stats.misses) == (1, 2)
+    assert cached.symbol == "BTC"
+
+
+def test_fills_and_writes_invalidate_account_and_orders(clock: FakeClock) -> None:
+    dex = CountingDex()
+    cached = CachedDex(dex, clock=clock)
+    cached.get_full_account_data()
+    cached.get_open_orders()
+    cached.get_current_price()
+
+    cached.on_order_update(make_update('filled'))
+    cached.get_full_account_data()
+    cached.get_open_orders()
+    cached.get_current_price()
+    assert (dex.calls['account'], dex.calls['open_orders'], dex.calls['price']) == (2, 2, 1)
+
+    cached.cancel_order("1")
+    cached.get_open_orders()
+    assert dex.calls['open_orders'] == 3
+    assert cached.cache_stats()[OPEN_ORDERS].invalidations == 2
+
+
+def test_account_and_price_are_read_together(clock: FakeClock) -> None:
+    """Sans entrée fraîche, compte et prix viennent d'un seul appel et remplissent les deux entrées."""
+    dex = CountingDex()
+    cached = CachedDex(dex, clock=clock)
+
+    assert cached.get_account_data_and_price() == ({'equity': 1000}, 100000.0)
+    assert cached.get_account_data_and_price() == ({'equity': 1000}, 100000.0)
+    assert dex.calls == {'account_and_price': 1}
+    assert cached.cache_stats()[ACCOUNT].hits == 1
+
+
+def test_concurrent_reads_share_one_call() -> None:
+    """Single-flight : les lectures simultanées d'une entrée attendent le même appel réseau."""
+    dex = CountingDex(delay=0.1)
+    cached = CachedDex(dex)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached.get_open_orders())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert dex.calls['open_orders'] == 1
+    assert results == [['order']] * 8
+    stats = cached.cache_stats()[OPEN_ORDERS]
+    assert (stats.misses, stats.shared) == (1, 7)
+
+
+def test_invalidation_during_load_is_not_cached(clock: FakeClock) -> None:
+    """Une lecture partie avant une exécution n'est pas gardée en cache."""
+    dex = CountingDex()
+    cached = CachedDex(dex, clock=clock)
+    original = dex.get_open_orders
+
+    def get_open_orders_then_fill():
+        result = original()
+        cached.on_order_update(make_update('filled'))
+        return result
+
+    dex.get_open_orders = get_open_orders_then_fill
+    cached.get_open_orders()
+    dex.get_open_orders = original
+    cached.get_open_orders()
+    assert dex.calls['open_orders'] == 2
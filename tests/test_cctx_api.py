@@ -0,0 +1,167 @@
+import json
+
+import ccxt
+import pytest
+from unittest.mock import MagicMock
+from src.generic.cctx_api import Dex, DexConfig, OrderRequest
+from src.generic.hyperliquid_ws_model import WsOrder, WsBasicOrder
+
+
+@pytest.fixture
+def dex() -> Dex:
+    """Dex dont le client ccxt est remplacé par un mock."""
+    dex = Dex(DexConfig(symbol='BTC', marginCoin='USDC', isTest=True, walletAddress='0x0', apiKey='0x0'))
+    dex.dex = MagicMock()
+    return dex
+
+
+def test_create_orders_completes_creation_response(dex: Dex) -> None:
+    """Les ordres créés en batch sont complétés avec les paramètres des requêtes, sans fetch_order."""
+    dex.dex.create_orders.return_value = [
+        {'id': '1', 'info': {'resting': {'oid': 1}}, 'status': 'open', 'side': None, 'price': None, 'amount': None},
+        {'id': '2', 'info': {'resting': {'oid': 2}}, 'status': 'open', 'side': None, 'price': None, 'amount': None},
+    ]
+
+    orders = dex.create_orders([
+        OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+        OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000),
+    ])
+
+    assert dex.dex.create_orders.call_count == 1
+    dex.dex.fetch_order.assert_not_called()
+    assert [(o.id, o.side, o.price, o.amount) for o in orders] == [
+        ('1', 'buy', 99000.0, 0.01),
+        ('2', 'sell', 101000.0, 0.01),
+    ]
+    assert orders[0].symbol == 'BTC/USDC:USDC'
+
+
+def test_create_orders_keeps_rejected_orders_aligned(dex: Dex) -> None:
+    """Un ordre rejeté garde sa position dans la liste, avec un id vide."""
+    dex.dex.create_orders.return_value = [
+        {'id': None, 'info': {'error': 'Insufficient margin'}, 'status': 'rejected'},
+        {'id': '2', 'info': {'resting': {'oid': 2}}, 'status': 'open'},
+    ]
+
+    orders = dex.create_orders([
+        OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+        OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000),
+    ])
+
+    assert orders[0].id == ''
+    assert orders[0].status == 'rejected'
+    assert orders[1].id == '2'
+
+
+def ccxt_batch_error(statuses: list) -> ccxt.BaseError:
+    """Erreur levée par ccxt (handle_errors) sur une réponse d'échange dont un statut porte une erreur"""
+    response = {'status': 'ok', 'response': {'type': 'order', 'data': {'statuses': statuses}}}
+    with pytest.raises(ccxt.BaseError) as error:
+        ccxt.hyperliquid().handle_errors(200, 'OK', 'https://api/exchange', 'POST', {}, json.dumps(response),
+                                         response, {}, '')
+    return error.value
+
+
+def test_create_orders_recovers_a_batch_rejected_by_ccxt(dex: Dex) -> None:
+    """ccxt lève pour tout le batch dès qu'un ordre est rejeté : les ordres placés restent connus."""
+    dex.dex.create_orders.side_effect = ccxt_batch_error([
+        {'resting': {'oid': 1}},
+        {'error': 'Insufficient margin to place order. asset=0'},
+        {'filled': {'oid': 3, 'totalSz': '0.02', 'avgPx': '100010.0'}},
+    ])
+
+    orders = dex.create_orders([
+        OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000),
+        OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+        OrderRequest(order_type='market', side='buy', qty=0.02, price=100000),
+    ])
+
+    assert [(o.id, o.status, o.side, o.price) for o in orders] == [
+        ('1', 'open', 'sell', 101000.0), ('', 'rejected', '', 0.0), ('3', 'closed', 'buy', 100000.0)]
+    dex.dex.fetch_open_orders.assert_not_called()
+
+
+def test_create_orders_reconciles_an_unreadable_failure(dex: Dex) -> None:
+    """Sans réponse lisible (erreur réseau), les ordres au repos disent ce qui a été placé."""
+    dex.dex.create_orders.side_effect = ccxt.RequestTimeout('timeout')
+    dex.dex.fetch_open_orders.return_value = [
+        {'id': '7', 'side': 'buy', 'price': 98000.0, 'amount': 0.01, 'status': 'open'},
+        {'id': '1', 'side': 'buy', 'price': 99000.0, 'amount': 0.01, 'status': 'open'},
+    ]
+
+    orders = dex.create_orders([
+        OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+        OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000),
+    ])
+
+    assert [(o.id, o.status) for o in orders] == [('1', 'open'), ('', 'rejected')]
+
+    dex.dex.fetch_open_orders.side_effect = ccxt.RequestTimeout('still down')
+    with pytest.raises(ccxt.RequestTimeout, match='timeout'):
+        dex.create_orders([OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000)])
+
+
+def test_modify_of_a_vanished_order_is_rejected(dex: Dex) -> None:
+    """Ordre exécuté ou annulé pendant la modification : ccxt lève, la modification est rejetée."""
+    dex.dex.edit_orders.side_effect = ccxt.OrderNotFound('hyperliquid {"status":"unknownOid"}')
+    dex.dex.fetch_open_orders.return_value = []
+
+    [order] = dex.modify_orders(['1'], [OrderRequest(order_type='limit', side='buy', qty=0.02, price=98500)])
+
+    assert (order.id, order.status) == ('', 'rejected')
+
+
+def test_cancel_orders_is_one_call(dex: Dex) -> None:
+    """Les annulations sont envoyées en une seule action."""
+    dex.cancel_orders(['1', '2'])
+    dex.dex.cancel_orders.assert_called_once_with(['1', '2'], symbol='BTC/USDC:USDC')
+    dex.cancel_orders([])
+    assert dex.dex.cancel_orders.call_count == 1
+
+
+def test_modify_orders_is_one_edit_call(dex: Dex) -> None:
+    """Les modifications sont envoyées en une seule action, complétées avec les requêtes."""
+    dex.dex.edit_orders.return_value = [{'id': '1', 'info': {'resting': {'oid': 1}}, 'status': 'open'}]
+
+    [order] = dex.modify_orders(['1'], [OrderRequest(order_type='limit', side='buy', qty=0.02, price=98500)])
+
+    [edits] = dex.dex.edit_orders.call_args.args
+    assert edits == [{'id': '1', 'symbol': 'BTC/USDC:USDC', 'type': 'limit', 'side': 'buy', 'amount': 0.02,
+                      'price': 98500, 'params': {}}]
+    assert (order.id, order.price, order.amount) == ('1', 98500.0, 0.02)
+    assert dex.modify_orders([], []) == []
+
+
+def test_trusted_creation_skips_fetch_order(dex: Dex) -> None:
+    """En mode confiance, l'ordre unitaire vient de la réponse de création et porte un client order id."""
+    dex.trust_creation_response = True
+    dex.dex.create_order.return_value = {'id': '7', 'info': {'resting': {'oid': 7}}, 'status': 'open'}
+
+    order = dex.create_open_long(0.01, 99000)
+
+    dex.dex.fetch_order.assert_not_called()
+    params = dex.dex.create_order.call_args.kwargs.get('params') or dex.dex.create_order.call_args.args[-1]
+    assert params['clientOrderId'].startswith('0x') and len(params['clientOrderId']) == 34
+    assert (order.id, order.side, order.price, order.amount) == ('7', 'buy', 99000.0, 0.01)
+    assert order.clientOrderId == params['clientOrderId']
+
+
+def test_order_update_completes_trusted_order(dex: Dex) -> None:
+    """Le premier message orderUpdates portant le cloid complète l'ordre retourné à la création."""
+    dex.trust_creation_response = True
+    dex.dex.create_orders.return_value = [{'id': '8', 'info': {'resting': {'oid': 8}}, 'status': 'open'},
+                                          {'id': '9', 'info': {'resting': {'oid': 9}}, 'status': 'open'}]
+    orders = dex.create_orders([OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+                                OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000)])
+    cloids = [r['params']['clientOrderId'] for r in dex.dex.create_orders.call_args.args[0]]
+    assert len(set(cloids)) == 2
+
+    update = WsOrder(order=WsBasicOrder(coin='BTC', side='B', limitPx=99000, sz=0.0, oid=8, timestamp=1700,
+                                        origSz=0.01, cloid=cloids[0]),
+                     status='filled', statusTimestamp=1800)
+    assert dex.on_order_update(update) is orders[0]
+    assert (orders[0].status, orders[0].remaining, orders[0].timestamp) == ('closed', 0.0, 1700)
+    assert orders[0].info.cloid == cloids[0]
+    # un cloid déjà consommé ou inconnu est ignoré
+    assert dex.on_order_update(update) is None
+    assert orders[1].status == 'open'
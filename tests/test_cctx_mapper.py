@@ -1,7 +1,16 @@
+import copy
+import dataclasses
+import timeit
+
 import pytest
-from src.generic.cctx_mapper import parse_order
+from src.generic import cctx_mapper
+from src.generic.cctx_balance_model import AccountData
+from src.generic.cctx_mapper import parse_balance, parse_order
 from src.generic.cctx_model import Order
+from src.generic.hyperliquid_ws_model import WsMessage, WsOrder
 from dacite.config import Config
+from dacite.exceptions import WrongTypeError
+from tests.conftest import make_real_order
 import numbers
 
 # Helper pour générer un dict d'ordre minimal
@@ -48,8 +57,8 @@ def test_parse_order_full():
     assert order.id == "order_1"
     assert order.price == 100.0
     assert order.info.coin == "BTC"
-    assert order.info.limitPx == "100.0"
-    assert order.info.sz == "0.1"
+    assert order.info.limitPx == 100.0
+    assert order.info.sz == 0.1
 
 
 def test_parse_order_missing_fields():
@@ -71,9 +80,9 @@ def test_parse_order_null_values():
 def test_parse_order_unexpected_types():
     data = minimal_order_dict()
     data["info"]["sz"] = "not_a_float"
-    order = parse_order(data)
-    # Si le champ est typé str dans Info, la valeur brute est conservée
-    assert order.info.sz == "not_a_float"
+    # taille illisible : erreur plutôt qu'une taille nulle (ordre vu comme entièrement exécuté)
+    with pytest.raises(ValueError):
+        parse_order(data)
 
 
 def _create_config():
@@ -117,8 +126,8 @@ def test_parse_order_real_api_data():
     assert order.id == "33186578567"
     assert order.price == 50000.0
     assert order.info.coin == "BTC"
-    assert order.info.limitPx == "50000.0"
-    assert order.info.sz == "0.001"
+    assert order.info.limitPx == 50000.0
+    assert order.info.sz == 0.001
     assert isinstance(order.info.children, list)
     assert len(order.info.children) == 0
 
@@ -256,8 +265,8 @@ def test_parse_order_ccxt_structure():
     # Vérifications des champs info
     assert order.info.coin == 'BTC'
     assert order.info.side == 'A'
-    assert order.info.limitPx == '50000.0'
-    assert order.info.sz == '0.001'
+    assert order.info.limitPx == 50000.0
+    assert order.info.sz == 0.001
     assert order.info.oid == '33187108569'
     assert isinstance(order.info.children, list)
     assert len(order.info.children) == 0 
@@ -281,4 +290,164 @@ def test_parse_order_with_missing_id():
     assert order.symbol == 'BTC/USDC:USDC'
     assert order.side == 'buy'
     assert order.price == 50000.0
-    assert order.amount == 0.001 
\ No newline at end of file
+    assert order.amount == 0.001 
+
+COMPLETE_ORDER = dataclasses.asdict(make_real_order(100.0, 'buy'))
+WRONG_TYPED_ORDER = {**COMPLETE_ORDER, 'price': '101.5', 'amount': None, 'clientOrderId': 7,
+                     'info': {**COMPLETE_ORDER['info'], 'sz': 3, 'limitPx': None, 'children': 'not a list'}}
+
+BALANCE = {
+    'info': {
+        'marginSummary': {'accountValue': '1000.0', 'totalNtlPos': '500.0', 'totalRawUsd': '500.0', 'totalMarginUsed': '50.0'},
+        'crossMarginSummary': {'accountValue': '1000.0', 'totalNtlPos': '500.0', 'totalRawUsd': '500.0', 'totalMarginUsed': '50.0'},
+        'crossMaintenanceMarginUsed': '5.0', 'withdrawable': '900.0', 'time': '1705315800000',
+        'assetPositions': [{'type': 'oneWay', 'position': {
+            'coin': 'BTC', 'szi': '0.005', 'leverage': {'type': 'cross', 'value': '40'}, 'entryPx': '100000.0',
+            'positionValue': '500.0', 'unrealizedPnl': '0.0', 'returnOnEquity': '0.0', 'liquidationPx': None,
+            'marginUsed': '12.5', 'maxLeverage': '40', 'cumFunding': {'allTime': '0', 'sinceOpen': '0', 'sinceChange': '0'},
+        }}],
+    },
+    'USDC': {'total': 1000.0, 'used': 50.0, 'free': 950.0},
+    'timestamp': 1705315800000, 'datetime': '2024-01-15T10:30:00.000Z',
+    'free': {'USDC': 950.0}, 'used': {'USDC': 50.0}, 'total': {'USDC': 1000.0},
+}
+
+
+def parse_with_dacite(monkeypatch, data_class, data):
+    """Parsing par dacite seul (sans plan compilé ni remplissage des champs absents)"""
+    with monkeypatch.context() as patch:
+        patch.setattr(cctx_mapper, '_plan', lambda data_class, root, path: False)
+        return cctx_mapper.safe_parse(data_class, copy.deepcopy(data))
+
+
+@pytest.mark.parametrize("data_class, data", [
+    (Order, COMPLETE_ORDER),
+    (Order, WRONG_TYPED_ORDER),
+    (AccountData, BALANCE),
+    (WsMessage[WsOrder], {'channel': 'orderUpdates', 'data': [{'order': {
+        'coin': 'BTC', 'side': 'B', 'limitPx': '100000', 'sz': '0.0', 'oid': 1, 'timestamp': 1, 'origSz': '0.01'},
+        'status': 'filled', 'statusTimestamp': 2}]}),
+])
+def test_compiled_plan_matches_dacite(monkeypatch, data_class, data):
+    """Sur une donnée complète, les plans compilés donnent exactement le résultat de dacite (hooks compris)."""
+    expected = parse_with_dacite(monkeypatch, data_class, data)
+    assert cctx_mapper.safe_parse(data_class, copy.deepcopy(data)) == expected
+
+
+def test_compiled_plan_keeps_dacite_errors(monkeypatch):
+    """Une donnée hors des formes du plan est parsée par dacite : même erreur qu'avant."""
+    data = copy.deepcopy(BALANCE)
+    data['info']['assetPositions'] = [None]
+    with pytest.raises(WrongTypeError):
+        parse_with_dacite(monkeypatch, AccountData, data)
+    with pytest.raises(WrongTypeError):
+        cctx_mapper.safe_parse(AccountData, data)
+    # vue paresseuse : l'erreur est levée à la lecture du champ
+    account_data = parse_balance(data)
+    assert account_data.USDC.total == 1000.0
+    with pytest.raises(WrongTypeError):
+        account_data.info.assetPositions
+
+
+def test_missing_fields_are_defaulted_in_one_pass():
+    """Champs absents remplis pendant le parcours, sans modifier la donnée ; chaque défaut est compté."""
+    cctx_mapper.reset_defaulted_field_counts()
+    data = {"id": "1", "price": None, "side": "buy", "clientOrderId": None, "info": {"coin": None, "oid": "1"}}
+    original = copy.deepcopy(data)
+
+    order = parse_order(data)
+
+    assert data == original
+    assert (order.price, order.amount, order.timestamp, order.trades, order.postOnly) == (0.0, 0.0, 0, [], False)
+    # un champ Optional garde None, absent ou non
+    assert (order.clientOrderId, order.average, order.info.cloid) == (None, None, None)
+    assert (order.info.coin, order.info.oid, order.info.children) == ("", "1", [])
+    counts = cctx_mapper.defaulted_field_counts()
+    assert counts["Order.price"] == counts["Order.amount"] == counts["Order.info.coin"] == 1
+    assert counts["Order.average"] == counts["Order.info.cloid"] == 1
+    assert "Order.id" not in counts and "Order.clientOrderId" not in counts and "Order.info.oid" not in counts
+
+
+def test_absent_nested_dataclass_is_filled():
+    balance = copy.deepcopy(BALANCE)
+    del balance['info']['crossMarginSummary']
+    del balance['info']['assetPositions'][0]['position']['cumFunding']
+    del balance['free']
+    cctx_mapper.reset_defaulted_field_counts()
+
+    account_data = parse_balance(balance)
+
+    assert account_data.info.crossMarginSummary.totalMarginUsed == 0.0
+    assert account_data.info.assetPositions[0].position.cumFunding.allTime == 0.0
+    assert account_data.free == {}
+    counts = cctx_mapper.defaulted_field_counts()
+    assert counts["AccountData.info.crossMarginSummary"] == counts["AccountData.info.crossMarginSummary.totalMarginUsed"] == 1
+    # un champ absent jamais lu n'est pas compté
+    assert "AccountData.info.crossMarginSummary.accountValue" not in counts
+    assert counts["AccountData.info.assetPositions.position.cumFunding"] == 1
+
+
+def test_default_values_by_path():
+    order = cctx_mapper.safe_parse(Order, {"id": "1"}, {"info.coin": "BTC", "symbol": "BTC/USDC:USDC", "price": "1.5"})
+    assert (order.info.coin, order.symbol, order.price) == ("BTC", "BTC/USDC:USDC", 1.5)
+    assert cctx_mapper.safe_parse(Order, {"info": {"coin": "ETH"}}, {"info.coin": "BTC"}).info.coin == "ETH"
+
+
+@pytest.mark.benchmark
+def test_parse_balance_plan_is_faster_than_dacite(monkeypatch):
+    number = 500
+    compiled = timeit.timeit(lambda: cctx_mapper.safe_parse(AccountData, BALANCE), number=number)
+    with monkeypatch.context() as patch:
+        patch.setattr(cctx_mapper, '_plan', lambda data_class, root, path: False)
+        interpreted = timeit.timeit(lambda: cctx_mapper.safe_parse(AccountData, BALANCE), number=number)
+    assert compiled * 5 < interpreted, \
+        f"parse_balance: {compiled / number * 1e6:.1f} µs compiled, {interpreted / number * 1e6:.1f} µs dacite"
+
+
+def test_sparse_order_is_parsed_once(monkeypatch):
+    """Une réponse de création clairsemée n'est plus parsée deux fois (ni par dacite)."""
+    sparse = {'id': '1', 'info': {'resting': {'oid': 1}}, 'status': 'open'}
+    monkeypatch.setattr(cctx_mapper, 'from_dict', None)
+    assert parse_order(sparse).status == 'open'
+
+
+def test_balance_view_converts_fields_on_first_read():
+    """La vue ne convertit que les champs lus, une seule fois, et se compare à la dataclass."""
+    account_data = parse_balance(BALANCE)
+
+    assert isinstance(account_data, AccountData)
+    assert account_data.USDC.free == 950.0
+    assert account_data.info.crossMarginSummary.totalMarginUsed == 50.0
+    assert 'assetPositions' not in vars(account_data.info)
+    assert account_data.info.crossMarginSummary is account_data.info.crossMarginSummary
+
+    assert account_data.info.assetPositions[0].position.leverage.value == 40
+    assert account_data == cctx_mapper.safe_parse(AccountData, BALANCE)
+    assert dataclasses.asdict(account_data) == dataclasses.asdict(cctx_mapper.safe_parse(AccountData, BALANCE))
+
+
+def test_order_view_keeps_dataclass_behaviour():
+    order = cctx_mapper.lazy_parse(Order, copy.deepcopy(COMPLETE_ORDER))
+    assert isinstance(order, Order) and order == make_real_order(100.0, 'buy')
+
+    order.status = 'closed'
+    assert order.status == 'closed'
+    # une copie est une instance de la dataclass, modifications comprises
+    copied = copy.deepcopy(order)
+    assert type(copied) is Order and copied.status == 'closed' and copied.info == order.info
+
+
+@pytest.mark.benchmark
+def test_large_account_view_is_cheap():
+    """Compte à 500 positions : la vue ne paie que les champs lus par l'algo."""
+    balance = copy.deepcopy(BALANCE)
+    balance['info']['assetPositions'] *= 500
+    number = 50
+
+    def read(account_data):
+        return account_data.USDC.total, account_data.USDC.free, account_data.info.crossMarginSummary.accountValue
+
+    lazy = timeit.timeit(lambda: read(parse_balance(balance)), number=number)
+    eager = timeit.timeit(lambda: read(cctx_mapper.safe_parse(AccountData, balance)), number=number)
+    assert read(parse_balance(balance)) == read(cctx_mapper.safe_parse(AccountData, balance))
+    assert lazy * 20 < eager, f"500 positions: {lazy / number * 1e6:.1f} µs lazy, {eager / number * 1e6:.1f} µs eager"
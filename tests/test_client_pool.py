@@ -0,0 +1,140 @@
+import tracemalloc
+from unittest.mock import MagicMock
+
+import ccxt
+from src.generic.cctx_api import Dex, DexConfig
+from src.generic.client_pool import ExchangeClientPool
+from src.generic.market_metadata import MarketMetadata, MarketMetadataCache
+from src.generic.rate_limiter import ACCOUNT_WEIGHT, PRICE_WEIGHT, Priority, RateLimitedDex
+
+NB_MARKETS = 200
+
+
+def make_metadata() -> MarketMetadata:
+    """Liste de marchés de taille réaliste, construite sans appel réseau."""
+    exchange = ccxt.hyperliquid()
+    markets = [exchange.safe_market_structure({
+        'id': str(i), 'symbol': f'C{i}/USDC:USDC', 'base': f'C{i}', 'quote': 'USDC', 'settle': 'USDC',
+        'baseId': f'C{i}', 'quoteId': 'USDC', 'settleId': 'USDC', 'type': 'swap', 'swap': True, 'contract': True,
+        'linear': True, 'active': True, 'contractSize': 1,
+        'precision': {'amount': 0.001, 'price': 0.01},
+        'limits': {'leverage': {'min': None, 'max': 20}, 'amount': {}, 'price': {}, 'cost': {'min': 10}},
+        'info': {'name': f'C{i}', 'szDecimals': 3, 'maxLeverage': 20},
+    }) for i in range(NB_MARKETS)]
+    exchange.set_markets(markets)
+    return MarketMetadata.from_exchange(exchange, 'testnet')
+
+
+def make_config(i: int) -> DexConfig:
+    return DexConfig(symbol='C0', marginCoin='USDC', isTest=True, walletAddress=f'0x{i:040x}',
+                     apiKey='0x' + '1' * 64)
+
+
+def make_cache(tmp_path) -> MarketMetadataCache:
+    cache = MarketMetadataCache(str(tmp_path))
+    cache.get(True, make_metadata)
+    return cache
+
+
+def test_clients_share_session_markets_and_ticker(tmp_path) -> None:
+    """Un client par wallet, mais une session, des marchés et un client public par réseau."""
+    pool = ExchangeClientPool(market_metadata=make_cache(tmp_path))
+    first, second = pool.acquire(make_config(1)), pool.acquire(make_config(2))
+
+    assert first is not second
+    assert first.dex.walletAddress != second.dex.walletAddress
+    assert first.dex.session is second.dex.session
+    assert first.dex.markets is second.dex.markets
+    assert first.public_data is second.public_data
+
+    first.public_data.dex.dex = MagicMock()
+    first.public_data.dex.dex.fetch_ticker.return_value = {'last': '100000'}
+    assert first.get_current_price() == second.get_current_price() == 100000.0
+    assert first.public_data.dex.dex.fetch_ticker.call_count == 1
+
+
+def test_shared_price_is_charged_once_per_ttl(tmp_path) -> None:
+    """Deux observers limités lisent le prix du client public : le poids n'est compté qu'aux appels réseau."""
+    scheduler = MagicMock()
+    pool = ExchangeClientPool(market_metadata=make_cache(tmp_path), ticker_ttl=60, rate_limit_scheduler=scheduler)
+    first, second = (RateLimitedDex(pool.acquire(make_config(i)), scheduler) for i in (1, 2))
+    public = first.dex.public_data
+    public.dex.dex.dex = MagicMock()
+    public.dex.dex.dex.fetch_ticker.return_value = {'last': '100000'}
+    now = [0.0]
+    public.clock = lambda: now[0]
+
+    for _ in range(3):
+        assert first.get_current_price() == second.get_current_price() == 100000.0
+    second.dex.get_full_account_data = MagicMock()
+    second.get_account_data_and_price()
+    now[0] = 61.0
+    assert first.get_current_price() == second.get_current_price() == 100000.0
+
+    assert [call.args[:2] for call in scheduler.acquire.call_args_list] == \
+        [(Priority.LOW, PRICE_WEIGHT), (Priority.LOW, ACCOUNT_WEIGHT), (Priority.LOW, PRICE_WEIGHT)]
+    assert public.dex.dex.dex.fetch_ticker.call_count == 2
+
+
+def test_sharing_markets_leaves_the_source_client_untouched(tmp_path) -> None:
+    """Les clients suivants reçoivent marchés et options dérivées sans écrire dans le client source."""
+    pool = ExchangeClientPool(market_metadata=make_cache(tmp_path))
+    first, second = pool.acquire(make_config(1)), pool.acquire(make_config(2))
+    source = first.public_data.dex.dex  # premier client du réseau : le client public
+
+    helpers = source.options.get('marketHelperProps', [])
+    assert {helper: source.options[helper] for helper in helpers if helper in source.options} == \
+        make_metadata().helpers
+    for dex in (first, second):
+        assert dex.dex.markets is source.markets
+        assert dex.dex.markets_by_id is source.markets_by_id
+
+
+def test_client_is_keyed_by_api_key(tmp_path) -> None:
+    """Deux clés d'un même wallet (agents) signent avec deux clients distincts."""
+    pool = ExchangeClientPool(market_metadata=make_cache(tmp_path))
+    other_key = DexConfig(symbol='C0', marginCoin='USDC', isTest=True, walletAddress=f'0x{1:040x}',
+                          apiKey='0x' + '2' * 64)
+    dex = pool.acquire(make_config(1))
+    assert pool.acquire(other_key) is not dex
+    assert pool.stats().clients == 2
+    assert '0x' + '2' * 64 not in str(ExchangeClientPool.key(other_key))
+
+
+def test_client_is_reference_counted(tmp_path) -> None:
+    pool = ExchangeClientPool(market_metadata=make_cache(tmp_path))
+    dex = pool.acquire(make_config(1))
+    assert pool.acquire(DexConfig(symbol='C0', marginCoin='USDC', isTest=True,
+                                  walletAddress=f'0x{1:040X}', apiKey='0x' + '1' * 64)) is dex
+
+    other_symbol = DexConfig(symbol='C1', marginCoin='USDC', isTest=True, walletAddress=f'0x{1:040x}',
+                             apiKey='0x' + '1' * 64)
+    assert pool.acquire(other_symbol).symbol == 'C1'
+    pool.release(other_symbol)
+
+    pool.release(make_config(1))
+    assert pool.stats().clients == 1
+    pool.release(make_config(1))
+    assert pool.stats().clients == 0
+    assert pool.acquire(make_config(1)) is not dex
+
+
+def test_pool_reduces_memory_per_client(tmp_path) -> None:
+    """Les marchés ne sont plus copiés dans chaque client."""
+    cache = make_cache(tmp_path)
+    nb_clients = 20
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    standalone = [Dex(make_config(i), market_metadata=cache) for i in range(nb_clients)]
+    standalone_size = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+
+    before = tracemalloc.take_snapshot()
+    pool = ExchangeClientPool(market_metadata=cache)
+    pooled = [pool.acquire(make_config(i)) for i in range(nb_clients)]
+    pooled_size = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+
+    assert len(standalone) == len(pooled) == nb_clients
+    assert pooled_size < standalone_size / 2, \
+        f"{nb_clients} clients: standalone {standalone_size / 1024:.0f} KiB, pooled {pooled_size / 1024:.0f} KiB"
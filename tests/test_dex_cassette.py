@@ -0,0 +1,99 @@
+import pytest
+from ccxt.base.errors import OrderNotFound
+from src.generic.cctx_api import Dex, DexConfig, OrderRequest
+from src.generic.dex_cassette import CassetteError, ReplayDex, read_cassette, record_client
+
+DEX_CONFIG = DexConfig(symbol='BTC', marginCoin='USDC', isTest=True, walletAddress='0x0', apiKey='0x0')
+
+
+class FakeClient:
+    """Client ccxt factice : réponses brutes de ccxt, sans réseau."""
+
+    def fetch_ticker(self, symbol):
+        return {'symbol': symbol, 'last': 100000.5}
+
+    def create_order(self, symbol, type, side, amount, price=None, params={}):
+        # ccxt hyperliquid passe par create_orders : l'appel imbriqué n'est pas enregistré
+        return self.create_orders([{'symbol': symbol, 'side': side, 'amount': amount, 'price': price}])[0]
+
+    def create_orders(self, orders, params={}):
+        return [{'id': str(i + 1), 'info': {'resting': {'oid': i + 1}}, 'status': 'open'} for i in range(len(orders))]
+
+    def cancel_order(self, id, symbol=None, params={}):
+        raise OrderNotFound(f"order {id} not found")
+
+
+@pytest.fixture
+def cassette(tmp_path) -> str:
+    """Trafic enregistré par un Dex dont le client ccxt est factice."""
+    path = str(tmp_path / "cassette.jsonl.gz")
+    dex = Dex(DEX_CONFIG)
+    dex.dex = FakeClient()
+    recorder = record_client(dex.dex, path)
+    assert record_client(dex.dex, path) is recorder
+
+    dex.get_current_price()
+    dex.create_orders([OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+                       OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000)])
+    dex.dex.create_order('BTC/USDC:USDC', 'limit', 'buy', 0.01, 98000)
+    with pytest.raises(OrderNotFound):
+        dex.cancel_order('42')
+    recorder.close()
+    return path
+
+
+def test_every_call_is_recorded_once(cassette: str) -> None:
+    entries = list(read_cassette(cassette))
+    assert [entry['method'] for entry in entries] == ['fetch_ticker', 'create_orders', 'create_order', 'cancel_order']
+    assert entries[0]['args'] == ['BTC/USDC:USDC'] and entries[0]['response']['last'] == 100000.5
+    assert entries[3]['error'] == {'type': 'OrderNotFound', 'message': 'order 42 not found'}
+    assert all(entry['latency'] >= 0 for entry in entries)
+
+
+def test_replay_serves_recorded_responses(cassette: str) -> None:
+    """Le rejeu repasse par le parsing du Dex, erreurs ccxt comprises, sans réseau."""
+    dex = ReplayDex(DEX_CONFIG, cassette, strict=True)
+
+    assert dex.get_current_price() == 100000.5
+    orders = dex.create_orders([OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+                                OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000)])
+    assert [(o.id, o.side, o.price) for o in orders] == [('1', 'buy', 99000.0), ('2', 'sell', 101000.0)]
+    with pytest.raises(CassetteError):
+        dex.cancel_order('7')
+    assert dex.exchange_metrics.snapshot()['create_orders'].calls == 1
+
+
+def test_replay_timing(cassette: str) -> None:
+    entries = list(read_cassette(cassette))
+    sleeps = []
+    dex = ReplayDex(DEX_CONFIG, cassette, speed=10)
+    dex.dex.sleep = sleeps.append
+
+    dex.get_current_price()
+    assert sleeps == [entries[0]['latency'] / 10]
+    with pytest.raises(CassetteError):
+        dex.get_current_price()
+    # erreur enregistrée rejouée avec son type ccxt
+    with pytest.raises(OrderNotFound):
+        dex.cancel_order('7')
+
+
+def test_strict_replay_ignores_fresh_client_order_ids(tmp_path) -> None:
+    """Mode confiance : chaque création tire un nouveau clientOrderId, le rejeu strict l'accepte."""
+    path = str(tmp_path / "trusted.jsonl.gz")
+    requests = [OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000),
+                OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000)]
+    dex = Dex(DEX_CONFIG, trust_creation_response=True)
+    dex.dex = FakeClient()
+    recorder = record_client(dex.dex, path)
+    dex.create_orders(requests)
+    recorder.close()
+    recorded = list(read_cassette(path))[0]['args'][0]
+    assert all(order['params']['clientOrderId'] for order in recorded)
+
+    replay = ReplayDex(DEX_CONFIG, path, strict=True, trust_creation_response=True)
+    assert [o.id for o in replay.create_orders(requests)] == ['1', '2']
+
+    replay = ReplayDex(DEX_CONFIG, path, strict=True, trust_creation_response=True)
+    with pytest.raises(CassetteError):
+        replay.create_orders(requests[:1])
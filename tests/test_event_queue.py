@@ -0,0 +1,98 @@
+import threading
+from typing import List
+
+from src.generic.event_queue import EventQueue, OverflowPolicy
+
+
+def test_events_are_processed_on_worker_thread() -> None:
+    """Le handler est appelé sur le thread du worker, dans l'ordre de dépôt."""
+    processed: List[int] = []
+    threads = set()
+
+    def handler(event: int) -> None:
+        processed.append(event)
+        threads.add(threading.current_thread().name)
+
+    event_queue = EventQueue(handler, maxsize=10, name="test")
+    event_queue.start()
+    for i in range(5):
+        assert event_queue.put(i)
+    event_queue.stop()
+
+    assert processed == [0, 1, 2, 3, 4]
+    assert threads == {"test-worker"}
+    metrics = event_queue.metrics()
+    assert metrics.processed == 5
+    assert metrics.depth == 0
+    assert metrics.max_wait_time >= metrics.avg_wait_time >= 0
+
+
+def test_drop_newest_when_full() -> None:
+    """Avec drop_newest, les événements en trop sont abandonnés et comptés."""
+    processed: List[int] = []
+    event_queue = EventQueue(processed.append, maxsize=2, overflow_policy=OverflowPolicy.DROP_NEWEST)
+    assert event_queue.put(1)
+    assert event_queue.put(2)
+    assert not event_queue.put(3)
+
+    event_queue.start()
+    event_queue.stop()
+    assert processed == [1, 2]
+    assert event_queue.metrics().dropped == 1
+    assert event_queue.metrics().max_depth == 2
+
+
+def test_drop_oldest_when_full() -> None:
+    """Avec drop_oldest, l'événement le plus ancien laisse sa place."""
+    processed: List[int] = []
+    event_queue = EventQueue(processed.append, maxsize=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    for i in range(4):
+        assert event_queue.put(i)
+
+    event_queue.start()
+    event_queue.stop()
+    assert processed == [2, 3]
+    assert event_queue.metrics().dropped == 2
+
+
+def test_handler_error_does_not_stop_worker() -> None:
+    """Une erreur dans le handler est loggée et le worker continue."""
+    processed: List[int] = []
+
+    def handler(event: int) -> None:
+        if event == 0:
+            raise ValueError("boom")
+        processed.append(event)
+
+    event_queue = EventQueue(handler, maxsize=10)
+    event_queue.start()
+    event_queue.put(0)
+    event_queue.put(1)
+    event_queue.stop()
+    assert processed == [1]
+
+
+def test_latest_events_are_coalesced_outside_the_queue() -> None:
+    """put_latest garde le dernier événement par clé, sans prendre de place ni évincer un événement de la file."""
+    processed: List[str] = []
+    event_queue = EventQueue(processed.append, maxsize=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+    event_queue.put("fill-1")
+    for i in range(100):
+        event_queue.put_latest(("BTC", i // 50), f"candle-{i // 50}-{i}")
+    event_queue.put("fill-2")
+
+    event_queue.start()
+    event_queue.stop()
+    # les événements de la file passent d'abord, puis la dernière version de chaque bougie
+    assert processed == ["fill-1", "fill-2", "candle-0-49", "candle-1-99"]
+    assert event_queue.metrics().dropped == 0
+
+
+def test_latest_events_are_processed_when_idle() -> None:
+    """Sans autre événement, le worker traite les événements coalescés."""
+    done = threading.Event()
+    event_queue = EventQueue(lambda event: done.set(), maxsize=1)
+    event_queue.start()
+    event_queue.put_latest("BTC", "candle")
+    assert done.wait(timeout=5)
+    event_queue.stop()
@@ -0,0 +1,97 @@
+import asyncio
+
+import numpy as np
+import pytest
+from src.generic.exchange_metrics import ExchangeMetrics, LatencyHistogram
+
+
+class FakeClient:
+    """Client ccxt factice : fetch_ticker fait `attempts` requêtes HTTP (relances ccxt)."""
+
+    def __init__(self, attempts: int = 1) -> None:
+        self.attempts = attempts
+
+    def fetch(self, url):
+        return {}
+
+    def fetch2(self, path):
+        for _ in range(self.attempts if path == "/info" else 1):
+            response = self.fetch(path)
+        return response
+
+    def fetch_ticker(self, symbol):
+        # deux requêtes (load_markets puis ticker), chacune relancée
+        self.fetch2("/info")
+        self.fetch2("/info")
+        return {'last': 100000.0}
+
+    def cancel_order(self, order_id, symbol=None):
+        self.fetch2("/exchange")
+        raise RuntimeError("order not found")
+
+    def create_order(self, *args):
+        # ccxt hyperliquid passe par create_orders
+        return self.create_orders([args])[0]
+
+    def create_orders(self, orders):
+        self.fetch2("/exchange")
+        return [{'id': '1'}]
+
+
+class FakeAsyncClient:
+    async def fetch(self, url):
+        await asyncio.sleep(0.01)
+        return {}
+
+    async def fetch2(self, path):
+        return await self.fetch(path)
+
+    async def fetch_balance(self):
+        return await self.fetch2("/info")
+
+
+def test_histogram_percentiles_within_precision() -> None:
+    latencies = np.random.default_rng(0).lognormal(np.log(0.05), 1, 20000)
+    histogram = LatencyHistogram()
+    for latency in latencies:
+        histogram.record(latency)
+
+    assert histogram.count == 20000
+    assert histogram.mean == pytest.approx(latencies.mean())
+    for q in (0.5, 0.9, 0.99):
+        assert histogram.percentile(q) == pytest.approx(np.quantile(latencies, q), rel=1 / 16)
+    assert histogram.percentile(1.0) == histogram.max
+
+
+def test_calls_errors_and_retries_per_endpoint() -> None:
+    metrics = ExchangeMetrics()
+    client = FakeClient(attempts=3)
+    metrics.instrument(client)
+
+    client.fetch_ticker("BTC/USDC:USDC")
+    client.fetch_ticker("BTC/USDC:USDC")
+    with pytest.raises(RuntimeError):
+        client.cancel_order("1")
+    client.create_order("BTC/USDC:USDC", "limit", "buy", 0.01, 99000)
+
+    stats = metrics.snapshot()
+    assert (stats['fetch_ticker'].calls, stats['fetch_ticker'].retries) == (2, 8)
+    assert stats['cancel_order'].retries == 0
+    assert (stats['cancel_order'].calls, stats['cancel_order'].errors) == (1, 1)
+    # l'appel imbriqué à create_orders est compté dans create_order
+    assert stats['create_order'].calls == 1 and 'create_orders' not in stats
+    assert stats['fetch_ticker'].p50 <= stats['fetch_ticker'].max
+
+
+def test_async_client_is_timed() -> None:
+    metrics = ExchangeMetrics()
+    client = FakeAsyncClient()
+    metrics.instrument(client)
+
+    async def concurrent_reads():
+        await asyncio.gather(*(client.fetch_balance() for _ in range(5)))
+
+    asyncio.run(concurrent_reads())
+    stats = metrics.snapshot()['fetch_balance']
+    assert (stats.calls, stats.retries) == (5, 0)
+    assert stats.p50 >= 0.01
@@ -0,0 +1,85 @@
+import pytest
+from src.generic.executed_orders import ExecutedOrdersTracker
+from src.generic.hyperliquid_ws_model import WsOrder, WsBasicOrder
+
+
+class FakeClock:
+    """Horloge contrôlée par le test."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_fill(side: str, price: float) -> WsOrder:
+    return WsOrder(
+        order=WsBasicOrder(coin="BTC", side=side, limitPx=price, sz=0.0, oid=1, timestamp=0, origSz=0.01),
+        status="filled",
+        statusTimestamp=0,
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_rolling_stats(clock: FakeClock) -> None:
+    """Cadence, déséquilibre achats/ventes et spread réalisé sur les exécutions retenues."""
+    tracker = ExecutedOrdersTracker(capacity=10, clock=clock)
+    for now, side, price in [(0, 'B', 99000), (30, 'B', 98000), (60, 'A', 99000), (120, 'A', 100000)]:
+        clock.now = now
+        tracker.add_order(make_fill(side, price))
+
+    stats = tracker.stats()
+    assert (stats.count, stats.buys, stats.sells) == (4, 2, 2)
+    assert stats.buy_sell_imbalance == 0
+    assert stats.fills_per_minute == pytest.approx(3 * 60 / 120)
+    assert stats.avg_time_between_fills == pytest.approx(40)
+    assert stats.last_time_between_fills == pytest.approx(60)
+    # 99000 - 98000 puis 100000 - 99000
+    assert stats.avg_grid_spread == pytest.approx(1000)
+
+
+def test_ring_buffer_keeps_last_orders(clock: FakeClock) -> None:
+    """Au-delà de la capacité, les plus anciennes exécutions sortent des statistiques."""
+    tracker = ExecutedOrdersTracker(capacity=3, clock=clock)
+    for i in range(10):
+        clock.now = i
+        if i < 8:
+            tracker.add_buy(1000 - i)
+        else:
+            tracker.add_sell(1000)
+
+    assert len(tracker) == 3
+    assert tracker.total_count == 10
+    assert [(o.type, o.price, o.timestamp) for o in tracker.last_executed_orders] == \
+           [('buy', 993, 7), ('sell', 1000, 8), ('sell', 1000, 9)]
+    stats = tracker.stats()
+    assert (stats.buys, stats.sells) == (1, 2)
+    assert stats.buy_sell_imbalance == pytest.approx(-1 / 3)
+    # les ventes sont appariées aux achats 993 puis 994
+    assert stats.avg_grid_spread == pytest.approx((7 + 6) / 2)
+
+
+def test_memory_is_bounded(clock: FakeClock) -> None:
+    """Les spreads évincés sont retirés de la moyenne, quel que soit le nombre d'exécutions."""
+    tracker = ExecutedOrdersTracker(capacity=4, clock=clock)
+    for i in range(10000):
+        clock.now = i
+        tracker.add_buy(1000)
+        tracker.add_sell(1000 + i % 7)
+
+    assert len(tracker) == 4
+    assert len(tracker._unmatched_buys) == 0
+    assert tracker.stats().avg_grid_spread == pytest.approx((9998 % 7 + 9999 % 7) / 2)
+
+
+def test_empty_tracker() -> None:
+    stats = ExecutedOrdersTracker().stats()
+    assert stats.count == 0
+    assert stats.fills_per_minute == 0
+    assert stats.avg_time_between_fills is None
+    assert stats.avg_grid_spread is None
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from src.backtesting.grid_backtester import GridParams, OhlcData, backtest_grid, load_ohlc_csv, \
+    run_algo_on_simulated_dex
+
+
+def random_walk(seed: int, size: int, step: float = 50) -> np.ndarray:
+    """Marche aléatoire dont les pas tombent exactement sur les niveaux de la grille"""
+    steps = np.random.default_rng(seed).choice([-step, step], size=size)
+    return 100000 + np.concatenate([[0], np.cumsum(steps)])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_real_algo_on_simulated_dex(seed: int) -> None:
+    """Le backtest vectorisé produit les mêmes exécutions que l'Algo réel, tick par tick."""
+    prices = random_walk(seed, 5000)
+    params = GridParams(gap=500, max_leverage=10, maker_fee=0, taker_fee=0)
+
+    result = backtest_grid(OhlcData.from_prices(prices), params)
+    _, dex, fills = run_algo_on_simulated_dex(prices, params)
+
+    assert len(result.fills) == len(fills) > 10
+    assert np.array_equal(result.fills['index'], fills['index'])
+    assert np.array_equal(result.fills['side'], fills['side'])
+    assert np.allclose(result.fills['price'], fills['price'])
+    assert np.allclose(result.fills['qty'], fills['qty'])
+    assert result.final_equity == pytest.approx(dex.equity)
+    assert result.position_size == pytest.approx(dex.position_size)
+
+
+def test_refill_when_coin_count_reaches_minimum() -> None:
+    """Une hausse continue vide le compteur de coins et déclenche des achats au marché."""
+    prices = np.arange(100000, 104001, 50, dtype=float)
+    result = backtest_grid(OhlcData.from_prices(prices), GridParams(gap=500, maker_fee=0, taker_fee=0))
+
+    assert result.sell_fills == 8
+    assert result.buy_fills == 0
+    # achat initial + recharges de 2 coins quand le compteur atteint minNbCoins
+    assert result.market_buys > 1
+    assert result.fills['market'].sum() == result.market_buys
+
+
+def test_bar_path_fills_both_sides() -> None:
+    """Dans une bougie haussière, le prix passe par le low puis le high : open long puis close long."""
+    data = OhlcData(open=[100000, 100000], high=[100000, 100600], low=[100000, 99400], close=[100000, 100100])
+    result = backtest_grid(data, GridParams(gap=500, maker_fee=0, taker_fee=0))
+
+    limit_fills = result.fills[~result.fills['market']]
+    assert [(f['side'], f['price']) for f in limit_fills] == [(1, 99500), (-1, 100000), (-1, 100500)]
+    assert result.equity[-1] == pytest.approx(result.final_equity)
+
+
+def test_liquidation_stops_trading() -> None:
+    """Une chute brutale liquide la position : l'equity reste ensuite constante."""
+    prices = np.concatenate([[100000], np.linspace(100000, 20000, 200), np.full(10, 100000)])
+    result = backtest_grid(OhlcData.from_prices(prices), GridParams(gap=500, max_leverage=40, qty_divider=2))
+
+    assert result.liquidated
+    assert result.position_size == 0
+    assert np.all(result.equity[result.liquidation_index:] == result.final_equity)
+    assert result.max_drawdown > 0.5
+
+
+def test_load_ohlc_csv(tmp_path) -> None:
+    """Le loader lit le format du CSV 1 minute utilisé par le notebook."""
+    path = tmp_path / "btc.csv"
+    path.write_text("Timestamp,Open,High,Low,Close,Volume\n"
+                    "1325317920,4.39,4.39,4.39,4.39,0.45\n"
+                    "1325317980,4.39,4.40,4.38,4.40,1.2\n")
+    data = load_ohlc_csv(str(path))
+
+    assert len(data) == 2
+    assert data.timestamp[1] == 1325317980
+    assert data.low[1] == pytest.approx(4.38)
+    assert data.close.dtype == np.float64
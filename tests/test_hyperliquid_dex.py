@@ -0,0 +1,130 @@
+import pytest
+
+from src.generic.cctx_api import DexConfig, OrderRequest
+from src.hyperliquidapi import hyperliquid_dex
+from src.hyperliquidapi.hyperliquid_dex import HyperliquidDex
+
+DEX_CONFIG = DexConfig(symbol='BTC', marginCoin='USDC', isTest=True, walletAddress='0xabc', apiKey='0x' + '1' * 64)
+
+
+def ok(statuses=None) -> dict:
+    if statuses is None:
+        return {'status': 'ok', 'response': {'type': 'default'}}
+    return {'status': 'ok', 'response': {'type': 'order', 'data': {'statuses': statuses}}}
+
+
+class FakeInfo:
+    """Info du SDK : réponses de l'API /info enregistrées."""
+
+    asset_to_sz_decimals = {0: 5}
+
+    def name_to_asset(self, name: str) -> int:
+        return 0
+
+    def all_mids(self):
+        return {'BTC': '100000.5', 'ETH': '3000'}
+
+    def user_state(self, address: str):
+        return {
+            'marginSummary': {'accountValue': '1000.0', 'totalNtlPos': '0.0', 'totalRawUsd': '1000.0',
+                              'totalMarginUsed': '100.0'},
+            'crossMarginSummary': {'accountValue': '1000.0', 'totalNtlPos': '0.0', 'totalRawUsd': '1000.0',
+                                   'totalMarginUsed': '100.0'},
+            'crossMaintenanceMarginUsed': '10.0', 'withdrawable': '900.0', 'assetPositions': [], 'time': 1700000000000,
+        }
+
+    def frontend_open_orders(self, address: str):
+        return [
+            {'coin': 'BTC', 'side': 'B', 'limitPx': '99000.0', 'sz': '0.004', 'oid': 11, 'timestamp': 1700,
+             'origSz': '0.01', 'orderType': 'Limit', 'tif': 'Gtc', 'reduceOnly': False, 'cloid': None},
+            {'coin': 'ETH', 'side': 'A', 'limitPx': '3100.0', 'sz': '1', 'oid': 12, 'timestamp': 1700,
+             'origSz': '1', 'orderType': 'Limit', 'tif': 'Gtc', 'reduceOnly': False, 'cloid': None},
+        ]
+
+
+class FakeExchange:
+    """Exchange du SDK : enregistre les actions au lieu de les signer et de les envoyer."""
+
+    def __init__(self) -> None:
+        self.info = FakeInfo()
+        self.actions = []
+
+    def bulk_orders(self, orders):
+        self.actions.append(('order', orders))
+        return ok([{'resting': {'oid': 21}}, {'filled': {'totalSz': '0.01', 'avgPx': '100001', 'oid': 22}},
+                   {'error': 'Insufficient margin to place order.'}][:len(orders)])
+
+    def bulk_cancel(self, cancels):
+        self.actions.append(('cancel', cancels))
+        return ok(['success'] * len(cancels))
+
+    def bulk_modify_orders_new(self, modifies):
+        self.actions.append(('batchModify', modifies))
+        return ok([{'resting': {'oid': modify['oid']}} for modify in modifies])
+
+    def update_leverage(self, leverage, name, is_cross=True):
+        self.actions.append(('updateLeverage', (leverage, name, is_cross)))
+        return ok()
+
+
+@pytest.fixture
+def exchange() -> FakeExchange:
+    return FakeExchange()
+
+
+@pytest.fixture
+def dex(exchange: FakeExchange) -> HyperliquidDex:
+    return HyperliquidDex(DEX_CONFIG, exchange=exchange)
+
+
+def test_reads_are_mapped_to_dex_models(dex: HyperliquidDex) -> None:
+    assert dex.get_current_price() == 100000.5
+    account_data = dex.get_full_account_data()
+    assert (account_data.USDC.total, account_data.USDC.used, account_data.USDC.free) == (1000.0, 100.0, 900.0)
+    assert account_data.info.withdrawable == 900.0
+
+    [order] = dex.get_open_orders()
+    assert (order.id, order.side, order.price, order.amount, order.remaining) == ('11', 'buy', 99000.0, 0.01, 0.004)
+    assert order.symbol == 'BTC/USDC:USDC'
+
+
+def test_batch_order_is_one_action(dex: HyperliquidDex, exchange: FakeExchange) -> None:
+    """Création groupée : un seul envoi, statuts natifs mappés dans l'ordre des requêtes."""
+    orders = dex.create_orders([
+        OrderRequest(order_type='limit', side='buy', qty=0.0123456, price=99000.12),
+        OrderRequest(order_type='market', side='buy', qty=0.01, price=100000),
+        OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000, params={'reduceOnly': True}),
+    ])
+
+    [(action, wires)] = exchange.actions
+    assert action == 'order'
+    assert (wires[0]['sz'], wires[0]['limit_px'], wires[0]['order_type']) == (0.01235, 99000.0, {'limit': {'tif': 'Gtc'}})
+    assert (wires[1]['limit_px'], wires[1]['order_type']) == (105000.0, {'limit': {'tif': 'Ioc'}})
+    assert wires[2]['reduce_only'] and not wires[2]['is_buy']
+    assert [(o.id, o.status) for o in orders] == [('21', 'open'), ('22', 'closed'), ('', 'rejected')]
+    assert orders[1].average == 100001.0 and orders[1].remaining == 0.0
+
+
+def test_cancel_modify_and_leverage(dex: HyperliquidDex, exchange: FakeExchange) -> None:
+    dex.cancel_orders(['21', '22'])
+    [order] = dex.modify_orders(['21'], [OrderRequest(order_type='limit', side='buy', qty=0.01, price=98500)])
+    dex.set_cross_margin_leverage(10)
+
+    assert exchange.actions[0] == ('cancel', [{'coin': 'BTC', 'oid': 21}, {'coin': 'BTC', 'oid': 22}])
+    assert exchange.actions[1][1][0]['oid'] == 21 and exchange.actions[1][1][0]['order']['limit_px'] == 98500.0
+    assert (order.id, order.price) == ('21', 98500.0)
+    assert exchange.actions[2] == ('updateLeverage', (10, 'BTC', True))
+    assert dex.exchange_metrics.snapshot()['bulk_cancel'].calls == 1
+
+
+def test_failed_action_raises(dex: HyperliquidDex, exchange: FakeExchange) -> None:
+    exchange.bulk_orders = lambda orders: {'status': 'err', 'response': 'User or API Wallet does not exist.'}
+    with pytest.raises(Exception, match="does not exist"):
+        dex.create_open_long(0.01, 99000)
+
+
+def test_sdk_is_required_without_exchange(monkeypatch) -> None:
+    """Sans Exchange fourni, le SDK est nécessaire : erreur explicite s'il n'est pas installé."""
+    monkeypatch.setattr(hyperliquid_dex, 'Exchange', None)
+    with pytest.raises(ImportError, match="hyperliquid-python-sdk"):
+        HyperliquidDex(DEX_CONFIG)
@@ -0,0 +1,82 @@
+import json
+from unittest.mock import MagicMock
+
+import ccxt
+import pytest
+from src.generic.cctx_api import Dex, DexConfig
+from src.generic.market_metadata import MarketMetadata, MarketMetadataCache
+
+DEX_CONFIG = DexConfig(symbol='BTC', marginCoin='USDC', isTest=True, walletAddress='0x0', apiKey='0x' + '1' * 64)
+
+
+def make_metadata(fetched_at: float = None) -> MarketMetadata:
+    """Métadonnées d'un marché BTC/USDC:USDC, construites sans appel réseau."""
+    exchange = ccxt.hyperliquid()
+    market = exchange.safe_market_structure({
+        'id': '0', 'symbol': 'BTC/USDC:USDC', 'base': 'BTC', 'quote': 'USDC', 'settle': 'USDC',
+        'baseId': 'BTC', 'quoteId': 'USDC', 'settleId': 'USDC', 'type': 'swap', 'swap': True, 'contract': True,
+        'linear': True, 'active': True, 'contractSize': 1,
+        'precision': {'amount': 0.00001, 'price': 1},
+        'limits': {'leverage': {'min': None, 'max': 40}, 'amount': {}, 'price': {}, 'cost': {'min': 10}},
+        'info': {'name': 'BTC', 'szDecimals': 5, 'maxLeverage': 40},
+    })
+    exchange.set_markets([market])
+    metadata = MarketMetadata.from_exchange(exchange, 'testnet')
+    if fetched_at is not None:
+        metadata.fetched_at = fetched_at
+    return metadata
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def test_metadata_is_fetched_once_then_read_from_disk(tmp_path, clock: FakeClock) -> None:
+    fetch = MagicMock(return_value=make_metadata(fetched_at=0))
+    MarketMetadataCache(str(tmp_path), ttl=3600, clock=clock).get(True, fetch)
+    assert fetch.call_count == 1
+    assert json.loads((tmp_path / "markets_testnet.json").read_text())['markets']['BTC/USDC:USDC']['id'] == '0'
+
+    # nouveau process : le fichier suffit
+    clock.now = 3599
+    metadata = MarketMetadataCache(str(tmp_path), ttl=3600, clock=clock).get(True, fetch)
+    assert fetch.call_count == 1
+    info = metadata.market_info('BTC/USDC:USDC')
+    assert (info.tick_size, info.lot_size, info.max_leverage) == (1, 0.00001, 40)
+
+
+def test_expired_or_other_version_is_refetched(tmp_path, clock: FakeClock) -> None:
+    fetch = MagicMock(side_effect=lambda: make_metadata(fetched_at=clock.now))
+    cache = MarketMetadataCache(str(tmp_path), ttl=3600, clock=clock)
+    cache.get(True, fetch)
+
+    clock.now = 3600
+    cache.get(True, fetch)
+    assert fetch.call_count == 2
+
+    stored = json.loads((tmp_path / "markets_testnet.json").read_text())
+    stored['version'] = 0
+    (tmp_path / "markets_testnet.json").write_text(json.dumps(stored))
+    MarketMetadataCache(str(tmp_path), ttl=3600, clock=clock).get(True, fetch)
+    assert fetch.call_count == 3
+
+
+def test_dex_uses_cached_markets_without_network(tmp_path) -> None:
+    """Deux Dex construits avec le cache partagé n'appellent jamais fetch_markets."""
+    cache = MarketMetadataCache(str(tmp_path))
+    cache.get(True, make_metadata)
+
+    for _ in range(2):
+        dex = Dex(DEX_CONFIG, market_metadata=cache)
+        dex.dex.fetch_markets = MagicMock(side_effect=AssertionError("network call"))
+        dex.dex.load_markets()
+        assert dex.dex.market(dex.get_symbol())['precision']['amount'] == 0.00001
@@ -0,0 +1,80 @@
+import dataclasses
+import os
+import tracemalloc
+
+from src.generic.cctx_mapper import parse_order
+from src.generic.cctx_model import Info, Order
+from src.generic.hyperliquid_ws_model import WsBasicOrder, WsOrder
+from src.generic.ws_decoder import decode_order_updates
+
+# 1M pour la mesure de référence : MODEL_MEMORY_ORDERS=1000000 pytest tests/test_model_memory.py
+NB_ORDERS = int(os.environ.get('MODEL_MEMORY_ORDERS', 20_000))
+
+
+def legacy(cls, **types):
+    """Ancienne forme du modèle : dataclass à __dict__, champs numériques en chaînes"""
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", [
+        (f.name, types.get(f.name, f.type), dataclasses.field(default=f.default))
+        if f.default is not dataclasses.MISSING else (f.name, types.get(f.name, f.type))
+        for f in dataclasses.fields(cls)])
+
+
+LegacyInfo = legacy(Info, limitPx=str, sz=str, triggerPx=str, origSz=str, timestamp=str)
+LegacyOrder = legacy(Order)
+LegacyWsBasicOrder = legacy(WsBasicOrder, sz=str, origSz=str)
+LegacyWsOrder = legacy(WsOrder)
+
+
+def make_order(i: int, info_cls, order_cls, number):
+    price, qty = 100000.0 + i, 0.001 * (1 + i % 100)
+    info = info_cls(coin="BTC", side="B", limitPx=number(price), sz=number(qty), oid=str(i),
+                    timestamp=number(1700000000000 + i), triggerCondition="", isTrigger=False, triggerPx=number(0.0),
+                    children=[], isPositionTpsl=False, reduceOnly=False, orderType="Limit", origSz=number(qty),
+                    tif="Gtc", cloid=None)
+    return order_cls(info=info, id=str(i), clientOrderId=None, timestamp=1700000000000 + i, datetime="",
+                     lastTradeTimestamp=None, lastUpdateTimestamp=None, symbol="BTC/USDC:USDC", type="limit",
+                     timeInForce="GTC", postOnly=False, reduceOnly=False, side="buy", price=price, triggerPrice=None,
+                     amount=qty, cost=0.0, average=None, filled=0.0, remaining=qty, status="open", fee=None,
+                     trades=[], fees=[], stopPrice=None, takeProfitPrice=None, stopLossPrice=None)
+
+
+def make_ws_order(i: int, basic_cls, ws_cls, number):
+    qty = 0.001 * (1 + i % 100)
+    return ws_cls(order=basic_cls(coin="BTC", side="B", limitPx=100000.0 + i, sz=number(0.0), oid=i,
+                                  timestamp=1700000000000 + i, origSz=number(qty)),
+                  status="filled", statusTimestamp=1700000000000 + i)
+
+
+def raw_order(i: int) -> dict:
+    """Ordre tel que renvoyé par ccxt (champs de info en chaînes)"""
+    return dataclasses.asdict(make_order(i, LegacyInfo, LegacyOrder, str))
+
+
+def raw_ws_frame(i: int) -> dict:
+    update = make_ws_order(i, LegacyWsBasicOrder, LegacyWsOrder, str)
+    return {'channel': 'orderUpdates', 'data': [dataclasses.asdict(update)]}
+
+
+def bytes_per_object(make) -> float:
+    """Mémoire retenue par objet ; la donnée brute dont il est issu est libérée aussitôt"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    retained = [make(i) for i in range(NB_ORDERS)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(retained) == NB_ORDERS
+    return (after - before) / NB_ORDERS
+
+
+def test_parsed_models_are_compact() -> None:
+    """Octets par objet retenu : ancien modèle (__dict__, chaînes) contre objets produits par le parsing."""
+    sizes = {
+        'Order': (bytes_per_object(lambda i: make_order(i, LegacyInfo, LegacyOrder, str)),
+                  bytes_per_object(lambda i: parse_order(raw_order(i)))),
+        'WsOrder': (bytes_per_object(lambda i: make_ws_order(i, LegacyWsBasicOrder, LegacyWsOrder, str)),
+                    bytes_per_object(lambda i: decode_order_updates(raw_ws_frame(i))[0])),
+    }
+    for name, (before, after) in sizes.items():
+        assert after < before * 0.8, f"{NB_ORDERS} {name}: {before:.0f} B/object before, {after:.0f} B/object after"
+    order = parse_order(raw_order(0))
+    assert type(order) is Order and not hasattr(order, '__dict__')
@@ -0,0 +1,71 @@
+import pytest
+from src.generic.order_ladder import OrderLadder
+from tests.conftest import make_real_order
+
+
+@pytest.fixture
+def ladder() -> OrderLadder:
+    """Carnet avec 3 open longs et 2 close longs."""
+    return OrderLadder([
+        make_real_order(98000, 'buy'),
+        make_real_order(99000, 'buy'),
+        make_real_order(97000, 'buy'),
+        make_real_order(101000, 'sell'),
+        make_real_order(102000, 'sell'),
+    ])
+
+
+def test_lookup_by_oid(ladder: OrderLadder) -> None:
+    """Un ordre est retrouvé par son oid."""
+    order = ladder.get("mock_order_99000_buy")
+    assert order is not None
+    assert order.price == 99000
+    assert "mock_order_101000_sell" in ladder
+    assert ladder.get("unknown") is None
+
+
+def test_min_max_by_side(ladder: OrderLadder) -> None:
+    """Min et max sont calculés par côté."""
+    assert ladder.min_order('buy').price == 97000
+    assert ladder.max_order('buy').price == 99000
+    assert ladder.min_order('sell').price == 101000
+    assert ladder.max_order('sell').price == 102000
+    assert [o.price for o in ladder.sorted_orders('buy')] == [97000, 98000, 99000]
+
+
+def test_contains_price_uses_tolerance(ladder: OrderLadder) -> None:
+    """La recherche par prix tolère les erreurs d'arrondi des floats."""
+    assert ladder.contains_price('buy', 98000.0000001)
+    assert not ladder.contains_price('buy', 98000.001)
+    assert not ladder.contains_price('sell', 98000)
+
+
+def test_remove_updates_levels(ladder: OrderLadder) -> None:
+    """La suppression met à jour l'index et les niveaux de prix."""
+    removed = ladder.remove("mock_order_97000_buy")
+    assert removed.price == 97000
+    assert ladder.remove("mock_order_97000_buy") is None
+    assert ladder.count('buy') == 2
+    assert ladder.min_order('buy').price == 98000
+    assert not ladder.contains_price('buy', 97000)
+    assert len(ladder) == 4
+
+
+def test_add_replaces_same_oid() -> None:
+    """Ajouter un ordre avec un oid existant remplace l'ancien niveau."""
+    ladder = OrderLadder([make_real_order(100, 'buy')])
+    moved = make_real_order(90, 'buy')
+    moved.id = "mock_order_100_buy"
+    ladder.add(moved)
+    assert len(ladder) == 1
+    assert not ladder.contains_price('buy', 100)
+    assert ladder.contains_price('buy', 90)
+
+
+def test_empty_ladder() -> None:
+    """Un carnet vide ne retourne aucun ordre."""
+    ladder = OrderLadder()
+    assert ladder.min_order('buy') is None
+    assert ladder.max_order('sell') is None
+    assert ladder.count('buy') == 0
+    assert list(ladder) == []
@@ -0,0 +1,78 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from src.generic.cctx_api import Dex, OrderRequest
+from src.generic.rate_limiter import ORDER_STATUS_WEIGHT, Priority, RateLimitedDex, RateLimitScheduler, action_weight
+
+
+def test_bucket_limits_throughput() -> None:
+    """Au-delà de la capacité, les demandes partent au débit du seau."""
+    scheduler = RateLimitScheduler(weight_per_minute=6000, burst=10)  # 100 jetons par seconde
+    start = time.monotonic()
+    for _ in range(30):
+        scheduler.acquire(Priority.LOW)
+    elapsed = time.monotonic() - start
+
+    assert elapsed == pytest.approx(0.2, abs=0.08)
+    assert scheduler.metrics()['low'].granted == 30
+    assert scheduler.metrics()['low'].max_wait > 0
+
+
+def test_high_priority_overtakes_waiting_reads() -> None:
+    """Une annulation arrivée après une file de lectures part avant elles."""
+    scheduler = RateLimitScheduler(weight_per_minute=1200, burst=1)  # 20 jetons par seconde
+    scheduler.acquire(Priority.LOW)
+    order = []
+    lock = threading.Lock()
+
+    def request(priority: Priority, name: str):
+        scheduler.acquire(priority)
+        with lock:
+            order.append(name)
+
+    readers = [threading.Thread(target=request, args=(Priority.LOW, f"read{i}")) for i in range(4)]
+    for reader in readers:
+        reader.start()
+    time.sleep(0.01)
+    cancel = threading.Thread(target=request, args=(Priority.HIGH, "cancel"))
+    cancel.start()
+    for thread in readers + [cancel]:
+        thread.join()
+
+    assert order.index("cancel") <= 1
+    assert scheduler.metrics()['high'].granted == 1
+    assert scheduler.metrics()['low'].waiting == 0
+
+
+def test_dex_calls_use_their_lane() -> None:
+    scheduler = MagicMock()
+    dex = RateLimitedDex(MagicMock(), scheduler)
+
+    dex.cancel_orders(["1", "2"])
+    dex.create_orders([OrderRequest(order_type='limit', side='sell', qty=0.01, price=101000,
+                                    params={'reduceOnly': True})])
+    dex.create_orders([OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000)] * 45)
+    dex.get_open_orders()
+    dex.cancel_orders([])
+
+    assert [call.args[:2] for call in scheduler.acquire.call_args_list] == [
+        (Priority.HIGH, 1), (Priority.HIGH, 1), (Priority.NORMAL, 2), (Priority.LOW, 20),
+    ]
+    assert action_weight(40) == 2
+
+
+@pytest.mark.parametrize("trust_creation_response, weight", [(False, 1 + ORDER_STATUS_WEIGHT), (True, 1)])
+def test_single_order_creation_charges_its_fetch(trust_creation_response: bool, weight: int) -> None:
+    """Hors mode confiance, create_open_long / create_close_long relisent l'ordre (orderStatus) : poids compté."""
+    scheduler = MagicMock()
+    inner = MagicMock(spec=Dex)
+    inner.trust_creation_response = trust_creation_response
+    dex = RateLimitedDex(inner, scheduler)
+
+    dex.create_open_long(0.01, 99000)
+    dex.create_close_long(0.01, 101000)
+    dex.buy_at_market_price(0.01, 100000)
+
+    assert [call.args[:2] for call in scheduler.acquire.call_args_list] == [(Priority.NORMAL, weight)] * 3
@@ -0,0 +1,117 @@
+import math
+from typing import List
+
+import pytest
+from src.data.null_data import NullData
+from src.generic.algo import Algo
+from src.generic.cctx_api import OrderRequest
+from src.generic.hyperliquid_ws_model import WsOrder
+from src.generic.observer import HyperliquidObserver
+from src.generic.simulated_dex import SimulatedDex
+
+
+@pytest.fixture
+def dex() -> SimulatedDex:
+    """Echange simulé sans frais, BTC à 100000."""
+    return SimulatedDex(initial_balance=10000, initial_price=100000, leverage=10, maker_fee=0, taker_fee=0)
+
+
+@pytest.fixture
+def fills(dex: SimulatedDex) -> List[WsOrder]:
+    received: List[WsOrder] = []
+    dex.subscribe(received.extend)
+    return received
+
+
+def test_limit_orders_fill_when_price_crosses(dex: SimulatedDex, fills: List[WsOrder]) -> None:
+    """Un ordre limite est exécuté à son prix quand le marché le traverse."""
+    buy = dex.create_open_long(qty=0.01, price=99000)
+    sell = dex.create_close_long(qty=0.01, price=101000)
+    assert {o.id for o in dex.get_open_orders()} == {buy.id, sell.id}
+
+    dex.on_price(99500)
+    assert fills == []
+    dex.on_price(98000)
+    assert [(f.order.oid, f.order.side, f.order.limitPx) for f in fills] == [(int(buy.id), 'B', 99000)]
+    assert dex.position_size == pytest.approx(0.01)
+    assert [o.id for o in dex.get_open_orders()] == [sell.id]
+
+
+def test_price_time_priority(dex: SimulatedDex, fills: List[WsOrder]) -> None:
+    """Les meilleurs prix sont servis en premier, puis les plus anciens."""
+    first = dex.create_open_long(qty=0.01, price=99000)
+    better = dex.create_open_long(qty=0.01, price=99500)
+    second = dex.create_open_long(qty=0.01, price=99000)
+
+    dex.on_price(98000)
+    assert [str(f.order.oid) for f in fills] == [better.id, first.id, second.id]
+
+
+def test_cancel_and_market_order(dex: SimulatedDex, fills: List[WsOrder]) -> None:
+    """Un ordre annulé n'est plus exécuté ; un ordre au marché est exécuté au prix courant."""
+    order = dex.create_open_long(qty=0.01, price=99000)
+    dex.cancel_orders([order.id])
+    dex.buy_at_market_price(qty=0.02, price=100000)
+    dex.on_price(98000)
+
+    assert [(f.order.limitPx, f.order.origSz) for f in fills] == [(100000, 0.02)]
+    assert dex.get_open_orders() == []
+
+
+def test_modify_keeps_priority_at_same_price(dex: SimulatedDex, fills: List[WsOrder]) -> None:
+    """A prix inchangé l'ordre garde sa place ; à un autre prix il passe en fin de file."""
+    first = dex.create_open_long(qty=0.02, price=99000)
+    second = dex.create_open_long(qty=0.01, price=99000)
+    moved = dex.create_open_long(qty=0.01, price=98500)
+
+    assert dex.modify_order(first.id, OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000)).id == first.id
+    repriced = dex.modify_order(moved.id, OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000))
+    assert repriced.id != moved.id
+    assert dex.modify_order(moved.id, OrderRequest(order_type='limit', side='buy', qty=0.01, price=99000)).id == ''
+
+    dex.on_price(98800)
+    assert [str(f.order.oid) for f in fills] == [first.id, second.id, repriced.id]
+    assert [f.order.origSz for f in fills] == [0.01] * 3
+
+
+def test_cross_margin_accounting(dex: SimulatedDex) -> None:
+    """PnL réalisé, latent et marge utilisée suivent la position."""
+    dex.buy_at_market_price(qty=0.1, price=100000)
+    dex.on_price(101000)
+    account = dex.get_full_account_data()
+    assert account.USDC.total == pytest.approx(10100)
+    assert account.info.crossMarginSummary.totalMarginUsed == pytest.approx(0.1 * 101000 / 10)
+    assert account.info.assetPositions[0].position.szi == 0.1
+
+    dex.create_close_long(qty=0.05, price=102000)
+    dex.on_price(102000)
+    assert dex.position_size == pytest.approx(0.05)
+    assert dex.balance == pytest.approx(10000 + 0.05 * 2000)
+    assert dex.equity == pytest.approx(10000 + 0.1 * 2000)
+
+
+def test_order_rejected_without_margin(dex: SimulatedDex) -> None:
+    """Un ordre qui dépasse la marge disponible est rejeté."""
+    order = dex.create_orders([OrderRequest(order_type='limit', side='buy', qty=10, price=99000)])[0]
+    assert order.id == ""
+    assert order.status == 'rejected'
+
+
+def test_real_algo_runs_offline(dex: SimulatedDex) -> None:
+    """L'Algo réel tourne hors ligne sur l'échange simulé, via l'observer."""
+    algo = Algo(dex=dex, gap=500, session_id="simulation", data_service=NullData(), max_leverage=10)
+    observer = HyperliquidObserver(address="0x0", observer_id="simulation", websocket_url=None, algo=algo,
+                                   process_inline=True)
+    dex.subscribe(observer.handle_order_updates)
+    algo.setup_initial_positions()
+
+    prices = [100000 + 3000 * math.sin(i / 200) for i in range(5000)]
+    assert dex.run(prices) == 5000
+
+    assert dex.fill_count > 10
+    assert not dex.liquidated
+    # la grille garde un seul open long et au moins un close long, et l'Algo voit les mêmes ordres que l'échange
+    open_orders = dex.get_open_orders()
+    assert sum(1 for o in open_orders if o.side == 'buy') == 1
+    assert any(o.side == 'sell' for o in open_orders)
+    assert {o.id for o in algo.previous_orders} == {o.id for o in open_orders}
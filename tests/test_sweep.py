@@ -0,0 +1,61 @@
+import json
+
+import numpy as np
+from src.backtesting.grid_backtester import GridParams, OhlcData, backtest_grid
+from src.backtesting.sweep import SweepSpace, config_key, load_price_cache, run_sweep, save_price_cache
+
+
+def make_prices(tmp_path) -> str:
+    steps = np.random.default_rng(0).choice([-50.0, 50.0], size=3000)
+    prices = 100000 + np.concatenate([[0], np.cumsum(steps)])
+    return save_price_cache(OhlcData.from_prices(prices), str(tmp_path / "prices.npy"))
+
+
+def test_space_is_cartesian_product() -> None:
+    space = SweepSpace(gaps=[500, 1000], qty_dividers=[4, 6, 8], max_leverages=[10, 20])
+    params = list(space.params(maker_fee=0))
+    assert len(params) == len(space) == 12
+    assert len({config_key(p) for p in params}) == 12
+    assert all(p.maker_fee == 0 for p in params)
+
+
+def test_price_cache_is_memory_mapped(tmp_path) -> None:
+    data = load_price_cache(make_prices(tmp_path))
+    assert isinstance(data.close.base, np.memmap) or isinstance(data.close, np.memmap)
+    assert len(data) == 3001
+
+
+def test_sweep_streams_results_and_resumes(tmp_path) -> None:
+    """Les résultats sont écrits au fil de l'eau ; une reprise ne refait que les configurations manquantes."""
+    price_path = make_prices(tmp_path)
+    out_path = str(tmp_path / "sweep.jsonl")
+    space = SweepSpace(gaps=[500, 1000], qty_dividers=[6, 10])
+
+    assert run_sweep(price_path, out_path, list(space.params())[:3], workers=2) == 3
+    # ligne tronquée par une interruption
+    with open(out_path, 'a') as f:
+        f.write('{"key": "trunc')
+
+    assert run_sweep(price_path, out_path, space.params(), workers=2) == 1
+    assert run_sweep(price_path, out_path, space.params(), workers=2) == 0
+
+    results = read_results_skipping_invalid(out_path)
+    assert sorted(r['key'] for r in results) == sorted(config_key(p) for p in space.params())
+
+    # même résultat qu'un backtest direct
+    params = GridParams(gap=500, qty_divider=10)
+    expected = backtest_grid(load_price_cache(price_path), params)
+    record = next(r for r in results if r['key'] == config_key(params))
+    assert record['final_equity'] == expected.final_equity
+    assert record['sell_fills'] == expected.sell_fills
+
+
+def read_results_skipping_invalid(path) -> list:
+    results = []
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                continue
+    return results
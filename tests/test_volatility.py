@@ -0,0 +1,134 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from src.data.null_data import NullData
+from src.generic.algo import Algo
+from src.generic.hyperliquid_ws_model import WsCandle
+from src.generic.observer import HyperliquidObserver
+from src.generic.simulated_dex import SimulatedDex
+from src.generic.volatility import RollingPercentile, StreamingATR, StreamingBollingerWidth, VolatilityEngine
+
+
+def make_bars(seed: int, size: int):
+    rng = np.random.default_rng(seed)
+    close = 100000 + np.cumsum(rng.normal(0, 100, size))
+    high = close + np.abs(rng.normal(0, 50, size))
+    low = close - np.abs(rng.normal(0, 50, size))
+    return high, low, close
+
+
+def test_atr_matches_wilder_definition() -> None:
+    high, low, close = make_bars(0, 100)
+    atr = StreamingATR(length=14)
+    values = [atr.update(h, l, c) for h, l, c in zip(high, low, close)]
+
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - np.r_[close[0], close[:-1]]),
+                                                   np.abs(low - np.r_[close[0], close[:-1]])))
+    true_range[0] = high[0] - low[0]
+    expected = true_range[:14].mean()
+    for tr in true_range[14:]:
+        expected = (expected * 13 + tr) / 14
+
+    assert values[12] is None
+    assert values[-1] == pytest.approx(expected)
+
+
+def test_bollinger_width_matches_rolling_std() -> None:
+    _, _, close = make_bars(1, 3000)
+    bb = StreamingBollingerWidth(length=20, num_std=2)
+    values = [bb.update(c) for c in close]
+
+    assert values[18] is None
+    assert values[-1] == pytest.approx(4 * np.std(close[-20:]), rel=1e-6)
+
+
+def test_rolling_percentile_rank_and_quantile() -> None:
+    """Rang et quantile sur la fenêtre glissante, à la résolution des classes près."""
+    values = np.random.default_rng(2).lognormal(3, 1, 5000)
+    percentiles = RollingPercentile(window=1000, resolution=0.001)
+    for v in values:
+        percentiles.add(v)
+
+    window = values[-1000:]
+    assert len(percentiles) == 1000
+    for probe in np.quantile(window, [0.1, 0.5, 0.9]):
+        assert percentiles.rank(probe) == pytest.approx(np.mean(window < probe), abs=0.005)
+    assert percentiles.quantile(0.5) == pytest.approx(np.median(window), rel=0.01)
+
+
+def test_engine_builds_bars_from_ticks_and_candles() -> None:
+    engine = VolatilityEngine(bar_seconds=60)
+    for t, price in [(0, 100), (10, 105), (50, 95), (61, 101)]:
+        engine.on_price(price, t)
+    assert engine.bar_count == 1
+    assert engine.atr._seed_sum == pytest.approx(10)
+
+    engine = VolatilityEngine()
+    engine.on_candle(0, 110, 90, 100)
+    engine.on_candle(0, 120, 90, 100)
+    assert engine.bar_count == 0
+    engine.on_candle(60000, 101, 99, 100)
+    assert engine.bar_count == 1
+    assert engine.atr._seed_sum == pytest.approx(30)
+
+
+def test_engine_percentile_follows_regime() -> None:
+    """Une bougie bien plus large que la fenêtre place la volatilité en haut de la distribution."""
+    engine = VolatilityEngine(percentile_window=200, min_samples=30)
+    high, low, close = make_bars(3, 200)
+    for h, l, c in zip(high, low, close):
+        engine.on_bar(h, l, c)
+    assert engine.is_ready
+    assert 0 <= engine.volatility_percentile <= 1
+
+    for _ in range(5):
+        engine.on_bar(close[-1] + 3000, close[-1] - 3000, close[-1])
+    assert engine.atr_percentile > 0.95
+
+
+def test_algo_picks_gap_from_volatility() -> None:
+    """L'Algo choisit son gap parmi adaptive_gaps selon le percentile, à chaque exécution."""
+    dex = SimulatedDex(initial_balance=10000, initial_price=100000, leverage=10, maker_fee=0, taker_fee=0)
+    engine = VolatilityEngine(percentile_window=100, min_samples=20)
+    algo = Algo(dex=dex, gap=500, session_id="test", data_service=NullData(), max_leverage=10,
+                volatility_engine=engine, adaptive_gaps=[500, 1000, 1500])
+    observer = HyperliquidObserver(address="0x0", observer_id="test", websocket_url=None, algo=algo,
+                                   process_inline=True, candle_interval="1m")
+    dex.subscribe(observer.handle_order_updates)
+
+    assert [algo.select_gap_index(p) for p in (0, 0.4, 0.99)] == [Algo.GAPS.index(g) for g in (500, 1000, 1500)]
+
+    # bougies calmes puis une série de bougies très larges, reçues par le websocket
+    for i in range(100):
+        observer.handle_candle(WsCandle(t=i * 60000, T=i * 60000 + 59999, s="BTC", i="1m", o=100000.0,
+                                        c=100000.0 + i % 3, h=100010.0 + i % 3, l=99990.0, v=1.0, n=1))
+    for i in range(100, 110):
+        observer.handle_candle(WsCandle(t=i * 60000, T=i * 60000 + 59999, s="BTC", i="1m", o=100000.0,
+                                        c=100000.0 + 2000 * (-1) ** i, h=103000.0, l=97000.0, v=1.0, n=1))
+    assert engine.volatility_percentile > 0.9
+
+    algo.setup_initial_positions()
+    dex.on_price(100000)
+    assert algo.get_gap() == 1500
+    assert {o.price for o in dex.get_open_orders()} == {98500, 101500}
+
+
+def test_candles_never_block_or_evict_orders() -> None:
+    """File des ordres pleine : les bougies sont coalescées à part, l'ordre en file est traité en premier."""
+    algo = MagicMock()
+    observer = HyperliquidObserver(address="0x0", observer_id="test", websocket_url=None, algo=algo,
+                                   queue_size=1, candle_interval="1m")
+    ws_order = MagicMock(status='filled')
+    observer.handle_order_updates([ws_order])
+    for i in range(1000):  # bloquerait le thread websocket si les bougies passaient par la file
+        observer.handle_candle(WsCandle(t=60000, T=119999, s="BTC", i="1m", o=100000.0, c=100000.0 + i,
+                                        h=101000.0, l=99000.0, v=1.0, n=i))
+
+    observer.event_queue.start()
+    observer.event_queue.stop()
+    algo.on_executed_order.assert_called_once_with(ws_order)
+    algo.on_candle.assert_called_once_with(60000, 101000.0, 99000.0, 100999.0)
+    assert [c[0] for c in algo.method_calls if c[0] in ('on_executed_order', 'on_candle')] == \
+        ['on_executed_order', 'on_candle']
+    assert observer.get_queue_metrics().dropped == 0
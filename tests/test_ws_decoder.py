@@ -0,0 +1,95 @@
+import json
+import timeit
+from unittest.mock import MagicMock
+
+import pytest
+from src.generic import ws_decoder
+from src.generic.cctx_mapper import safe_parse
+from src.generic.hyperliquid_ws_model import WsCandle, WsMessage, WsOrder
+from src.generic.observer import HyperliquidWebSocket
+from src.generic.ws_decoder import decode_message
+
+
+def order_update(i: int, status: str = 'filled', **order_fields) -> dict:
+    order = {'coin': 'BTC', 'side': 'B' if i % 2 else 'A', 'limitPx': f'{100000 + i}.0', 'sz': '0.0',
+             'oid': 41000000000 + i, 'timestamp': 1750000000000 + i, 'origSz': '0.00012'}
+    if i % 3 == 0:
+        order['cloid'] = f'0x{i:032x}'
+    order.update(order_fields)
+    return {'order': order, 'status': status, 'statusTimestamp': 1750000000100 + i}
+
+
+def frame(*updates) -> str:
+    """Trame orderUpdates telle qu'envoyée par Hyperliquid (texte JSON)"""
+    return json.dumps({'channel': 'orderUpdates', 'data': list(updates)})
+
+
+# trames du flux d'un grid : exécutions isolées, rafales, ordres posés et annulés
+FRAMES = [frame(order_update(i)) for i in range(20)] + \
+         [frame(*[order_update(i, status) for i in range(8)]) for status in ('filled', 'open', 'canceled')]
+
+
+def parse_generic(message: str):
+    return safe_parse(WsMessage[WsOrder], json.loads(message)).data
+
+
+@pytest.mark.parametrize("message", FRAMES[:3] + FRAMES[-3:])
+def test_direct_decoding_matches_generic_parse(message: str) -> None:
+    channel, orders = decode_message(message)
+    assert channel == 'orderUpdates'
+    assert orders == parse_generic(message)
+    assert all(type(order.order.sz) is float and type(order.order.oid) is int for order in orders)
+
+
+@pytest.mark.parametrize("update", [
+    order_update(1, oid='41000000001'),   # oid en chaîne
+    order_update(2, limitPx=None),        # prix absent de la forme attendue
+    {'order': {'coin': 'BTC', 'side': 'B', 'oid': 7}, 'status': 'open'},  # champs manquants
+])
+def test_unexpected_shape_falls_back_to_generic_parse(update: dict) -> None:
+    message = frame(order_update(0), update)
+    assert decode_message(message)[1] == parse_generic(message)
+
+
+def test_unreadable_size_is_not_decoded_as_a_fill() -> None:
+    """sz illisible : la trame est rejetée, pas transmise avec sz=0.0 (exécution complète)"""
+    message = frame(order_update(1, status='open', sz='n/a'))
+    with pytest.raises(ValueError):
+        decode_message(message)
+    observer = MagicMock()
+    websocket = HyperliquidWebSocket('wss://example.invalid/ws', '0xabc', observer)
+    websocket.running = True
+    websocket.on_message(None, message)
+    observer.handle_order_updates.assert_not_called()
+
+
+def test_candle_and_other_channels() -> None:
+    candle = {'t': 1, 'T': 60000, 's': 'BTC', 'i': '1m', 'o': '100000', 'c': '100010.5', 'h': '100020',
+              'l': '99990', 'v': '1.5', 'n': 12}
+    channel, decoded = decode_message(json.dumps({'channel': 'candle', 'data': candle}))
+    assert (channel, decoded) == ('candle', safe_parse(WsCandle, candle))
+    assert decode_message(b'{"channel":"pong"}') == ('pong', {'channel': 'pong'})
+
+
+def test_decoding_without_orjson(monkeypatch) -> None:
+    monkeypatch.setattr(ws_decoder, '_loads', json.loads)
+    assert decode_message(FRAMES[-1])[1] == parse_generic(FRAMES[-1])
+
+
+def test_websocket_hands_decoded_orders_to_observer() -> None:
+    observer = MagicMock()
+    websocket = HyperliquidWebSocket('wss://example.invalid/ws', '0xabc', observer)
+    websocket.running = True
+    websocket.on_message(None, FRAMES[0])
+    observer.handle_order_updates.assert_called_once_with(parse_generic(FRAMES[0]))
+
+
+@pytest.mark.benchmark
+def test_direct_decoding_is_faster_than_generic_parse() -> None:
+    number = 200
+    direct = timeit.timeit(lambda: [decode_message(message) for message in FRAMES], number=number)
+    generic = timeit.timeit(lambda: [parse_generic(message) for message in FRAMES], number=number)
+    per_frame = number * len(FRAMES)
+    assert direct * 1.5 < generic, \
+        f"orderUpdates ({'orjson' if ws_decoder.orjson else 'json'}): {direct / per_frame * 1e6:.1f} µs direct, " \
+        f"{generic / per_frame * 1e6:.1f} µs generic per frame"